@@ -2,14 +2,60 @@
 Research Watcher - Flask Application Factory
 
 Initializes Flask app with Firebase Admin SDK and registers blueprints.
+Firestore and Pub/Sub clients are created lazily on first use.
 """
 
+import importlib
 import os
-from flask import Flask
-from flask_cors import CORS
-import firebase_admin
-from firebase_admin import credentials, firestore
-from google.cloud import pubsub_v1
+import time
+
+from app.utils.startup import startup_profile
+
+_import_started = time.perf_counter()
+
+BLUEPRINT_MODULES = ('users', 'seeds', 'digest', 'collector', 'feedback', 'search', 'saved', 'topics', 'papers')
+
+with startup_profile.phase('import flask'):
+    from flask import Flask
+    from flask_cors import CORS
+
+with startup_profile.phase('import firebase_admin'):
+    import firebase_admin
+    from firebase_admin import credentials
+
+
+class ResearchWatcherApp(Flask):
+    """Flask app whose shared clients and services are created on first access."""
+
+    @property
+    def db(self):
+        """Shared Firestore client."""
+        from app.services.gcp import get_firestore
+        return get_firestore()
+
+    @property
+    def publisher(self):
+        """Shared Pub/Sub publisher client."""
+        from app.services.gcp import get_publisher
+        return get_publisher()
+
+    @property
+    def topics_service(self):
+        """Shared OpenAlex topics service (catalog cache, indexes, HTTP session)."""
+        from app.services.openalex_topics import get_topics_service
+        return get_topics_service(self.db)
+
+    @property
+    def paper_index(self):
+        """Shared local full-text index of stored papers."""
+        from app.services.paper_index import get_paper_index
+        return get_paper_index(self.db)
+
+    @property
+    def paper_vectors(self):
+        """Shared paper embeddings and nearest-neighbor index."""
+        from app.services.paper_vectors import get_paper_vectors
+        return get_paper_vectors(self.db)
 
 
 def create_app():
@@ -19,15 +65,17 @@ def create_app():
     Initializes:
     - Flask application
     - Firebase Admin SDK
-    - Firestore client
-    - Pub/Sub publisher client
     - Registers all API blueprints
 
+    app.db (Firestore), app.publisher (Pub/Sub) and app.topics_service
+    are shared instances created on first access. With STARTUP_PROFILE=true, import and init
+    times are logged and summarized against STARTUP_BUDGET_MS.
+
     Returns:
         Flask: Configured Flask application
     """
     # Create Flask app
-    app = Flask(__name__)
+    app = ResearchWatcherApp(__name__)
 
     # Load configuration from environment
     app.config['PROJECT_ID'] = os.getenv('GOOGLE_CLOUD_PROJECT', 'research-watcher')
@@ -55,32 +103,25 @@ def create_app():
     })
 
     # Initialize Firebase Admin SDK
-    if not firebase_admin._apps:
-        # Check if running in Cloud Run (uses default credentials)
-        cred_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-        if cred_path and os.path.exists(cred_path):
-            # Local development with service account key
-            cred = credentials.Certificate(cred_path)
-            firebase_admin.initialize_app(cred, {
-                'projectId': app.config['PROJECT_ID']
-            })
-        else:
-            # Cloud Run with default service account
-            firebase_admin.initialize_app(options={
-                'projectId': app.config['PROJECT_ID']
-            })
-
-    # Initialize Firestore client
-    db = firestore.client()
-    app.db = db
-
-    # Initialize Pub/Sub publisher client
-    publisher = pubsub_v1.PublisherClient()
-    app.publisher = publisher
+    with startup_profile.phase('init firebase_admin'):
+        _initialize_firebase(app)
+
     app.pubsub_topic = f"projects/{app.config['PROJECT_ID']}/topics/rw-wal"
 
-    # Register blueprints
-    from app.api import users, seeds, digest, collector, feedback, search, saved, topics
+    # Pre-warm Firebase token signing keys and keep them fresh
+    from app.utils.auth import start_key_refresher
+    start_key_refresher()
+
+    # Warm upstream API connections (DNS + TLS) for the shared clients
+    if os.getenv('PRECONNECT_UPSTREAMS', 'false').lower() == 'true':
+        from app.services.clients import preconnect
+        preconnect()
+
+    # Register blueprints (imported one by one so each shows in the startup profile)
+    for module in BLUEPRINT_MODULES:
+        with startup_profile.phase(f'import app.api.{module}'):
+            importlib.import_module(f'app.api.{module}')
+    from app.api import users, seeds, digest, collector, feedback, search, saved, topics, papers
 
     app.register_blueprint(users.bp, url_prefix='/api')
     app.register_blueprint(seeds.bp, url_prefix='/api')
@@ -90,6 +131,7 @@ def create_app():
     app.register_blueprint(search.bp)
     app.register_blueprint(saved.bp, url_prefix='/api')
     app.register_blueprint(topics.bp)  # Topics API (Enhanced Discovery Phase 1)
+    app.register_blueprint(papers.bp)
 
     # Health check endpoint
     @app.route('/')
@@ -101,4 +143,28 @@ def create_app():
             'version': '0.1.0'
         }
 
+    if startup_profile.enabled:
+        # Total covers this module's imports as well as create_app itself
+        app.logger.warning(startup_profile.report((time.perf_counter() - _import_started) * 1000))
+
     return app
+
+
+def _initialize_firebase(app):
+    """Initialize the default Firebase app once per process."""
+    if firebase_admin._apps:
+        return
+
+    # Check if running in Cloud Run (uses default credentials)
+    cred_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+    if cred_path and os.path.exists(cred_path):
+        # Local development with service account key
+        cred = credentials.Certificate(cred_path)
+        firebase_admin.initialize_app(cred, {
+            'projectId': app.config['PROJECT_ID']
+        })
+    else:
+        # Cloud Run with default service account
+        firebase_admin.initialize_app(options={
+            'projectId': app.config['PROJECT_ID']
+        })
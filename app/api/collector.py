@@ -3,14 +3,17 @@ Collector trigger endpoints.
 
 Handles daily collection triggers from Cloud Scheduler.
 Implements dual-write: Firestore + Pub/Sub WAL.
+Runs execute in the background and are checkpointed in runs/{runId}
+so they can be polled and resumed.
 """
 
-import json
 import uuid
-from datetime import datetime
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, jsonify, request, current_app
 from app.utils.auth import scheduler_auth_required
-from app.services.collector import collect_and_rank
+from app.services.citation_edges import get_citation_edges
+from app.services.collection_runner import CollectionRunner, submit_run, get_live_progress
+from app.services.openalex import CAPTURE_REFERENCES
+from app.services.run_state import RunStateStore
 
 bp = Blueprint('collector', __name__)
 
@@ -22,129 +25,48 @@ def collect_run():
     Trigger daily collection for all users.
 
     This endpoint is called by Cloud Scheduler with OIDC authentication.
+    The run executes on a background executor; poll
+    GET /api/collect/runs/<runId> for progress.
 
-    Process:
-    1. Fetch all users with seeds
-    2. For each user:
-       - Collect papers from all sources
-       - Deduplicate and score
-       - Write to Firestore (papers/, digests/)
-       - Publish WAL event to Pub/Sub
-    3. Enforce quota (runsPerDay)
+    Body (optional):
+        {
+            "runId": "..."   # Resume an interrupted run
+        }
+
+    Re-invoking with the same runId skips users that already finished.
+    A run that is already queued or running in this instance is not
+    started twice.
 
     Returns:
-        200: Collection completed
-        500: Collection failed
+        202: Collection accepted
+        500: Collection could not be queued
     """
-    run_id = str(uuid.uuid4())
-    timestamp = datetime.utcnow().isoformat() + 'Z'
-
-    current_app.logger.info(f'Collection started: runId={run_id}')
-
-    db = current_app.db
-    publisher = current_app.publisher
-    topic_path = current_app.pubsub_topic
-
-    # Stats
-    stats = {
-        'usersProcessed': 0,
-        'papersCollected': 0,
-        'digestsCreated': 0,
-        'errors': []
-    }
+    body = request.get_json(silent=True) or {}
+    run_id = body.get('runId') or request.args.get('runId') or str(uuid.uuid4())
 
     try:
-        # Fetch all users
-        users_ref = db.collection('users')
-        users = users_ref.stream()
-
-        for user_doc in users:
-            uid = user_doc.id
-            user_data = user_doc.to_dict()
-
-            # Check if user has seeds
-            seeds_ref = db.collection('seeds').document(uid)
-            seeds_doc = seeds_ref.get()
-
-            if not seeds_doc.exists:
-                continue
-
-            seeds_data = seeds_doc.to_dict()
-            seeds = seeds_data.get('items', [])
-
-            if not seeds:
-                continue
-
-            try:
-                # Collect and rank papers
-                current_app.logger.info(f'Collecting papers for user {uid} with {len(seeds)} seeds')
-                papers = collect_and_rank(seeds, days_back=7, max_per_seed=10)
-
-                current_app.logger.info(f'Collected {len(papers)} papers for user {uid}')
-
-                if not papers:
-                    continue
-
-                # Upsert papers to global papers collection
-                for paper in papers[:50]:  # Limit to top 50
-                    paper_id = paper.get('paperId')
-                    if paper_id:
-                        # Sanitize paper ID for Firestore (replace / with _)
-                        safe_paper_id = paper_id.replace('/', '_')
-                        paper['paperId'] = safe_paper_id  # Update in paper object too
-                        paper_ref = db.collection('papers').document(safe_paper_id)
-                        paper_ref.set(paper, merge=True)
-
-                # Create digest for user
-                digest_data = {
-                    'uid': uid,
-                    'runId': run_id,
-                    'createdAt': timestamp,
-                    'paperCount': len(papers),
-                    'papers': [p.get('paperId').replace('/', '_') if p.get('paperId') else None for p in papers[:20]]  # Top 20 sanitized IDs
-                }
-
-                # Use digest ID that includes timestamp for historical tracking
-                # But also write to a "latest" document for easy retrieval
-                digest_ref = db.collection('digests').document(f"{uid}_latest")
-                digest_ref.set(digest_data)
-
-                # Publish WAL event to Pub/Sub
-                wal_event = {
-                    'v': 1,
-                    'type': 'digest.created',
-                    'runId': run_id,
-                    'uid': uid,
-                    'ts': timestamp,
-                    'items': digest_data
-                }
-
-                message_bytes = json.dumps(wal_event).encode('utf-8')
-                future = publisher.publish(topic_path, message_bytes)
-                message_id = future.result()
-
-                current_app.logger.info(f'Published WAL event for user {uid}: {message_id}')
-
-                stats['usersProcessed'] += 1
-                stats['papersCollected'] += len(papers)
-                stats['digestsCreated'] += 1
-
-            except Exception as e:
-                error_msg = f'Error processing user {uid}: {str(e)}'
-                current_app.logger.error(error_msg)
-                stats['errors'].append(error_msg)
-
-        current_app.logger.info(f'Collection completed: runId={run_id}, stats={stats}')
+        runner = CollectionRunner(
+            current_app.db,
+            current_app.publisher,
+            current_app.pubsub_topic,
+            current_app.logger,
+            paper_index=current_app.paper_index,
+            paper_vectors=current_app.paper_vectors,
+            citation_edges=get_citation_edges() if CAPTURE_REFERENCES else None
+        )
+        progress = submit_run(runner, run_id)
+
+        current_app.logger.info(f'Collection accepted: runId={run_id}')
 
         return jsonify({
-            'status': 'completed',
+            'status': 'accepted',
             'runId': run_id,
-            'timestamp': timestamp,
-            'stats': stats
-        }), 200
+            'statusUrl': f'/api/collect/runs/{run_id}',
+            'progress': progress.snapshot()
+        }), 202
 
     except Exception as e:
-        error_msg = f'Collection failed: {str(e)}'
+        error_msg = f'Collection failed to start: {str(e)}'
         current_app.logger.error(error_msg)
         return jsonify({
             'status': 'failed',
@@ -153,6 +75,47 @@ def collect_run():
         }), 500
 
 
+@bp.route('/runs/<run_id>', methods=['GET'])
+@scheduler_auth_required
+def get_run_progress(run_id):
+    """
+    Get live progress of a collection run.
+
+    Runs executing in this instance report live progress (users done,
+    papers, errors, per-source timings, ETA). Other runs are reported from
+    the checkpointed run state in Firestore.
+
+    Path Parameters:
+        run_id: Collection run ID
+
+    Returns:
+        200: Run progress
+        404: Run not found
+        500: Server error
+    """
+    live = get_live_progress(run_id)
+    if live is not None:
+        return jsonify({**live.snapshot(), 'live': True}), 200
+
+    try:
+        progress = RunStateStore(current_app.db).get_progress(run_id)
+
+        if progress is None:
+            return jsonify({
+                'error': 'not_found',
+                'message': f'Run {run_id} not found'
+            }), 404
+
+        return jsonify({**progress, 'live': False}), 200
+
+    except Exception as e:
+        current_app.logger.error(f'Error fetching run {run_id}: {str(e)}')
+        return jsonify({
+            'error': 'fetch_failed',
+            'message': 'Failed to fetch run progress'
+        }), 500
+
+
 @bp.route('/queue', methods=['POST'])
 def collect_queue():
     """
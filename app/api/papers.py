@@ -0,0 +1,86 @@
+"""
+Papers API Blueprint
+
+Endpoints over the stored papers corpus (the papers collection).
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+from app.utils.auth import login_required
+
+
+bp = Blueprint('papers', __name__, url_prefix='/api/papers')
+
+# Maximum related papers per request
+MAX_RELATED = 50
+DEFAULT_RELATED = 10
+
+
+def _paper_details(paper_ids):
+    """
+    Stored papers by ID: from the local paper index, falling back to one
+    batched Firestore read for papers not indexed yet.
+    """
+    papers = current_app.paper_index.get(paper_ids)
+    missing = [paper_id for paper_id in paper_ids if paper_id not in papers]
+    if missing:
+        db = current_app.db
+        refs = [db.collection('papers').document(paper_id) for paper_id in missing]
+        for doc in db.get_all(refs):
+            if doc.exists:
+                papers[doc.id] = doc.to_dict()
+    return papers
+
+
+@bp.route('/<paper_id>/related', methods=['GET'])
+@login_required
+def get_related_papers(paper_id):
+    """
+    Get the papers most similar to a stored paper.
+
+    Similarity is cosine over title + abstract embeddings (hashed TF-IDF
+    projected with a truncated SVD), found with an approximate
+    nearest-neighbor index.
+
+    Path Parameters:
+        paper_id: Stored paper ID (papers collection document ID)
+
+    Query Parameters:
+        limit: Maximum results (default 10, max 50)
+
+    Returns:
+        200: Related papers, most similar first, each with "similarity"
+        400: Invalid limit
+        404: Paper has no embedding
+        503: Embeddings have not been built yet
+    """
+    try:
+        limit = min(int(request.args.get('limit', DEFAULT_RELATED)), MAX_RELATED)
+    except ValueError:
+        return jsonify({"error": "Invalid numeric parameter"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+
+    try:
+        vectors = current_app.paper_vectors
+        if not vectors.ready:
+            return jsonify({"error": "Related papers index is not built yet"}), 503
+
+        related = vectors.related(paper_id, limit=limit)
+        if related is None:
+            return jsonify({"error": "Paper not found"}), 404
+
+        details = _paper_details([related_id for related_id, _ in related])
+        papers = [
+            {**details.get(related_id, {}), 'paperId': related_id, 'similarity': similarity}
+            for related_id, similarity in related
+        ]
+
+        return jsonify({
+            "paper_id": paper_id,
+            "count": len(papers),
+            "papers": papers
+        }), 200
+
+    except Exception as e:
+        print(f"Related papers error for {paper_id}: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -5,21 +5,30 @@ Allows authenticated users to search for papers in real-time using
 the same collection and ranking logic as the daily digest collector.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.utils.auth import login_required
 from app.services.collector import collect_and_rank
+from app.services.search_cache import get_search_cache, search_key
+from app.utils.singleflight import SingleFlight
 from google.cloud import firestore
 import os
 import time
 from datetime import datetime
 
 bp = Blueprint('search', __name__, url_prefix='/api/search')
-db = firestore.Client()
+
+# Where results come from: the local paper index, the upstream APIs, or
+# local first topped up from upstream
+SEARCH_SOURCES = ('local', 'upstream', 'hybrid')
+SEARCH_DEFAULT_SOURCE = os.getenv('SEARCH_DEFAULT_SOURCE', 'upstream')
+
+# Coalesces concurrent identical searches in this worker into one fan-out
+search_flight = SingleFlight()
 
 
 @bp.route('', methods=['GET'])
 @login_required
-def search_papers(uid):
+def search_papers():
     """
     Interactive search endpoint for authenticated users.
 
@@ -27,18 +36,33 @@ def search_papers(uid):
         q (str): Search query (required)
         days_back (int): How many days back to search (default: 7)
         max_results (int): Maximum results to return (default: 20)
+        source (str): local | upstream | hybrid (default: SEARCH_DEFAULT_SOURCE)
 
     Returns:
         JSON: {
             "papers": [...],
             "query": "...",
             "count": N,
-            "durationMs": MS
+            "durationMs": MS,
+            "source": "local" | "upstream" | "hybrid",
+            "localCount": N,
+            "cache": {"status": "hit" | "stale" | "miss", "ageSeconds": S, "coalesced": bool} | null
         }
 
-    Tracks search events to Firestore for analytics.
+    source=local answers from the local index of collected papers only.
+    source=hybrid answers from the local index and goes upstream only when
+    it has fewer than max_results matches, merging by paperId. cache is
+    null when upstream was not consulted.
+
+    Upstream results are cached per normalized (q, days_back, max_results); stale
+    results are returned immediately and refreshed in the background.
+    Concurrent identical searches share one cache lookup and, on a miss,
+    one computation and cache write (single-flight); coalesced requests
+    report the status of the shared lookup.
+    Tracks search events (including cache status) to Firestore for analytics.
     """
     start_time = time.time()
+    uid = request.uid
 
     # Get query parameters
     query = request.args.get('q', '').strip()
@@ -58,30 +82,60 @@ def search_papers(uid):
     if max_results < 1 or max_results > 50:
         return jsonify({"error": "max_results must be between 1 and 50"}), 400
 
+    source = request.args.get('source', SEARCH_DEFAULT_SOURCE).strip().lower()
+    if source not in SEARCH_SOURCES:
+        return jsonify({"error": f"source must be one of: {', '.join(SEARCH_SOURCES)}"}), 400
+
     # Perform search using same logic as collector
     try:
-        papers = collect_and_rank(
-            seeds=[query],
-            days_back=days_back,
-            max_per_seed=max_results
-        )
-
-        # Limit to requested max_results
-        papers = papers[:max_results]
+        key = search_key(query, days_back, max_results)
+        coalesced = False
+        cache_status, cache_age = None, 0.0
+
+        def collect():
+            papers = collect_and_rank(
+                seeds=[key[0]],
+                days_back=days_back,
+                max_per_seed=max_results
+            )
+            # Limit to requested max_results
+            return papers[:max_results]
+
+        cache = get_search_cache(current_app.db)
+
+        def lookup():
+            return cache.get(key, collect)
+
+        local_papers = []
+        if source != 'upstream':
+            local_papers = current_app.paper_index.search(key[0], days_back=days_back, limit=max_results)
+
+        if source == 'local' or (source == 'hybrid' and len(local_papers) >= max_results):
+            papers = local_papers
+        else:
+            # The whole lookup-and-fill is coalesced, so a shared miss is
+            # computed and written to the cache once
+            (upstream_papers, cache_status, cache_age), coalesced = search_flight.do(key, lookup)
+            papers = _merge_results(local_papers, upstream_papers, max_results)
 
         # Calculate duration
         duration_ms = int((time.time() - start_time) * 1000)
 
         # Track search event for analytics (async, non-blocking)
         try:
-            event_ref = db.collection('events').document(uid).collection('searches').document()
+            event_ref = current_app.db.collection('events').document(uid).collection('searches').document()
             event_ref.set({
                 'query': query,
                 'resultsCount': len(papers),
                 'durationMs': duration_ms,
                 'timestamp': datetime.utcnow().isoformat() + 'Z',
                 'daysBack': days_back,
-                'maxResults': max_results
+                'maxResults': max_results,
+                'source': source,
+                'localCount': len(local_papers),
+                'cacheStatus': cache_status,
+                'cacheAgeSeconds': round(cache_age, 1),
+                'coalesced': coalesced
             })
         except Exception as track_error:
             # Don't fail the request if tracking fails
@@ -92,7 +146,14 @@ def search_papers(uid):
             "papers": papers,
             "query": query,
             "count": len(papers),
-            "durationMs": duration_ms
+            "durationMs": duration_ms,
+            "source": source,
+            "localCount": len(local_papers),
+            "cache": {
+                "status": cache_status,
+                "ageSeconds": round(cache_age, 1),
+                "coalesced": coalesced
+            } if cache_status else None
         }), 200
 
     except Exception as e:
@@ -103,9 +164,32 @@ def search_papers(uid):
         }), 500
 
 
+def _merge_results(local_papers, upstream_papers, max_results):
+    """
+    Local results topped up with upstream ones, deduplicated by paperId.
+
+    Stored paper IDs have '/' replaced with '_', so IDs are compared in
+    that form.
+    """
+    if not local_papers:
+        return upstream_papers[:max_results]
+
+    seen = {p['paperId'].replace('/', '_') for p in local_papers if p.get('paperId')}
+    merged = list(local_papers)
+    for paper in upstream_papers:
+        paper_id = (paper.get('paperId') or '').replace('/', '_')
+        if paper_id and paper_id in seen:
+            continue
+        seen.add(paper_id)
+        merged.append(paper)
+
+    merged.sort(key=lambda p: p.get('score') or 0, reverse=True)
+    return merged[:max_results]
+
+
 @bp.route('/history', methods=['GET'])
 @login_required
-def search_history(uid):
+def search_history():
     """
     Get user's search history (last 50 searches).
 
@@ -115,16 +199,20 @@ def search_history(uid):
                 {
                     "query": "...",
                     "timestamp": "...",
-                    "resultsCount": N
+                    "resultsCount": N,
+                    "cacheStatus": "hit" | "stale" | "miss"
                 },
                 ...
             ],
-            "count": N
+            "count": N,
+            "cacheHitRate": R
         }
     """
+    uid = request.uid
+
     try:
         # Fetch last 50 searches, ordered by timestamp descending
-        searches_ref = db.collection('events').document(uid).collection('searches')
+        searches_ref = current_app.db.collection('events').document(uid).collection('searches')
         searches = searches_ref.order_by('timestamp', direction=firestore.Query.DESCENDING).limit(50).stream()
 
         history = []
@@ -134,12 +222,18 @@ def search_history(uid):
                 'query': search_data.get('query'),
                 'timestamp': search_data.get('timestamp'),
                 'resultsCount': search_data.get('resultsCount', 0),
-                'durationMs': search_data.get('durationMs', 0)
+                'durationMs': search_data.get('durationMs', 0),
+                'cacheStatus': search_data.get('cacheStatus')
             })
 
+        # Share of tracked searches answered from cache (fresh or stale)
+        tracked = [h for h in history if h['cacheStatus']]
+        cached = [h for h in tracked if h['cacheStatus'] in ('hit', 'stale')]
+
         return jsonify({
             "searches": history,
-            "count": len(history)
+            "count": len(history),
+            "cacheHitRate": round(len(cached) / len(tracked), 4) if tracked else None
         }), 200
 
     except Exception as e:
@@ -7,6 +7,7 @@ Handles CRUD operations for user research seeds.
 from flask import Blueprint, request, jsonify, current_app
 from app.utils.auth import login_required
 from google.cloud import firestore
+from app.services.seeds import canonical_seed
 
 bp = Blueprint('seeds', __name__)
 
@@ -62,9 +63,12 @@ def update_seeds():
 
     Body:
         {
-            "seeds": ["keyword1", "keyword2", ...]
+            "seeds": ["keyword1", {"type": "topic", "id": "T10312"}, ...]
         }
 
+    Seeds are query strings or typed objects; query seeds are stored as
+    plain strings and topic IDs are normalized (see app.services.seeds).
+
     Returns:
         200: Seeds updated
         400: Invalid request or quota exceeded
@@ -89,6 +93,14 @@ def update_seeds():
                 'message': 'seeds must be an array'
             }), 400
 
+        try:
+            seeds = [canonical_seed(seed) for seed in seeds]
+        except ValueError as e:
+            return jsonify({
+                'error': 'invalid_request',
+                'message': str(e)
+            }), 400
+
         # Check user quota
         user_ref = db.collection('users').document(uid)
         user_doc = user_ref.get()
@@ -5,54 +5,160 @@ Provides REST endpoints for browsing and searching OpenAlex topics.
 Part of the Enhanced Discovery feature (Phase 1).
 """
 
-from flask import Blueprint, jsonify, request
-from google.cloud import firestore
+from flask import Blueprint, current_app, jsonify, request
 from app.utils.auth import login_required
-from app.services.openalex_topics import OpenAlexTopicsService
+from app.services import topic_papers
+from app.services.topic_aggregates import (
+    HIERARCHY_LEVELS,
+    filter_hierarchy,
+    hierarchy_outline,
+    hierarchy_subtree
+)
 
 
 bp = Blueprint("topics", __name__, url_prefix="/api/topics")
 
+# Maximum IDs accepted by POST /api/topics/batch
+MAX_BATCH_IDS = 500
+
+# Neighbors precomputed per topic for /api/topics/<id>/related
+MAX_RELATED = 10
+
+# Flat listing page sizes
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Attributes returned per topic by default, and all projectable ones
+SUMMARY_FIELDS = ("id", "display_name", "works_count", "field", "subfield")
+TOPIC_FIELDS = (
+    "id", "openalex_id", "display_name", "description", "keywords",
+    "works_count", "cited_by_count", "domain", "field", "subfield",
+    "updated_date", "created_at"
+)
+
+
+def _parse_fields(value):
+    """
+    Parse the fields= projection parameter.
+
+    Returns:
+        Tuple of attribute names, or None for full records ("all")
+
+    Raises:
+        ValueError: If an unknown attribute is requested
+    """
+    if not value:
+        return SUMMARY_FIELDS
+    if value == "all":
+        return None
+    fields = tuple(dict.fromkeys(f.strip() for f in value.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in TOPIC_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ("id",) + tuple(f for f in fields if f != "id")
+
+
+def _project(topic, fields):
+    if fields is None:
+        return topic
+    return {f: topic.get(f) for f in fields}
+
 
 @bp.route("", methods=["GET"])
 @login_required
 def get_topics():
     """
-    Get all topics, optionally filtered by field.
+    Get topics, optionally filtered by field.
 
     Query Parameters:
         field: Optional field name to filter by (e.g., "Psychology")
         format: Response format - "flat" (default) or "hierarchy"
 
+        Flat format:
+        limit: Page size (default 100, max 500)
+        cursor: next_cursor from the previous page
+        fields: Comma-separated attributes per topic (default: summary
+                fields; "all" for full records)
+
+        Hierarchy format:
+        depth: Truncate below "domain", "field" or "subfield" (topic
+               lists omitted) for lazy expansion
+        node: Return a single subtree, e.g. "domain:2" or "field:32"
+
     Returns:
-        JSON response with topics list or hierarchy
+        JSON response with a page of topics or the hierarchy
     """
     try:
-        db = firestore.client()
-        topics_service = OpenAlexTopicsService(db)
+        topics_service = current_app.topics_service
 
         # Get query parameters
         field_name = request.args.get("field")
         response_format = request.args.get("format", "flat")
 
-        # Fetch topics
-        topics = topics_service.get_all_topics(field_name=field_name)
-
         if response_format == "hierarchy":
-            # Build hierarchical structure
-            hierarchy = topics_service.build_topic_hierarchy(topics)
+            # Precomputed once per catalog version
+            aggregates = topics_service.get_aggregates()
+            hierarchy = aggregates["hierarchy"]
+            count = aggregates["stats"]["total_topics"]
+
+            node = request.args.get("node")
+            if node:
+                level, _, node_id = node.partition(":")
+                if level not in HIERARCHY_LEVELS or not node_id:
+                    return jsonify({"error": "node must be <domain|field|subfield>:<id>"}), 400
+
+                subtree = hierarchy_subtree(hierarchy, level, node_id)
+                if subtree is None:
+                    return jsonify({"error": "Hierarchy node not found"}), 404
+
+                return jsonify({
+                    "format": "hierarchy",
+                    "level": level,
+                    "count": subtree["topic_count"],
+                    "node": subtree
+                }), 200
+
+            if field_name:
+                hierarchy = filter_hierarchy(hierarchy, field_name)
+                count = aggregates["stats"]["fields"].get(field_name, {}).get("topic_count", 0)
+
+            depth = request.args.get("depth")
+            if depth:
+                if depth not in HIERARCHY_LEVELS:
+                    return jsonify({"error": f"depth must be one of {', '.join(HIERARCHY_LEVELS)}"}), 400
+                hierarchy = hierarchy_outline(hierarchy, depth)
+
             return jsonify({
                 "format": "hierarchy",
-                "count": len(topics),
+                "count": count,
                 "hierarchy": hierarchy
             }), 200
-        else:
-            # Return flat list
-            return jsonify({
-                "format": "flat",
-                "count": len(topics),
-                "topics": topics
-            }), 200
+
+        # Flat format: keyset-paginated, projected records
+        try:
+            limit = min(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        except ValueError:
+            return jsonify({"error": "Invalid numeric parameter"}), 400
+        if limit < 1:
+            return jsonify({"error": "limit must be positive"}), 400
+
+        try:
+            fields = _parse_fields(request.args.get("fields"))
+            topics, next_cursor, total = topics_service.get_topics_page(
+                field_name=field_name,
+                cursor=request.args.get("cursor"),
+                limit=limit
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify({
+            "format": "flat",
+            "count": len(topics),
+            "total": total,
+            "topics": [_project(t, fields) for t in topics],
+            "next_cursor": next_cursor
+        }), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -71,8 +177,7 @@ def get_topic_detail(topic_id):
         JSON response with topic details
     """
     try:
-        db = firestore.client()
-        topics_service = OpenAlexTopicsService(db)
+        topics_service = current_app.topics_service
 
         # Fetch topic
         topic = topics_service.get_topic_by_id(topic_id)
@@ -86,11 +191,162 @@ def get_topic_detail(topic_id):
         return jsonify({"error": str(e)}), 500
 
 
+@bp.route("/<topic_id>/papers", methods=["GET"])
+@login_required
+def get_topic_papers(topic_id):
+    """
+    Get recent papers within a topic.
+
+    Pages come from OpenAlex (filter=topics.id) and are cached per
+    topic, sort and cursor.
+
+    Path Parameters:
+        topic_id: Topic ID (e.g., "T123")
+
+    Query Parameters:
+        sort: "date" (default) or "citations"
+        cursor: next_cursor from the previous page
+        per_page: Papers per page (default 25, max 100)
+
+    Returns:
+        JSON response with a page of papers
+    """
+    sort = request.args.get("sort", "date")
+    if sort not in topic_papers.SORTS:
+        return jsonify({"error": f"sort must be one of {', '.join(topic_papers.SORTS)}"}), 400
+
+    try:
+        per_page = min(int(request.args.get("per_page", topic_papers.DEFAULT_PAGE_SIZE)),
+                       topic_papers.MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "Invalid numeric parameter"}), 400
+    if per_page < 1:
+        return jsonify({"error": "per_page must be positive"}), 400
+
+    try:
+        topics_service = current_app.topics_service
+
+        if not topics_service.get_topic_by_id(topic_id):
+            return jsonify({"error": "Topic not found"}), 404
+
+        page = topic_papers.get_topic_feed().get_page(
+            topic_id,
+            sort=sort,
+            cursor=request.args.get("cursor"),
+            per_page=per_page
+        )
+        if page is None:
+            return jsonify({"error": "Could not fetch papers from OpenAlex"}), 502
+
+        return jsonify({
+            "topic_id": topic_id,
+            "sort": sort,
+            "count": page["count"],
+            "papers": page["papers"],
+            "next_cursor": page["next_cursor"],
+            "cache": page["cache"]
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/<topic_id>/related", methods=["GET"])
+@login_required
+def get_related_topics(topic_id):
+    """
+    Get the topics most similar to a topic.
+
+    Similarity is cosine over TF-IDF vectors of display name, keywords
+    and description, precomputed per catalog version.
+
+    Path Parameters:
+        topic_id: Topic ID (e.g., "T123")
+
+    Query Parameters:
+        limit: Maximum results (default 10, max 10)
+        fields: Comma-separated attributes per topic, or "all"
+                (default: id, display_name, works_count, field, subfield)
+
+    Returns:
+        JSON response with related topics, most similar first
+    """
+    try:
+        limit = min(int(request.args.get("limit", MAX_RELATED)), MAX_RELATED)
+    except ValueError:
+        return jsonify({"error": "Invalid numeric parameter"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+
+    try:
+        fields = _parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        topics_service = current_app.topics_service
+
+        related = topics_service.get_related_topics(topic_id, limit=limit)
+        if related is None:
+            return jsonify({"error": "Topic not found"}), 404
+
+        return jsonify({
+            "topic_id": topic_id,
+            "count": len(related),
+            "topics": [
+                {**_project(topic, fields), "similarity": topic["similarity"]}
+                for topic in related
+            ]
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/batch", methods=["POST"])
+@login_required
+def get_topics_batch():
+    """
+    Get several topics in one request.
+
+    Request Body:
+        ids: List of topic IDs (at most MAX_BATCH_IDS)
+
+    Returns:
+        JSON response with the found topics (in request order) and the
+        IDs that do not exist
+    """
+    data = request.get_json(silent=True) or {}
+    topic_ids = data.get("ids")
+
+    if not isinstance(topic_ids, list) or not all(isinstance(i, str) and i for i in topic_ids):
+        return jsonify({"error": "Body must contain 'ids', a list of topic IDs"}), 400
+    if len(topic_ids) > MAX_BATCH_IDS:
+        return jsonify({"error": f"At most {MAX_BATCH_IDS} IDs per request"}), 400
+
+    try:
+        topics_service = current_app.topics_service
+
+        topics, missing = topics_service.get_topics_by_ids(topic_ids)
+
+        return jsonify({
+            "count": len(topics),
+            "topics": topics,
+            "missing": missing
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @bp.route("/search", methods=["GET"])
 @login_required
 def search_topics():
     """
-    Search topics by keyword in display name or description.
+    Search topics by keyword in display name, keywords or description.
+
+    Results are ranked by relevance (BM25 with field boosts). The last
+    word of the query also matches as a prefix.
 
     Query Parameters:
         q: Search query
@@ -108,26 +364,9 @@ def search_topics():
         field_name = request.args.get("field")
         limit = min(int(request.args.get("limit", 20)), 100)
 
-        db = firestore.client()
-        topics_service = OpenAlexTopicsService(db)
-
-        # Get all topics (with optional field filter)
-        all_topics = topics_service.get_all_topics(field_name=field_name)
-
-        # Filter by search query (simple text search)
-        matching_topics = []
-        for topic in all_topics:
-            display_name = topic.get("display_name", "").lower()
-            description = topic.get("description", "").lower()
-            keywords = [kw.lower() for kw in topic.get("keywords", [])]
+        topics_service = current_app.topics_service
 
-            if (query in display_name or
-                query in description or
-                any(query in kw for kw in keywords)):
-                matching_topics.append(topic)
-
-            if len(matching_topics) >= limit:
-                break
+        matching_topics = topics_service.search_topics(query, field_name=field_name, limit=limit)
 
         return jsonify({
             "query": query,
@@ -149,32 +388,10 @@ def get_fields():
         JSON response with list of fields
     """
     try:
-        db = firestore.client()
-        topics_service = OpenAlexTopicsService(db)
-
-        # Get all topics
-        all_topics = topics_service.get_all_topics()
-
-        # Extract unique fields
-        fields = {}
-        for topic in all_topics:
-            field = topic.get("field")
-            if field and field.get("id"):
-                field_id = field.get("id")
-                if field_id not in fields:
-                    fields[field_id] = {
-                        "id": field_id,
-                        "display_name": field.get("display_name"),
-                        "topic_count": 0
-                    }
-                fields[field_id]["topic_count"] += 1
-
-        # Convert to list and sort by topic count
-        fields_list = sorted(
-            fields.values(),
-            key=lambda x: x["topic_count"],
-            reverse=True
-        )
+        topics_service = current_app.topics_service
+
+        # Precomputed at ingest, sorted by topic count
+        fields_list = topics_service.get_aggregates()["fields"]
 
         return jsonify({
             "count": len(fields_list),
@@ -195,48 +412,10 @@ def get_stats():
         JSON response with statistics
     """
     try:
-        db = firestore.client()
-        topics_service = OpenAlexTopicsService(db)
-
-        # Get all topics
-        all_topics = topics_service.get_all_topics()
-
-        # Calculate statistics
-        total_topics = len(all_topics)
-        total_works = sum(t.get("works_count", 0) for t in all_topics)
-
-        # Count by field
-        fields = {}
-        for topic in all_topics:
-            field = topic.get("field")
-            if field and field.get("display_name"):
-                field_name = field.get("display_name")
-                if field_name not in fields:
-                    fields[field_name] = {"topic_count": 0, "works_count": 0}
-                fields[field_name]["topic_count"] += 1
-                fields[field_name]["works_count"] += topic.get("works_count", 0)
-
-        # Top topics by works count
-        top_topics = sorted(
-            all_topics,
-            key=lambda x: x.get("works_count", 0),
-            reverse=True
-        )[:10]
+        topics_service = current_app.topics_service
 
-        return jsonify({
-            "total_topics": total_topics,
-            "total_works": total_works,
-            "fields": fields,
-            "top_topics": [
-                {
-                    "id": t.get("id"),
-                    "display_name": t.get("display_name"),
-                    "works_count": t.get("works_count"),
-                    "field": t.get("field", {}).get("display_name")
-                }
-                for t in top_topics
-            ]
-        }), 200
+        # Precomputed at ingest
+        return jsonify(topics_service.get_aggregates()["stats"]), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
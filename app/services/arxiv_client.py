@@ -15,6 +15,12 @@ class ArxivClient:
     """Client for arXiv API"""
 
     BASE_URL = "http://export.arxiv.org/api/query"
+    NAMESPACES = {'atom': 'http://www.w3.org/2005/Atom',
+                  'arxiv': 'http://arxiv.org/schemas/atom'}
+
+    def __init__(self):
+        """Initialize arXiv client."""
+        self.session = requests.Session()
 
     def search_papers(
         self,
@@ -33,6 +39,26 @@ class ArxivClient:
         Returns:
             List of normalized paper dicts
         """
+        content = self.fetch_raw(query, days_back, max_results)
+        return self.parse_raw(content, max_results)
+
+    def fetch_raw(
+        self,
+        query: str,
+        days_back: int = 7,
+        max_results: int = 50
+    ) -> bytes:
+        """
+        Fetch the raw Atom feed for a query.
+
+        Args:
+            query: Search query
+            days_back: How many days back to search (unused - arXiv sorts by relevance)
+            max_results: Maximum results
+
+        Returns:
+            Raw Atom XML (empty bytes on API error)
+        """
         params = {
             'search_query': f'all:{query}',
             'start': 0,
@@ -42,30 +68,46 @@ class ArxivClient:
         }
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 self.BASE_URL,
                 params=params,
                 timeout=30
             )
             response.raise_for_status()
+            return response.content
 
-            # Parse XML response
-            root = ET.fromstring(response.content)
-            ns = {'atom': 'http://www.w3.org/2005/Atom',
-                  'arxiv': 'http://arxiv.org/schemas/atom'}
+        except Exception as e:
+            print(f'arXiv API error: {str(e)}')
+            return b''
 
-            papers = []
-            for entry in root.findall('atom:entry', ns):
-                paper = self._parse_entry(entry, ns)
-                if paper:
-                    papers.append(paper)
+    def parse_raw(self, content: bytes, max_results: int = 50) -> List[Dict]:
+        """
+        Parse a raw Atom feed into normalized papers.
 
-            return papers
+        Args:
+            content: Raw Atom XML from fetch_raw
+            max_results: Maximum results
 
-        except Exception as e:
+        Returns:
+            List of normalized paper dicts
+        """
+        if not content:
+            return []
+
+        try:
+            root = ET.fromstring(content)
+        except ET.ParseError as e:
             print(f'arXiv API error: {str(e)}')
             return []
 
+        papers = []
+        for entry in root.findall('atom:entry', self.NAMESPACES):
+            paper = self._parse_entry(entry, self.NAMESPACES)
+            if paper:
+                papers.append(paper)
+
+        return papers[:max_results]
+
     def _parse_entry(self, entry, ns) -> Optional[Dict]:
         """Parse arXiv entry XML to normalized paper dict"""
         try:
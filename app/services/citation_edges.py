@@ -0,0 +1,194 @@
+"""
+Citation Edge Log
+
+Citation edges captured by the collector from OpenAlex referenced_works
+(COLLECTOR_CAPTURE_REFERENCES), keyed by OpenAlex work IDs (e.g. "W123").
+
+    edges.log         Append-only text log of new edges ("citing<TAB>cited")
+    citations.graph   Compacted, sorted and deduplicated edges as a
+                      memory-mappable CitationGraph file
+
+Edges already in the graph file or the log are not appended again.
+Compaction merges the log into a new graph file and starts a fresh log.
+It runs at the end of each collection run that appended edges, and
+whenever the log reaches CITATION_EDGES_COMPACT_EDGES edges.
+
+Configuration (environment):
+    CITATION_EDGES_DIR            Storage directory (default /tmp/research-watcher-citations)
+    CITATION_EDGES_COMPACT_EDGES  Log size that triggers compaction (default 200000)
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .citation_graph import CitationGraph
+
+
+CITATION_EDGES_DIR = os.getenv('CITATION_EDGES_DIR', '/tmp/research-watcher-citations')
+CITATION_EDGES_COMPACT_EDGES = int(os.getenv('CITATION_EDGES_COMPACT_EDGES', '200000'))
+
+LOG_FILE = 'edges.log'
+GRAPH_FILE = 'citations.graph'
+
+Edge = Tuple[str, str]
+
+
+def take_references(papers: Iterable[Dict]) -> List[Edge]:
+    """
+    Remove captured references from papers and return them as edges.
+
+    Papers keep their openalexId; only the references list is dropped, so
+    it is never stored with the paper.
+
+    Returns:
+        (citing work ID, cited work ID) pairs
+    """
+    edges = []
+    for paper in papers:
+        references = paper.pop('references', None)
+        citing = paper.get('openalexId')
+        if citing and references:
+            edges.extend((citing, cited) for cited in references if cited and cited != citing)
+    return edges
+
+
+class CitationEdgeLog:
+    """Deduplicated append-only edge log with compaction into a CitationGraph file."""
+
+    def __init__(self, directory: str = CITATION_EDGES_DIR, compact_edges: int = CITATION_EDGES_COMPACT_EDGES):
+        """
+        Open (or create) the edge store.
+
+        Args:
+            directory: Storage directory
+            compact_edges: Log size that triggers compaction on append
+        """
+        self.directory = directory
+        self.compact_edges = compact_edges
+        self.log_path = os.path.join(directory, LOG_FILE)
+        self.graph_path = os.path.join(directory, GRAPH_FILE)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        self.graph: Optional[CitationGraph] = None
+        if os.path.exists(self.graph_path):
+            self.graph = CitationGraph.load(self.graph_path)
+        self._pending: Set[Edge] = set(self._read_log(self.log_path))
+
+    @property
+    def pending(self) -> int:
+        """Edges in the log awaiting compaction."""
+        return len(self._pending)
+
+    @staticmethod
+    def _read_log(path: str) -> List[Edge]:
+        if not os.path.exists(path):
+            return []
+        edges = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                parts = line.rstrip('\n').split('\t')
+                # A torn final line from a crash is skipped
+                if len(parts) == 2 and all(parts):
+                    edges.append((parts[0], parts[1]))
+        return edges
+
+    def _in_graph(self, citing: str, cited: str) -> bool:
+        graph = self.graph
+        if graph is None:
+            return False
+        source, target = graph.nodes.get(citing), graph.nodes.get(cited)
+        if source is None or target is None:
+            return False
+        targets = graph.out_targets[graph.out_offsets[source]:graph.out_offsets[source + 1]]
+        position = np.searchsorted(targets, target)
+        return position < len(targets) and targets[position] == target
+
+    def append(self, edges: Iterable[Edge]) -> int:
+        """
+        Append edges not already stored.
+
+        Returns:
+            Number of new edges written
+        """
+        with self._lock:
+            new_edges = []
+            for edge in edges:
+                if edge[0] == edge[1] or edge in self._pending or self._in_graph(*edge):
+                    continue
+                self._pending.add(edge)
+                new_edges.append(edge)
+
+            if new_edges:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(f'{citing}\t{cited}\n' for citing, cited in new_edges))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            if len(self._pending) >= self.compact_edges:
+                self._compact()
+            return len(new_edges)
+
+    def compact(self) -> int:
+        """
+        Merge the log into the graph file and start a new log.
+
+        Returns:
+            Number of edges in the compacted graph
+        """
+        with self._lock:
+            return self._compact()
+
+    def _compact(self) -> int:
+        if not self._pending:
+            return self.graph.edge_count if self.graph is not None else 0
+
+        paper_ids: List[str] = []
+        nodes: Dict[str, int] = {}
+        sources = np.zeros(0, dtype=np.int32)
+        targets = np.zeros(0, dtype=np.int32)
+        if self.graph is not None:
+            paper_ids = list(self.graph.paper_ids)
+            nodes = dict(self.graph.nodes)
+            degrees = np.diff(self.graph.out_offsets)
+            sources = np.repeat(np.arange(len(paper_ids), dtype=np.int32), degrees)
+            targets = np.asarray(self.graph.out_targets, dtype=np.int32)
+
+        new_sources, new_targets = [], []
+        for citing, cited in sorted(self._pending):
+            for paper_id in (citing, cited):
+                if paper_id not in nodes:
+                    nodes[paper_id] = len(paper_ids)
+                    paper_ids.append(paper_id)
+            new_sources.append(nodes[citing])
+            new_targets.append(nodes[cited])
+
+        graph = CitationGraph.from_arrays(
+            paper_ids,
+            np.concatenate((sources, np.asarray(new_sources, dtype=np.int32))),
+            np.concatenate((targets, np.asarray(new_targets, dtype=np.int32)))
+        )
+        # The graph file is replaced atomically before the log is cleared,
+        # so a crash in between only leaves edges that are re-merged later
+        graph.save(self.graph_path)
+        os.remove(self.log_path)
+
+        self.graph = CitationGraph.load(self.graph_path)
+        self._pending = set()
+        return graph.edge_count
+
+
+_shared_log: Optional[CitationEdgeLog] = None
+_shared_log_lock = threading.Lock()
+
+
+def get_citation_edges() -> CitationEdgeLog:
+    """Return the process-wide citation edge log, opening it on first use."""
+    global _shared_log
+    with _shared_log_lock:
+        if _shared_log is None:
+            _shared_log = CitationEdgeLog()
+        return _shared_log
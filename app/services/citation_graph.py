@@ -0,0 +1,356 @@
+"""
+Citation Graph
+
+Compact citation graph for k-hop expansion (research network boundaries,
+exploration blobs).
+
+Paper IDs are mapped to dense int32 node IDs and edges are stored as CSR
+arrays in both directions:
+
+    out_offsets, out_targets   papers each paper cites (references)
+    in_offsets, in_sources     papers citing each paper
+
+Expansion is a multi-source BFS over whole frontiers at a time: each hop
+gathers the neighbors of every frontier node with array operations, so
+cost is proportional to the edges touched, not Python-level per-edge work.
+
+Graphs serialize to a single file whose arrays are page-aligned and can be
+memory-mapped on load, so large graphs open without being read into
+memory.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Expansion directions
+CITES = 'cites'
+CITED_BY = 'cited_by'
+BOTH = 'both'
+DIRECTIONS = (CITES, CITED_BY, BOTH)
+
+FILE_MAGIC = b'RWCGRAPH'
+FILE_VERSION = 1
+ALIGNMENT = 4096
+
+_ARRAYS = ('out_offsets', 'out_targets', 'in_offsets', 'in_sources', 'id_offsets', 'id_bytes')
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR (offsets, columns) of edges sorted by row."""
+    order = np.lexsort((cols, rows))
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+    return offsets, cols[order].astype(np.int32)
+
+
+def _gather(offsets: np.ndarray, columns: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Concatenated CSR neighbors of several nodes."""
+    starts = offsets[nodes]
+    lengths = offsets[nodes + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int32)
+    # Position of each gathered edge: its node's start plus its rank within the node
+    shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return columns[shifts + np.arange(total)]
+
+
+class CitationGraph:
+    """Directed citation graph as forward and reverse CSR arrays."""
+
+    def __init__(
+        self,
+        paper_ids: Sequence[str],
+        out_offsets: np.ndarray,
+        out_targets: np.ndarray,
+        in_offsets: np.ndarray,
+        in_sources: np.ndarray
+    ):
+        """
+        Args:
+            paper_ids: Paper ID of each node
+            out_offsets, out_targets: Forward CSR (node -> papers it cites)
+            in_offsets, in_sources: Reverse CSR (node -> papers citing it)
+        """
+        self.paper_ids = paper_ids
+        self.nodes: Dict[str, int] = {paper_id: node for node, paper_id in enumerate(paper_ids)}
+        self.out_offsets = out_offsets
+        self.out_targets = out_targets
+        self.in_offsets = in_offsets
+        self.in_sources = in_sources
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str]]) -> 'CitationGraph':
+        """
+        Build from (citing paper ID, cited paper ID) pairs.
+
+        Duplicate edges and self-citations are dropped.
+        """
+        nodes: Dict[str, int] = {}
+        sources: List[int] = []
+        targets: List[int] = []
+        for source, target in edges:
+            if source == target:
+                continue
+            sources.append(nodes.setdefault(source, len(nodes)))
+            targets.append(nodes.setdefault(target, len(nodes)))
+        return cls.from_arrays(
+            list(nodes),
+            np.asarray(sources, dtype=np.int32),
+            np.asarray(targets, dtype=np.int32)
+        )
+
+    @classmethod
+    def from_arrays(cls, paper_ids: Sequence[str], sources: np.ndarray, targets: np.ndarray) -> 'CitationGraph':
+        """
+        Build from parallel node ID arrays (citing, cited).
+
+        Args:
+            paper_ids: Paper ID of each node
+            sources: Citing node of each edge
+            targets: Cited node of each edge
+        """
+        n = len(paper_ids)
+        keep = sources != targets
+        keys = np.unique(sources[keep].astype(np.int64) * n + targets[keep])
+        sources, targets = np.divmod(keys, max(n, 1))
+
+        out_offsets, out_targets = _csr(sources, targets, n)
+        in_offsets, in_sources = _csr(targets, sources, n)
+        return cls(paper_ids, out_offsets, out_targets, in_offsets, in_sources)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.paper_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.out_targets)
+
+    def references(self, paper_id: str) -> List[str]:
+        """Papers a paper cites."""
+        node = self.nodes.get(paper_id)
+        if node is None:
+            return []
+        return [self.paper_ids[t] for t in self.out_targets[self.out_offsets[node]:self.out_offsets[node + 1]]]
+
+    def citations(self, paper_id: str) -> List[str]:
+        """Papers citing a paper."""
+        node = self.nodes.get(paper_id)
+        if node is None:
+            return []
+        return [self.paper_ids[s] for s in self.in_sources[self.in_offsets[node]:self.in_offsets[node + 1]]]
+
+    def edges_within(self, paper_ids: Iterable[str], block_size: int = 4096) -> Iterator[Tuple[str, str]]:
+        """
+        Citation edges whose citing and cited papers are both in paper_ids.
+
+        Edges are gathered for block_size citing papers at a time, so a
+        network's edges can be streamed without materializing all of them.
+
+        Yields:
+            (citing paper ID, cited paper ID) pairs
+        """
+        nodes = np.unique(np.asarray([self.nodes[p] for p in paper_ids if p in self.nodes], dtype=np.int32))
+        member = np.zeros(self.node_count, dtype=bool)
+        member[nodes] = True
+
+        for start in range(0, len(nodes), block_size):
+            block = nodes[start:start + block_size]
+            targets = _gather(self.out_offsets, self.out_targets, block)
+            sources = np.repeat(block, self.out_offsets[block + 1] - self.out_offsets[block])
+            keep = member[targets]
+            for source, target in zip(sources[keep].tolist(), targets[keep].tolist()):
+                yield self.paper_ids[source], self.paper_ids[target]
+
+    def expand_nodes(
+        self,
+        seeds: np.ndarray,
+        depth: int,
+        direction: str = BOTH,
+        exclude: Optional[np.ndarray] = None,
+        max_nodes: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Multi-source BFS from node IDs.
+
+        Args:
+            seeds: Seed node IDs (hop 0)
+            depth: Maximum hops from the nearest seed
+            direction: cites (follow references), cited_by (follow
+                       citing papers) or both
+            exclude: Node IDs neither returned nor expanded through
+            max_nodes: Stop once this many nodes (seeds included) are
+                       reached; the last hop is truncated in node ID order
+
+        Returns:
+            (nodes, hops) in BFS order
+
+        Raises:
+            ValueError: If direction is unknown or depth is negative
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f'direction must be one of: {", ".join(DIRECTIONS)}')
+        if depth < 0:
+            raise ValueError('depth must be non-negative')
+
+        hops = np.full(self.node_count, -1, dtype=np.int16)
+        if exclude is not None and len(exclude):
+            hops[exclude] = -2
+
+        frontier = np.unique(seeds).astype(np.int32)
+        frontier = frontier[hops[frontier] == -1]
+        if max_nodes is not None:
+            frontier = frontier[:max_nodes]
+        hops[frontier] = 0
+        reached = [frontier]
+        total = len(frontier)
+
+        for hop in range(1, depth + 1):
+            if len(frontier) == 0 or (max_nodes is not None and total >= max_nodes):
+                break
+            parts = []
+            if direction in (CITES, BOTH):
+                parts.append(_gather(self.out_offsets, self.out_targets, frontier))
+            if direction in (CITED_BY, BOTH):
+                parts.append(_gather(self.in_offsets, self.in_sources, frontier))
+            neighbors = np.concatenate(parts)
+
+            candidates = neighbors[hops[neighbors] == -1]
+            if len(candidates) * 16 < self.node_count:
+                frontier = np.unique(candidates)
+            else:
+                # Large hops: mark and scan instead of sorting the candidates
+                hops[candidates] = hop
+                frontier = np.flatnonzero(hops == hop).astype(np.int32)
+            if max_nodes is not None and len(frontier) > max_nodes - total:
+                hops[frontier[max_nodes - total:]] = -1
+                frontier = frontier[:max_nodes - total]
+            hops[frontier] = hop
+            reached.append(frontier)
+            total += len(frontier)
+
+        nodes = np.concatenate(reached)
+        return nodes, hops[nodes].astype(np.int32)
+
+    def expand(
+        self,
+        seed_papers: Iterable[str],
+        depth: int,
+        direction: str = BOTH,
+        exclude: Iterable[str] = (),
+        max_nodes: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Papers within depth citation hops of any seed paper.
+
+        Seeds and exclusions not in the graph are ignored. See
+        expand_nodes() for the arguments.
+
+        Returns:
+            Dict of paper ID to hop distance (seeds are 0), in BFS order
+        """
+        seeds = np.asarray([self.nodes[p] for p in seed_papers if p in self.nodes], dtype=np.int32)
+        excluded = np.asarray([self.nodes[p] for p in exclude if p in self.nodes], dtype=np.int32)
+        nodes, hops = self.expand_nodes(seeds, depth, direction, excluded, max_nodes)
+        return {self.paper_ids[node]: int(hop) for node, hop in zip(nodes.tolist(), hops.tolist())}
+
+    def save(self, path: str) -> None:
+        """
+        Write the graph to a single memory-mappable file.
+
+        Layout: magic, header length (uint64), JSON header listing each
+        array's dtype, length and byte offset, then the arrays at
+        ALIGNMENT-byte boundaries. Paper IDs are stored as UTF-8 bytes
+        plus offsets.
+        """
+        encoded = [paper_id.encode('utf-8') for paper_id in self.paper_ids]
+        id_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=id_offsets[1:])
+        arrays = {
+            'out_offsets': np.asarray(self.out_offsets, dtype=np.int64),
+            'out_targets': np.asarray(self.out_targets, dtype=np.int32),
+            'in_offsets': np.asarray(self.in_offsets, dtype=np.int64),
+            'in_sources': np.asarray(self.in_sources, dtype=np.int32),
+            'id_offsets': id_offsets,
+            'id_bytes': np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        }
+
+        # Header size depends on the offsets it lists, so reserve a fixed block
+        header_size = ALIGNMENT - len(FILE_MAGIC) - 8
+        position = ALIGNMENT
+        layout = {}
+        for name in _ARRAYS:
+            layout[name] = {'dtype': arrays[name].dtype.str, 'length': len(arrays[name]), 'offset': position}
+            position += -(-arrays[name].nbytes // ALIGNMENT) * ALIGNMENT
+        header = json.dumps({'version': FILE_VERSION, 'arrays': layout}).encode('utf-8')
+        if len(header) > header_size:
+            raise ValueError('Citation graph header too large')
+
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(FILE_MAGIC)
+            f.write(np.uint64(len(header)).tobytes())
+            f.write(header)
+            for name in _ARRAYS:
+                f.seek(layout[name]['offset'])
+                f.write(arrays[name].tobytes())
+            f.truncate(position)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'CitationGraph':
+        """
+        Open a graph written by save().
+
+        Args:
+            path: Graph file
+            mmap: Memory-map the edge arrays instead of reading them
+
+        Raises:
+            ValueError: If the file is not a citation graph
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f'{path} is not a citation graph file')
+            header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_length))
+        if header.get('version') != FILE_VERSION:
+            raise ValueError(f'Unsupported citation graph version: {header.get("version")}')
+
+        if mmap:
+            data = np.memmap(path, dtype=np.uint8, mode='r')
+        else:
+            with open(path, 'rb') as f:
+                data = np.frombuffer(f.read(), dtype=np.uint8)
+
+        arrays = {
+            name: np.frombuffer(data, dtype=np.dtype(spec['dtype']), count=spec['length'], offset=spec['offset'])
+            for name, spec in header['arrays'].items()
+        }
+        id_bytes = arrays['id_bytes'].tobytes()
+        id_offsets = arrays['id_offsets'].tolist()
+        paper_ids = [id_bytes[start:end].decode('utf-8') for start, end in zip(id_offsets, id_offsets[1:])]
+
+        return cls(paper_ids, arrays['out_offsets'], arrays['out_targets'], arrays['in_offsets'], arrays['in_sources'])
+
+
+def expand_citations(
+    graph: CitationGraph,
+    seed_papers: Iterable[str],
+    depth: int,
+    direction: str = BOTH,
+    exclude: Iterable[str] = (),
+    max_nodes: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Papers within depth citation hops of the seed papers.
+
+    Convenience wrapper for CitationGraph.expand() matching the research
+    networks design.
+    """
+    return graph.expand(seed_papers, depth, direction, exclude, max_nodes)
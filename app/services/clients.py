@@ -0,0 +1,122 @@
+"""
+Process-wide source client registry.
+
+Source clients are created once per process and shared by every request
+thread and collector worker, so HTTP connections (DNS, TCP and TLS
+setup) are reused instead of being rebuilt for each search or user.
+
+Configuration (environment):
+    GUNICORN_THREADS        Request threads per worker (default 8)
+    COLLECTOR_FETCH_WORKERS Collector fetch threads (default 8)
+    HTTP_POOL_SIZE          Connections kept per upstream host
+                            (default GUNICORN_THREADS + COLLECTOR_FETCH_WORKERS)
+    PRECONNECT_UPSTREAMS    Open connections to upstream hosts at startup
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .arxiv_client import ArxivClient
+from .openalex import OpenAlexClient
+from .semantic_scholar import SemanticScholarClient
+
+
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '8'))
+HTTP_POOL_SIZE = int(os.getenv(
+    'HTTP_POOL_SIZE',
+    str(GUNICORN_THREADS + int(os.getenv('COLLECTOR_FETCH_WORKERS', '8')))
+))
+
+_CLIENT_CLASSES = {
+    'openalex': OpenAlexClient,
+    's2': SemanticScholarClient,
+    'arxiv': ArxivClient
+}
+
+# Lightweight URLs used to open a connection to each upstream host
+_PRECONNECT_URLS = {
+    'openalex': OpenAlexClient.BASE_URL,
+    's2': SemanticScholarClient.BASE_URL,
+    'arxiv': ArxivClient.BASE_URL
+}
+
+_clients: Dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+
+def mount_pooled_adapter(session: requests.Session, pool_size: Optional[int] = None) -> requests.Session:
+    """
+    Mount connection-pooling adapters sized for concurrent use.
+
+    Args:
+        session: Session to configure
+        pool_size: Connections kept per host (defaults to HTTP_POOL_SIZE)
+
+    Returns:
+        The same session
+    """
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size or HTTP_POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_client(source: str):
+    """
+    Return the shared client for a source, creating it on first use.
+
+    The clients only issue independent GET requests through their session,
+    which is safe to share between threads.
+
+    Args:
+        source: Source key ('openalex', 's2' or 'arxiv')
+
+    Returns:
+        Shared client instance
+    """
+    client = _clients.get(source)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(source)
+        if client is None:
+            client = _CLIENT_CLASSES[source]()
+            mount_pooled_adapter(client.session)
+            _clients[source] = client
+        return client
+
+
+def get_clients() -> Dict[str, object]:
+    """Return shared clients for all sources, keyed by source key."""
+    return {source: get_client(source) for source in _CLIENT_CLASSES}
+
+
+def preconnect(timeout: float = 5.0) -> threading.Thread:
+    """
+    Warm connections to every upstream host in the background.
+
+    Issues one HEAD request per source through the shared sessions so DNS
+    resolution and the TLS handshake are done before the first search.
+    Failures are ignored.
+
+    Args:
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        The started daemon thread
+    """
+    def _warm():
+        for source, url in _PRECONNECT_URLS.items():
+            try:
+                get_client(source).session.head(url, timeout=timeout, allow_redirects=False)
+            except requests.RequestException as e:
+                print(f'Preconnect to {source} failed: {str(e)}')
+
+    thread = threading.Thread(target=_warm, name='preconnect-upstreams', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,655 @@
+"""
+Background collection runs.
+
+Executes collector runs off the request thread and tracks live progress
+so the trigger endpoint can return immediately and be polled for status.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.utils.singleflight import SingleFlight
+
+from .citation_edges import take_references
+from .clients import get_clients
+from .collector import fetch_seed_payloads, fetch_topic_works, rank_payloads, topic_payload
+from .rate_limit import get_source_limiters
+from .run_state import RunStateStore
+from .scheduler import FairScheduler, summarize_completion
+from .seeds import split_seeds
+
+
+# Number of runs that may execute concurrently in this process
+MAX_CONCURRENT_RUNS = int(os.getenv('COLLECTOR_MAX_CONCURRENT_RUNS', '1'))
+
+# Threads fetching (user, seed) tasks within a run
+COLLECTOR_FETCH_WORKERS = int(os.getenv('COLLECTOR_FETCH_WORKERS', '8'))
+
+# Users scheduled together between cursor checkpoints
+COLLECTOR_BATCH_USERS = int(os.getenv('COLLECTOR_BATCH_USERS', '25'))
+
+# Number of error messages kept in live progress
+MAX_REPORTED_ERRORS = 20
+
+# Number of finished runs kept in memory for status polling
+MAX_TRACKED_RUNS = 50
+
+# Coalesces concurrent fetches of the same query seed (across users and runs)
+seed_flight = SingleFlight()
+
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_RUNS, thread_name_prefix='collector')
+_active_runs: Dict[str, 'RunProgress'] = {}
+_active_runs_lock = threading.Lock()
+
+
+class RunProgress:
+    """Thread-safe live progress for a single collection run."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.status = 'queued'
+        self.queued_at = datetime.utcnow().isoformat() + 'Z'
+        self.started_at: Optional[str] = None
+        self.completed_at: Optional[str] = None
+        self.users_total: Optional[int] = None
+        self.stats = {
+            'usersProcessed': 0,
+            'usersSkipped': 0,
+            'usersFailed': 0,
+            'papersCollected': 0,
+            'digestsCreated': 0,
+            'seedFetchesCoalesced': 0,
+            'errors': []
+        }
+        self.timings: Dict[str, Dict] = {}
+        self.completion_times: List = []
+        self._started = None
+        self._lock = threading.Lock()
+
+    def start(self, users_total: Optional[int]) -> None:
+        with self._lock:
+            self.status = 'running'
+            self.started_at = datetime.utcnow().isoformat() + 'Z'
+            self.users_total = users_total
+            self._started = time.monotonic()
+
+    def user_processed(self, paper_count: int) -> None:
+        with self._lock:
+            self.stats['usersProcessed'] += 1
+            if paper_count:
+                self.stats['papersCollected'] += paper_count
+                self.stats['digestsCreated'] += 1
+
+    def seed_fetch_coalesced(self) -> None:
+        with self._lock:
+            self.stats['seedFetchesCoalesced'] += 1
+
+    def user_skipped(self) -> None:
+        with self._lock:
+            self.stats['usersSkipped'] += 1
+
+    def user_failed(self, error_msg: str) -> None:
+        with self._lock:
+            self.stats['usersFailed'] += 1
+            self.stats['errors'].append(error_msg)
+
+    def merge_timings(self, timings: Dict[str, Dict]) -> None:
+        with self._lock:
+            for source, entry in timings.items():
+                total = self.timings.setdefault(source, {'calls': 0, 'seconds': 0.0, 'waitSeconds': 0.0})
+                total['calls'] += entry['calls']
+                total['seconds'] += entry['seconds']
+                total['waitSeconds'] += entry.get('waitSeconds', 0.0)
+
+    def add_completion_times(self, times) -> None:
+        """Record (tier, seconds) completion times for finished users."""
+        with self._lock:
+            self.completion_times.extend(times)
+
+    def finish(self, status: str) -> None:
+        with self._lock:
+            self.status = status
+            self.completed_at = datetime.utcnow().isoformat() + 'Z'
+
+    def final_stats(self) -> Dict:
+        """Stats in the shape returned by the synchronous collector."""
+        with self._lock:
+            return {
+                'usersProcessed': self.stats['usersProcessed'],
+                'usersSkipped': self.stats['usersSkipped'],
+                'usersFailed': self.stats['usersFailed'],
+                'papersCollected': self.stats['papersCollected'],
+                'digestsCreated': self.stats['digestsCreated'],
+                'seedFetchesCoalesced': self.stats['seedFetchesCoalesced'],
+                'errors': list(self.stats['errors']),
+                'userCompletion': summarize_completion(self.completion_times)
+            }
+
+    def snapshot(self) -> Dict:
+        """
+        Build a JSON-serializable progress report.
+
+        Returns:
+            Progress dict including per-source timings and an ETA
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started if self._started is not None else 0.0
+            handled = (self.stats['usersProcessed'] + self.stats['usersSkipped'] +
+                       self.stats['usersFailed'])
+
+            eta_seconds = None
+            if self.status == 'running' and self.users_total and handled:
+                remaining = max(0, self.users_total - handled)
+                eta_seconds = round(elapsed / handled * remaining, 1)
+
+            sources = {}
+            for source, entry in self.timings.items():
+                calls = entry['calls']
+                sources[source] = {
+                    'calls': calls,
+                    'totalMs': int(entry['seconds'] * 1000),
+                    'avgMs': int(entry['seconds'] * 1000 / calls) if calls else 0,
+                    'rateLimitWaitMs': int(entry['waitSeconds'] * 1000)
+                }
+
+            return {
+                'runId': self.run_id,
+                'status': self.status,
+                'queuedAt': self.queued_at,
+                'startedAt': self.started_at,
+                'completedAt': self.completed_at,
+                'elapsedSeconds': round(elapsed, 1),
+                'etaSeconds': eta_seconds,
+                'users': {
+                    'total': self.users_total,
+                    'done': handled,
+                    'processed': self.stats['usersProcessed'],
+                    'skipped': self.stats['usersSkipped'],
+                    'failed': self.stats['usersFailed']
+                },
+                'papersCollected': self.stats['papersCollected'],
+                'digestsCreated': self.stats['digestsCreated'],
+                'seedFetchesCoalesced': self.stats['seedFetchesCoalesced'],
+                'errorCount': len(self.stats['errors']),
+                'errors': self.stats['errors'][-MAX_REPORTED_ERRORS:],
+                'sources': sources,
+                'userCompletion': summarize_completion(self.completion_times)
+            }
+
+
+class CollectionRunner:
+    """Runs collection for all users with checkpointed run state."""
+
+    def __init__(
+        self,
+        db,
+        publisher,
+        topic_path: str,
+        logger,
+        paper_index=None,
+        paper_vectors=None,
+        citation_edges=None
+    ):
+        """
+        Initialize the collection runner.
+
+        Args:
+            db: Firestore client instance
+            publisher: Pub/Sub publisher client
+            topic_path: Full Pub/Sub topic path for WAL events
+            logger: Logger (usually the Flask app logger)
+            paper_index: Local PaperIndex updated with written papers (optional)
+            paper_vectors: PaperVectors to append written papers to (optional)
+            citation_edges: CitationEdgeLog for captured references (optional)
+        """
+        self.db = db
+        self.publisher = publisher
+        self.topic_path = topic_path
+        self.logger = logger
+        self.paper_index = paper_index
+        self.paper_vectors = paper_vectors
+        self.citation_edges = citation_edges
+        self.run_state = RunStateStore(db)
+
+    def run(self, run_id: str, progress: Optional[RunProgress] = None) -> Dict:
+        """
+        Collect papers for every user with seeds.
+
+        Process:
+        1. Create or resume the run state document (runs/{runId})
+        2. Retry users that failed earlier in this run (capped attempts)
+        3. Continue through users after the run's cursor in batches. For
+           each batch:
+           - Fetch the batch's topic seeds not yet fetched in this run with
+             batched topics.id filters, shared by every user following them
+           - Fetch (user, query seed) tasks concurrently in weighted fair order
+           - As each user's last seed finishes: deduplicate, score, write
+             to Firestore (papers/, digests/) and publish the WAL event
+           - Advance the cursor past the batch
+
+        Args:
+            run_id: Collection run ID (new or to resume)
+            progress: Live progress tracker to update
+
+        Returns:
+            Result dict with status, runId, resumed flag, timestamp and stats
+        """
+        progress = progress or RunProgress(run_id)
+        run_state = self.run_state
+
+        try:
+            # Keep the original timestamp on resume so digest writes are idempotent
+            run_data = run_state.start_run(run_id, datetime.utcnow().isoformat() + 'Z')
+            timestamp = run_data['createdAt']
+            resumed = run_data['resumed']
+            cursor = run_data.get('cursor')
+
+            progress.start(self._count_users())
+            self.logger.info(f'Collection started: runId={run_id}, resumed={resumed}')
+
+            user_states = run_state.get_user_states(run_id) if resumed else {}
+            clients = get_clients()
+            limiters = get_source_limiters()
+            topic_works: Dict[str, List[Dict]] = {}
+
+            batch: List[Dict] = []
+            batch_uids: List[str] = []
+
+            for user_doc in self._iter_run_users(run_id, cursor, user_states):
+                uid = user_doc.id
+                batch_uids.append(uid)
+
+                if not run_state.should_process(user_states.get(uid)):
+                    progress.user_skipped()
+                elif not self._queue_user(batch, user_doc, user_states.get(uid)):
+                    progress.user_skipped()
+
+                if len(batch_uids) >= COLLECTOR_BATCH_USERS:
+                    self._run_batch(run_id, timestamp, batch, clients, limiters, topic_works, progress)
+                    cursor = max(filter(None, [cursor] + batch_uids))
+                    run_state.advance_cursor(run_id, cursor, progress.snapshot())
+                    batch, batch_uids = [], []
+
+            if batch_uids:
+                self._run_batch(run_id, timestamp, batch, clients, limiters, topic_works, progress)
+                cursor = max(filter(None, [cursor] + batch_uids))
+                run_state.advance_cursor(run_id, cursor, progress.snapshot())
+
+            self._compact_citation_edges()
+
+            stats = progress.final_stats()
+            run_state.finish_run(run_id, stats)
+            progress.finish('completed')
+
+            self.logger.info(f'Collection completed: runId={run_id}, stats={stats}')
+
+            return {
+                'status': 'completed',
+                'runId': run_id,
+                'resumed': resumed,
+                'timestamp': timestamp,
+                'stats': stats
+            }
+
+        except Exception as e:
+            error_msg = f'Collection failed: {str(e)}'
+            self.logger.error(error_msg)
+            progress.finish('failed')
+            try:
+                run_state.fail_run(run_id, error_msg)
+            except Exception:
+                pass
+            return {
+                'status': 'failed',
+                'runId': run_id,
+                'error': error_msg
+            }
+
+    def _queue_user(self, batch: List[Dict], user_doc, previous_state: Optional[Dict]) -> bool:
+        """
+        Add a user with seeds to the current batch.
+
+        Returns:
+            False if the user has no seeds
+        """
+        uid = user_doc.id
+        seeds_doc = self.db.collection('seeds').document(uid).get()
+        seeds = seeds_doc.to_dict().get('items', []) if seeds_doc.exists else []
+        queries, topic_ids = split_seeds(seeds)
+
+        if not queries and not topic_ids:
+            return False
+
+        user_data = user_doc.to_dict() or {}
+        batch.append({
+            'uid': uid,
+            'tier': user_data.get('tier', 'free'),
+            'seeds': queries,
+            'topicIds': topic_ids,
+            'previousState': previous_state,
+            'payloads': [None] * len(queries),
+            'fetchErrors': []
+        })
+        return True
+
+    def _run_batch(
+        self,
+        run_id: str,
+        timestamp: str,
+        batch: List[Dict],
+        clients: Dict[str, object],
+        limiters: Dict[str, object],
+        topic_works: Dict[str, List[Dict]],
+        progress: RunProgress
+    ) -> None:
+        """
+        Fetch and finalize a batch of users with weighted fair scheduling.
+
+        Topic seeds are fetched first, for the whole batch at once, and
+        cached in topic_works for the rest of the run. (user, query seed)
+        tasks are then pulled by COLLECTOR_FETCH_WORKERS threads in deficit
+        round-robin order across users, sharing the process-wide upstream
+        rate limiters. Each user is finalized by the thread that completes
+        its last seed; users with only topic seeds are finalized up front.
+        A user with a failed seed fetch is recorded as failed, not done, so
+        a resumed run retries it (up to the run's attempt cap).
+        """
+        if not batch:
+            return
+
+        self._fetch_topic_seeds(batch, topic_works, clients, limiters, progress)
+        for job in batch:
+            job['topicPayload'] = topic_payload(job['topicIds'], topic_works)
+
+        jobs = {job['uid']: job for job in batch}
+        scheduler = FairScheduler()
+        for job in batch:
+            self.run_state.mark_user_started(run_id, job['uid'], len(job['seeds']) + len(job['topicIds']))
+            scheduler.add_user(job['uid'], job['tier'], list(enumerate(job['seeds'])))
+
+        for job in batch:
+            if not job['seeds']:
+                self._finalize_user(run_id, timestamp, job, progress)
+
+        def _worker():
+            while True:
+                item = scheduler.next_task()
+                if item is None:
+                    return
+                uid, (index, seed) = item
+                job = jobs[uid]
+
+                timings: Dict[str, Dict] = {}
+                try:
+                    # Users fetching the same seed at the same time share one fetch
+                    job['payloads'][index], shared = seed_flight.do(
+                        (seed, 7, 10),
+                        lambda: fetch_seed_payloads(
+                            seed, clients, days_back=7, max_per_seed=10,
+                            timings=timings, limiters=limiters
+                        )
+                    )
+                    if shared:
+                        progress.seed_fetch_coalesced()
+                except Exception as e:
+                    self.logger.error(f'Error fetching seed for user {uid}: {str(e)}')
+                    job['fetchErrors'].append(f'seed {seed!r}: {str(e)}')
+                finally:
+                    progress.merge_timings(timings)
+                    last_task = scheduler.task_done(uid)
+
+                if last_task:
+                    self._finalize_user(run_id, timestamp, job, progress)
+
+        workers = min(COLLECTOR_FETCH_WORKERS, sum(len(job['seeds']) for job in batch))
+        threads = [
+            threading.Thread(target=_worker, name=f'collector-fetch-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        progress.add_completion_times(scheduler.completion_times().values())
+
+    def _fetch_topic_seeds(
+        self,
+        batch: List[Dict],
+        topic_works: Dict[str, List[Dict]],
+        clients: Dict[str, object],
+        limiters: Dict[str, object],
+        progress: RunProgress
+    ) -> None:
+        """Fetch the batch's topic seeds that are not yet in topic_works."""
+        missing = list(dict.fromkeys(
+            topic_id for job in batch for topic_id in job['topicIds'] if topic_id not in topic_works
+        ))
+        if not missing:
+            return
+
+        timings: Dict[str, Dict] = {}
+        try:
+            topic_works.update(fetch_topic_works(
+                missing, clients['openalex'], days_back=7, max_per_topic=10,
+                timings=timings, limiters=limiters
+            ))
+            followers = sum(1 for job in batch if job['topicIds'])
+            self.logger.info(
+                f'Fetched {len(missing)} topics in {timings.get("openalex", {}).get("calls", 0)} '
+                f'requests for {followers} users'
+            )
+        except Exception as e:
+            self.logger.error(f'Error fetching topic seeds: {str(e)}')
+            for job in batch:
+                if any(topic_id in missing for topic_id in job['topicIds']):
+                    job.setdefault('fetchErrors', []).append(f'topic seeds: {str(e)}')
+        finally:
+            progress.merge_timings(timings)
+
+    def _finalize_user(self, run_id: str, timestamp: str, job: Dict, progress: RunProgress) -> None:
+        """Rank a user's fetched payloads and write results, recording the outcome."""
+        uid = job['uid']
+        try:
+            if job.get('fetchErrors'):
+                raise RuntimeError(f"fetch failed ({'; '.join(job['fetchErrors'])})")
+
+            payloads = [payload for seed_payloads in job['payloads'] for payload in (seed_payloads or [])]
+            if job['topicIds']:
+                payloads.append(job['topicPayload'])
+            papers = rank_payloads(payloads, capture_references=self.citation_edges is not None)
+            self.logger.info(f'Collected {len(papers)} papers for user {uid}')
+
+            paper_count = self._write_user_results(run_id, timestamp, uid, papers, job['previousState'])
+            progress.user_processed(paper_count)
+
+        except Exception as e:
+            error_msg = f'Error processing user {uid}: {str(e)}'
+            self.logger.error(error_msg)
+            progress.user_failed(error_msg)
+            self.run_state.mark_user_failed(run_id, uid, str(e))
+
+    def _compact_citation_edges(self) -> None:
+        """Merge citation edges appended during the run into the graph file."""
+        if self.citation_edges is None or not self.citation_edges.pending:
+            return
+        try:
+            edge_count = self.citation_edges.compact()
+            self.logger.info(f'Compacted citation edges: {edge_count} edges')
+        except Exception as e:
+            self.logger.warning(f'Failed to compact citation edges: {str(e)}')
+
+    def _count_users(self) -> Optional[int]:
+        """Count users for ETA estimates (None if the count query fails)."""
+        try:
+            result = self.db.collection('users').count().get()
+            return int(result[0][0].value)
+        except Exception as e:
+            self.logger.warning(f'Could not count users: {str(e)}')
+            return None
+
+    def _iter_run_users(self, run_id: str, cursor: Optional[str], user_states: Dict[str, Dict]):
+        """
+        Yield user documents for a run in processing order.
+
+        Users that were started earlier in this run but did not finish are
+        yielded first, then users after the cursor in document ID order.
+        """
+        users_ref = self.db.collection('users')
+
+        if not cursor:
+            yield from users_ref.order_by('__name__').stream()
+            return
+
+        for uid, state in user_states.items():
+            if uid <= cursor and self.run_state.should_process(state):
+                user_doc = users_ref.document(uid).get()
+                if user_doc.exists:
+                    yield user_doc
+
+        cursor_doc = users_ref.document(cursor).get()
+        query = users_ref.order_by('__name__')
+        if cursor_doc.exists:
+            query = query.start_after(cursor_doc)
+        yield from query.stream()
+
+    def _write_user_results(
+        self,
+        run_id: str,
+        timestamp: str,
+        uid: str,
+        papers: List[Dict],
+        previous_state: Optional[Dict]
+    ) -> int:
+        """
+        Write a user's ranked papers and digest.
+
+        All writes are idempotent for a given (runId, uid): papers are merged,
+        the digest document is overwritten with the same content, and the WAL
+        event is not republished if an earlier attempt already published it.
+
+        Returns:
+            Number of papers collected (0 if nothing was written)
+        """
+        db = self.db
+
+        if not papers:
+            self.run_state.mark_user_done(run_id, uid, 0)
+            return 0
+
+        # Captured references become citation edges, never paper fields
+        edges = take_references(papers)
+        if edges and self.citation_edges is not None:
+            try:
+                self.citation_edges.append(edges)
+            except Exception as e:
+                self.logger.warning(f'Failed to append citation edges for user {uid}: {str(e)}')
+
+        # Upsert papers to global papers collection
+        for paper in papers[:50]:  # Limit to top 50
+            paper_id = paper.get('paperId')
+            if paper_id:
+                # Sanitize paper ID for Firestore (replace / with _)
+                safe_paper_id = paper_id.replace('/', '_')
+                paper['paperId'] = safe_paper_id  # Update in paper object too
+                paper_ref = db.collection('papers').document(safe_paper_id)
+                paper_ref.set(paper, merge=True)
+
+        # Keep the local search index and embeddings in step (both also
+        # sync from Firestore)
+        if self.paper_index is not None:
+            try:
+                self.paper_index.upsert(papers[:50])
+            except Exception as e:
+                self.logger.warning(f'Failed to update local paper index for user {uid}: {str(e)}')
+        if self.paper_vectors is not None:
+            try:
+                self.paper_vectors.add(papers[:50])
+            except Exception as e:
+                self.logger.warning(f'Failed to append paper vectors for user {uid}: {str(e)}')
+
+        # Create digest for user
+        digest_data = {
+            'uid': uid,
+            'runId': run_id,
+            'createdAt': timestamp,
+            'paperCount': len(papers),
+            'papers': [p.get('paperId').replace('/', '_') if p.get('paperId') else None for p in papers[:20]]  # Top 20 sanitized IDs
+        }
+
+        # Use digest ID that includes timestamp for historical tracking
+        # But also write to a "latest" document for easy retrieval
+        digest_ref = db.collection('digests').document(f"{uid}_latest")
+        digest_ref.set(digest_data)
+
+        message_id = (previous_state or {}).get('walMessageId')
+        if message_id:
+            self.logger.info(f'WAL event already published for user {uid}: {message_id}')
+        else:
+            # Publish WAL event to Pub/Sub
+            wal_event = {
+                'v': 1,
+                'type': 'digest.created',
+                'eventId': f'{run_id}:{uid}',
+                'runId': run_id,
+                'uid': uid,
+                'ts': timestamp,
+                'items': digest_data
+            }
+
+            message_bytes = json.dumps(wal_event).encode('utf-8')
+            future = self.publisher.publish(self.topic_path, message_bytes)
+            message_id = future.result()
+
+            self.logger.info(f'Published WAL event for user {uid}: {message_id}')
+
+        self.run_state.mark_user_done(run_id, uid, len(papers), message_id)
+        return len(papers)
+
+
+def submit_run(runner: CollectionRunner, run_id: str) -> RunProgress:
+    """
+    Queue a run on the background executor.
+
+    If the run is already queued or running in this process, the existing
+    progress tracker is returned instead of starting a second execution.
+
+    Args:
+        runner: Configured collection runner
+        run_id: Collection run ID
+
+    Returns:
+        Live progress tracker for the run
+    """
+    with _active_runs_lock:
+        existing = _active_runs.get(run_id)
+        if existing is not None and existing.status in ('queued', 'running'):
+            return existing
+
+        finished = [rid for rid, p in _active_runs.items() if p.status not in ('queued', 'running')]
+        for rid in finished[:max(0, len(_active_runs) - MAX_TRACKED_RUNS + 1)]:
+            del _active_runs[rid]
+
+        progress = RunProgress(run_id)
+        _active_runs[run_id] = progress
+
+    def _execute():
+        try:
+            runner.run(run_id, progress)
+        except Exception as e:
+            runner.logger.error(f'Background run {run_id} crashed: {str(e)}')
+            progress.finish('failed')
+
+    _executor.submit(_execute)
+    return progress
+
+
+def get_live_progress(run_id: str) -> Optional[RunProgress]:
+    """Return the in-process progress tracker for a run, if any."""
+    with _active_runs_lock:
+        return _active_runs.get(run_id)
@@ -6,12 +6,14 @@ and scoring them for user digests.
 """
 
 import hashlib
-from typing import List, Dict, Set, Tuple
-from datetime import datetime
+import os
+import time
+from typing import List, Dict, Optional, Set, Tuple
+from datetime import datetime, timedelta
 
-from .openalex import OpenAlexClient
-from .semantic_scholar import SemanticScholarClient
-from .arxiv_client import ArxivClient
+from . import cpu_stage
+from .clients import get_client, get_clients
+from .seeds import Seed, split_seeds
 
 
 def normalize_doi(doi: str) -> str:
@@ -101,7 +103,7 @@ def deduplicate_papers(papers: List[Dict]) -> List[Dict]:
                 existing['citations'] = paper['citations']
 
             # Fill in missing fields
-            for field in ['abstract', 'doi', 'arxivId', 'venue']:
+            for field in ['abstract', 'doi', 'arxivId', 'venue', 'openalexId', 'references']:
                 if not existing.get(field) and paper.get(field):
                     existing[field] = paper[field]
 
@@ -164,7 +166,7 @@ def score_paper(paper: Dict) -> float:
             score += max(0, 10 - years_old)  # Decay
 
     # Venue prestige (up to 20 points, very basic heuristic)
-    venue = paper.get('venue', '').lower()
+    venue = (paper.get('venue') or '').lower()
     if venue:
         # Top-tier venues (simplified list)
         tier1 = ['nature', 'science', 'cell', 'nejm', 'lancet', 'jama']
@@ -188,54 +190,223 @@ def score_paper(paper: Dict) -> float:
     return min(100.0, score)
 
 
-def collect_and_rank(seeds: List[str], days_back: int = 7, max_per_seed: int = 20) -> List[Dict]:
+# Source keys used in provenance, timings and raw payloads
+SOURCES = ('openalex', 's2', 'arxiv')
+
+SOURCE_LABELS = {
+    'openalex': 'OpenAlex',
+    's2': 'Semantic Scholar',
+    'arxiv': 'arXiv'
+}
+
+
+def _record_timing(timings: Optional[Dict], source: str, started: float, waited: float = 0.0) -> None:
+    """Accumulate call count, elapsed time and rate-limit wait for a source."""
+    if timings is None:
+        return
+    entry = timings.setdefault(source, {'calls': 0, 'seconds': 0.0, 'waitSeconds': 0.0})
+    entry['calls'] += 1
+    entry['seconds'] += time.perf_counter() - started
+    entry['waitSeconds'] += waited
+
+
+def count_records(source: str, payload) -> int:
+    """Number of raw records in a source payload."""
+    if source == 'arxiv':
+        return payload.count(b'<entry>') if payload else 0
+    return len(payload or [])
+
+
+def parse_payload(source: str, payload, capture_references: bool = False) -> List[Dict]:
     """
-    Collect papers from all sources, deduplicate, and rank by score.
+    Normalize one raw source payload into papers.
 
     Args:
-        seeds: List of search queries (keywords, authors, etc.)
-        days_back: How many days back to search
-        max_per_seed: Max results per seed per source
+        source: Source key ('openalex', 's2' or 'arxiv')
+        payload: Raw payload returned by the client's fetch_raw
+        capture_references: Keep OpenAlex referenced work IDs on papers
+                            (collection runs recording citation edges)
 
     Returns:
-        Ranked list of deduplicated papers
+        List of normalized papers
     """
-    # Initialize clients
-    openalex = OpenAlexClient()
-    s2 = SemanticScholarClient()
-    arxiv = ArxivClient()
+    max_results = count_records(source, payload)
+    if source == 'openalex':
+        return get_client(source).parse_raw(payload, max_results=max_results, capture_references=capture_references)
+    return get_client(source).parse_raw(payload, max_results=max_results)
 
-    all_papers = []
 
-    # Fetch from each source for each seed
-    for seed in seeds:
-        # OpenAlex
-        try:
-            papers = openalex.search_papers(seed, days_back, max_per_seed)
-            all_papers.extend(papers)
-        except Exception as e:
-            print(f'OpenAlex error for seed "{seed}": {str(e)}')
+def parse_payload_with_references(source: str, payload) -> List[Dict]:
+    """parse_payload keeping OpenAlex references (module-level for the process pool)."""
+    return parse_payload(source, payload, capture_references=True)
 
-        # Semantic Scholar
-        try:
-            papers = s2.search_papers(seed, days_back, max_per_seed)
-            all_papers.extend(papers)
-        except Exception as e:
-            print(f'Semantic Scholar error for seed "{seed}": {str(e)}')
 
-        # arXiv
+def fetch_seed_payloads(
+    seed: str,
+    clients: Dict[str, object],
+    days_back: int = 7,
+    max_per_seed: int = 20,
+    timings: Optional[Dict] = None,
+    limiters: Optional[Dict] = None
+) -> List[Tuple[str, object]]:
+    """
+    Fetch raw payloads for one seed from every source.
+
+    Args:
+        seed: Search query
+        clients: Source clients keyed by source key
+        days_back: How many days back to search
+        max_per_seed: Max results per source
+        timings: Optional dict to accumulate per-source call counts and seconds
+        limiters: Optional shared rate limiters keyed by source key
+
+    Returns:
+        List of (source, raw payload) pairs
+    """
+    payloads = []
+    for source in SOURCES:
+        waited = limiters[source].acquire() if limiters and source in limiters else 0.0
+        started = time.perf_counter()
         try:
-            papers = arxiv.search_papers(seed, days_back, max_per_seed)
-            all_papers.extend(papers)
+            payload = clients[source].fetch_raw(seed, days_back, max_per_seed)
+            payloads.append((source, payload))
         except Exception as e:
-            print(f'arXiv error for seed "{seed}": {str(e)}')
+            print(f'{SOURCE_LABELS[source]} error for seed "{seed}": {str(e)}')
+        _record_timing(timings, source, started, waited)
+    return payloads
+
+
+# Topic IDs OR-joined into one OpenAlex topics.id filter (API limit)
+TOPIC_FILTER_BATCH = 50
+
+# Cursor pages fetched per topic batch before giving up on filling every topic
+COLLECTOR_TOPIC_MAX_PAGES = int(os.getenv('COLLECTOR_TOPIC_MAX_PAGES', '3'))
+
+
+def work_topic_ids(work: Dict) -> Set[str]:
+    """Topic IDs ("T10312") a raw OpenAlex work is tagged with."""
+    return {
+        topic['id'].rsplit('/', 1)[-1]
+        for topic in work.get('topics') or []
+        if isinstance(topic, dict) and topic.get('id')
+    }
+
+
+def fetch_topic_works(
+    topic_ids: List[str],
+    client,
+    days_back: int = 7,
+    max_per_topic: int = 20,
+    timings: Optional[Dict] = None,
+    limiters: Optional[Dict] = None
+) -> Dict[str, List[Dict]]:
+    """
+    Fetch recent raw OpenAlex works for many topics with batched filters.
+
+    Topics are grouped TOPIC_FILTER_BATCH at a time into one OR-joined
+    topics.id filter. Each group is paged until every topic has
+    max_per_topic works or COLLECTOR_TOPIC_MAX_PAGES pages were read.
+
+    Args:
+        topic_ids: Topic IDs to fetch
+        client: OpenAlex client
+        days_back: How many days back to search
+        max_per_topic: Max works kept per topic
+        timings: Optional dict to accumulate per-source call counts and seconds
+        limiters: Optional shared rate limiters keyed by source key
+
+    Returns:
+        Raw works keyed by topic ID (a work tagged with several requested
+        topics appears under each)
+    """
+    from_date = (datetime.utcnow() - timedelta(days=days_back)).strftime('%Y-%m-%d')
+    works_by_topic: Dict[str, List[Dict]] = {topic_id: [] for topic_id in topic_ids}
 
-    # Deduplicate
-    unique_papers = deduplicate_papers(all_papers)
+    for start in range(0, len(topic_ids), TOPIC_FILTER_BATCH):
+        group = topic_ids[start:start + TOPIC_FILTER_BATCH]
+        pending = set(group)
+        cursor = '*'
 
-    # Score each paper
+        for _ in range(COLLECTOR_TOPIC_MAX_PAGES):
+            waited = limiters['openalex'].acquire() if limiters and 'openalex' in limiters else 0.0
+            started = time.perf_counter()
+            data = client.fetch_topic_works(
+                group, cursor=cursor, per_page=min(200, max_per_topic * len(group)), from_date=from_date
+            )
+            _record_timing(timings, 'openalex', started, waited)
+            if data is None:
+                print(f'OpenAlex error for topics {",".join(group)}')
+                break
+
+            for work in data['results']:
+                for topic_id in work_topic_ids(work) & pending:
+                    works_by_topic[topic_id].append(work)
+
+            pending = {t for t in pending if len(works_by_topic[t]) < max_per_topic}
+            cursor = data['next_cursor']
+            if not pending or not cursor:
+                break
+
+        for topic_id in group:
+            del works_by_topic[topic_id][max_per_topic:]
+
+    return works_by_topic
+
+
+def topic_payload(topic_ids: List[str], works_by_topic: Dict[str, List[Dict]]) -> Tuple[str, List[Dict]]:
+    """
+    One OpenAlex payload with the fetched works of a user's topics.
+
+    Works shared by several of the topics are included once.
+    """
+    works: Dict[str, Dict] = {}
+    for topic_id in topic_ids:
+        for work in works_by_topic.get(topic_id, []):
+            works.setdefault(work.get('id'), work)
+    return 'openalex', list(works.values())
+
+
+def rank_shard(papers: List[Dict]) -> List[Dict]:
+    """Deduplicate a batch of papers and score each unique paper."""
+    unique_papers = deduplicate_papers(papers)
     for paper in unique_papers:
         paper['score'] = score_paper(paper)
+    return unique_papers
+
+
+def rank_payloads(
+    payloads: List[Tuple[str, object]],
+    workers: Optional[int] = None,
+    min_records: Optional[int] = None,
+    capture_references: bool = False
+) -> List[Dict]:
+    """
+    Parse, deduplicate, score and sort raw source payloads.
+
+    Large batches are sharded across the CPU-stage process pool when it is
+    enabled; smaller batches stay in-process.
+
+    Args:
+        payloads: (source, raw payload) pairs
+        workers: Override for CPU_STAGE_WORKERS
+        min_records: Override for CPU_STAGE_MIN_RECORDS
+        capture_references: Keep OpenAlex referenced work IDs on papers
+
+    Returns:
+        Ranked list of deduplicated papers
+    """
+    record_count = sum(count_records(source, payload) for source, payload in payloads)
+    parse = parse_payload_with_references if capture_references else parse_payload
+
+    if cpu_stage.should_use_pool(record_count, workers, min_records):
+        unique_papers = cpu_stage.run_sharded(
+            payloads, parse, generate_paper_id, rank_shard, workers
+        )
+    else:
+        all_papers = []
+        for source, payload in payloads:
+            all_papers.extend(parse(source, payload))
+        unique_papers = rank_shard(all_papers)
 
     # Sort by score descending
     unique_papers.sort(key=lambda p: p['score'], reverse=True)
@@ -246,3 +417,39 @@ def collect_and_rank(seeds: List[str], days_back: int = 7, max_per_seed: int = 2
         paper['updatedAt'] = timestamp
 
     return unique_papers
+
+
+def collect_and_rank(
+    seeds: List[Seed],
+    days_back: int = 7,
+    max_per_seed: int = 20,
+    timings: Optional[Dict] = None
+) -> List[Dict]:
+    """
+    Collect papers from all sources, deduplicate, and rank by score.
+
+    Args:
+        seeds: Query strings (keywords, authors, etc.) and/or typed seeds
+               such as {"type": "topic", "id": "T10312"}
+        days_back: How many days back to search
+        max_per_seed: Max results per seed per source
+        timings: Optional dict to accumulate per-source call counts and seconds
+
+    Returns:
+        Ranked list of deduplicated papers
+    """
+    # Shared, connection-pooled clients
+    clients = get_clients()
+    queries, topic_ids = split_seeds(seeds)
+
+    # Fetch from each source for each query seed
+    payloads = []
+    for seed in queries:
+        payloads.extend(fetch_seed_payloads(seed, clients, days_back, max_per_seed, timings))
+
+    # Topic seeds share batched OpenAlex filter requests
+    if topic_ids:
+        works_by_topic = fetch_topic_works(topic_ids, clients['openalex'], days_back, max_per_seed, timings)
+        payloads.append(topic_payload(topic_ids, works_by_topic))
+
+    return rank_payloads(payloads)
@@ -0,0 +1,160 @@
+"""
+Process-pool CPU stage.
+
+Parsing, normalization, deduplication and scoring are pure Python and
+hold the GIL. For large batches this module spreads that work across
+worker processes using a map/shuffle/reduce over raw source payloads:
+
+1. Map: workers parse chunks of raw payloads and partition the resulting
+   papers into shards by a stable hash of their paper ID.
+2. Shuffle: the parent concatenates each shard's partitions in input order.
+3. Reduce: workers deduplicate and score each shard independently.
+
+Because duplicates always hash to the same shard and input order is kept
+within a shard, the merged result matches the in-process pipeline.
+
+Configuration (environment):
+    CPU_STAGE_WORKERS       Worker processes (0 disables the pool, default)
+    CPU_STAGE_MIN_RECORDS   Raw record count below which work stays in-process
+"""
+
+import multiprocessing
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+CPU_STAGE_WORKERS = int(os.getenv('CPU_STAGE_WORKERS', '0'))
+CPU_STAGE_MIN_RECORDS = int(os.getenv('CPU_STAGE_MIN_RECORDS', '5000'))
+
+# Chunks per worker in the map phase (smooths out uneven payload sizes)
+CHUNKS_PER_WORKER = 4
+
+Payload = Tuple[str, object]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Return the process pool, creating it on first use.
+
+    Workers are started with 'spawn' so they do not inherit gRPC channels
+    or locks held by other threads of the web process.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown() -> None:
+    """Shut down the process pool, if one was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def shard_for(key: str, num_shards: int) -> int:
+    """Stable shard index for a key (identical across processes)."""
+    return zlib.crc32(key.encode('utf-8')) % num_shards
+
+
+def should_use_pool(record_count: int, workers: int = None, min_records: int = None) -> bool:
+    """
+    Decide whether a batch is large enough for the process pool.
+
+    Args:
+        record_count: Number of raw records in the batch
+        workers: Worker count (defaults to CPU_STAGE_WORKERS)
+        min_records: Size threshold (defaults to CPU_STAGE_MIN_RECORDS)
+
+    Returns:
+        True if the batch should be processed by the pool
+    """
+    workers = CPU_STAGE_WORKERS if workers is None else workers
+    min_records = CPU_STAGE_MIN_RECORDS if min_records is None else min_records
+    return workers > 0 and record_count >= min_records
+
+
+def _map_chunk(
+    chunk: Sequence[Payload],
+    parse_fn: Callable[[str, object], List[Dict]],
+    key_fn: Callable[[Dict], str],
+    num_shards: int
+) -> List[List[Dict]]:
+    """Parse a chunk of payloads and partition papers by shard."""
+    shards: List[List[Dict]] = [[] for _ in range(num_shards)]
+    for source, payload in chunk:
+        for paper in parse_fn(source, payload):
+            key = key_fn(paper)
+            if key:
+                shards[shard_for(key, num_shards)].append(paper)
+    return shards
+
+
+def _chunk(payloads: Sequence[Payload], num_chunks: int) -> List[Sequence[Payload]]:
+    """Split payloads into contiguous chunks (keeps input order)."""
+    size = max(1, -(-len(payloads) // num_chunks))
+    return [payloads[i:i + size] for i in range(0, len(payloads), size)]
+
+
+def run_sharded(
+    payloads: Sequence[Payload],
+    parse_fn: Callable[[str, object], List[Dict]],
+    key_fn: Callable[[Dict], str],
+    reduce_fn: Callable[[List[Dict]], List[Dict]],
+    workers: int = None
+) -> List[Dict]:
+    """
+    Parse, shard and reduce raw payloads across worker processes.
+
+    parse_fn, key_fn and reduce_fn must be module-level functions so they
+    can be pickled by reference.
+
+    Args:
+        payloads: (source, raw payload) pairs in input order
+        parse_fn: Parses one raw payload into normalized papers
+        key_fn: Returns the dedup key (paper ID) for a normalized paper
+        reduce_fn: Deduplicates and scores one shard of papers
+        workers: Worker processes (defaults to CPU_STAGE_WORKERS)
+
+    Returns:
+        Concatenated reduce output of all shards (unsorted)
+    """
+    workers = workers or CPU_STAGE_WORKERS or 1
+    pool = _get_pool(workers)
+    num_shards = workers
+
+    chunks = _chunk(payloads, workers * CHUNKS_PER_WORKER)
+    mapped = pool.map(
+        _map_chunk,
+        chunks,
+        [parse_fn] * len(chunks),
+        [key_fn] * len(chunks),
+        [num_shards] * len(chunks)
+    )
+
+    # Shuffle: concatenate partitions per shard in chunk order
+    shards: List[List[Dict]] = [[] for _ in range(num_shards)]
+    for partitions in mapped:
+        for index, partition in enumerate(partitions):
+            shards[index].extend(partition)
+
+    results: List[Dict] = []
+    for reduced in pool.map(reduce_fn, [shard for shard in shards if shard]):
+        results.extend(reduced)
+    return results
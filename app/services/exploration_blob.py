@@ -0,0 +1,536 @@
+"""
+Exploration Blobs
+
+Streaming writer for the pre-computed network exploration blobs described
+in ARCHITECTURE.md (Layer 3: Cloud Storage).
+
+Sections are encoded and compressed as they are written, so memory is
+bounded by one block of papers or edges plus the network's paper ID map,
+not by the size of the blob:
+
+    {"format": {...}, "metadata": {...}, "papers": ..., "citations": ...,
+     "authors": [...], "clusters": [...], "stats": {...}}
+
+Two layouts are supported:
+
+    rows      papers as a list of objects and citations as
+              {"source", "target", "type"} objects (the documented format)
+    columnar  papers as blocks of parallel arrays (one array per field, up
+              to BLOCK_ROWS papers per block, plus a "$missing" map of row
+              indices for fields some papers lacked) and citations as blocks of
+              packed little-endian int32 arrays (base64) of paper positions
+              in the papers section
+
+Citations whose papers are not in the papers section are dropped, so
+papers must be written before citations. Authors and clusters are
+written as lists of objects in both layouts.
+
+Blobs are gzip compressed, or zstd if requested and the zstandard package
+is installed. Storage is Cloud Storage when EXPLORATION_BLOB_BUCKET is
+set, and a local directory otherwise.
+
+Configuration (environment):
+    EXPLORATION_BLOB_BUCKET       Cloud Storage bucket (default empty: local storage)
+    EXPLORATION_BLOB_DIR          Local storage directory (default /tmp/research-watcher-blobs)
+    EXPLORATION_BLOB_LAYOUT       rows or columnar (default rows)
+    EXPLORATION_BLOB_COMPRESSION  gzip or zstd (default gzip)
+"""
+
+import base64
+import gzip
+import io
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+EXPLORATION_BLOB_BUCKET = os.getenv('EXPLORATION_BLOB_BUCKET', '')
+EXPLORATION_BLOB_DIR = os.getenv('EXPLORATION_BLOB_DIR', '/tmp/research-watcher-blobs')
+EXPLORATION_BLOB_LAYOUT = os.getenv('EXPLORATION_BLOB_LAYOUT', 'rows')
+EXPLORATION_BLOB_COMPRESSION = os.getenv('EXPLORATION_BLOB_COMPRESSION', 'gzip')
+
+FORMAT_VERSION = 1
+
+ROWS = 'rows'
+COLUMNAR = 'columnar'
+LAYOUTS = (ROWS, COLUMNAR)
+
+GZIP = 'gzip'
+ZSTD = 'zstd'
+EXTENSIONS = {GZIP: '.json.gz', ZSTD: '.json.zst'}
+
+# Items per columnar block, and per json.dumps call in list sections
+BLOCK_ROWS = 4096
+# Encoded JSON buffered before each write to the compressor
+WRITE_BUFFER_BYTES = 1 << 16
+
+# Columnar block key listing, per field, the rows that lacked it, so an
+# absent field and an explicit null decode differently
+MISSING_KEY = '$missing'
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def _json(value) -> str:
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+def _pack_int32(values: List[int]) -> str:
+    return base64.b64encode(np.asarray(values, dtype='<i4').tobytes()).decode('ascii')
+
+
+def _unpack_int32(data: str) -> List[int]:
+    return np.frombuffer(base64.b64decode(data), dtype='<i4').tolist()
+
+
+def resolve_compression(compression: str) -> str:
+    """
+    Compression to use for a requested codec.
+
+    zstd falls back to gzip when the zstandard package is not installed.
+
+    Raises:
+        ValueError: If the codec is unknown
+    """
+    if compression not in EXTENSIONS:
+        raise ValueError(f'compression must be one of: {", ".join(EXTENSIONS)}')
+    if compression == ZSTD:
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            print('zstandard is not installed; writing gzip exploration blob')
+            return GZIP
+    return compression
+
+
+@contextmanager
+def compressed_stream(raw: BinaryIO, compression: str) -> Iterator[BinaryIO]:
+    """
+    Compressing writer over a binary stream (the stream is left open).
+
+    Args:
+        raw: Destination stream
+        compression: gzip or zstd (see resolve_compression)
+    """
+    if compression == ZSTD:
+        import zstandard
+        stream = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+    else:
+        stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6, mtime=0)
+    try:
+        yield stream
+    finally:
+        stream.close()
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress a gzip or zstd blob (detected from its magic bytes)."""
+    if data[:4] == ZSTD_MAGIC:
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)).read()
+    if data[:2] == GZIP_MAGIC:
+        return gzip.decompress(data)
+    raise ValueError('Unknown exploration blob compression')
+
+
+class _CountingWriter:
+    """Pass-through writer counting the bytes written."""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.bytes_written = 0
+
+    def write(self, data) -> int:
+        self.bytes_written += len(data)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class ExplorationBlobWriter:
+    """Writes an exploration blob to a stream one section at a time."""
+
+    def __init__(self, stream: BinaryIO, layout: str = ROWS, block_rows: int = BLOCK_ROWS):
+        """
+        Start a blob.
+
+        Args:
+            stream: Binary stream (usually a compressed_stream)
+            layout: rows or columnar
+            block_rows: Papers or edges per columnar block
+
+        Raises:
+            ValueError: If the layout is unknown
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f'layout must be one of: {", ".join(LAYOUTS)}')
+        self.stream = stream
+        self.layout = layout
+        self.block_rows = block_rows
+        self.counts: Dict[str, int] = {}
+        self._sections = {'format', 'stats'}
+        self._positions: Dict[str, int] = {}
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._closed = False
+
+        self._emit('{"format":' + _json({'version': FORMAT_VERSION, 'layout': layout}))
+
+    def _emit(self, text: str) -> None:
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= WRITE_BUFFER_BYTES:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self.stream.write(''.join(self._buffer).encode('utf-8'))
+            self._buffer = []
+            self._buffered = 0
+
+    def _start_section(self, name: str) -> None:
+        if self._closed:
+            raise ValueError('Exploration blob is closed')
+        if name in self._sections:
+            raise ValueError(f'Section {name} already written')
+        self._sections.add(name)
+        self._emit(f',{_json(name)}:')
+
+    def _write_list(self, name: str, items: Iterable) -> None:
+        self._emit('[')
+        count = 0
+        # One json.dumps per block instead of per item
+        for block in self._blocks(items):
+            self._emit((',' if count else '') + _json(block)[1:-1])
+            count += len(block)
+        self._emit(']')
+        self.counts[name] = count
+
+    def write_metadata(self, metadata: Dict) -> None:
+        """Write the metadata section (network and version IDs, etc.)."""
+        self._start_section('metadata')
+        self._emit(_json(metadata))
+
+    def write_section(self, name: str, items: Iterable[Dict]) -> None:
+        """Write a list section (authors, clusters) item by item."""
+        self._start_section(name)
+        self._write_list(name, items)
+
+    def write_papers(self, papers: Iterable[Dict], id_key: str = 'id') -> None:
+        """
+        Write the papers section.
+
+        Papers whose ID was already written are skipped.
+
+        Args:
+            papers: Paper dicts
+            id_key: Field holding the paper ID citations refer to
+        """
+        self._start_section('papers')
+        positions = self._positions
+
+        def unique():
+            for paper in papers:
+                paper_id = paper.get(id_key)
+                if paper_id is None or paper_id in positions:
+                    continue
+                positions[paper_id] = len(positions)
+                yield paper
+
+        if self.layout == ROWS:
+            self._write_list('papers', unique())
+            return
+
+        self._emit('{"idKey":' + _json(id_key) + ',"blocks":[')
+        blocks = 0
+        for block in self._blocks(unique()):
+            columns = {id_key: None}
+            for paper in block:
+                columns.update(dict.fromkeys(paper))
+            arrays = {column: [paper.get(column) for paper in block] for column in columns}
+            missing = {}
+            for column in columns:
+                rows = [row for row, paper in enumerate(block) if column not in paper]
+                if rows:
+                    missing[column] = rows
+            if missing:
+                arrays[MISSING_KEY] = missing
+            self._emit((',' if blocks else '') + _json(arrays))
+            blocks += 1
+        self._emit(']}')
+        self.counts['papers'] = len(positions)
+
+    def write_citations(self, edges: Iterable[Tuple[str, str]]) -> None:
+        """
+        Write the citations section.
+
+        Args:
+            edges: (citing paper ID, cited paper ID) pairs; edges with a
+                   paper not in the papers section are dropped
+
+        Raises:
+            ValueError: If the papers section has not been written
+        """
+        if 'papers' not in self._sections:
+            raise ValueError('Papers must be written before citations')
+        self._start_section('citations')
+        positions = self._positions
+        dropped = 0
+
+        def known():
+            nonlocal dropped
+            for source, target in edges:
+                if source in positions and target in positions:
+                    yield source, target
+                else:
+                    dropped += 1
+
+        if self.layout == ROWS:
+            self._write_list(
+                'citations',
+                ({'source': source, 'target': target, 'type': 'cites'} for source, target in known())
+            )
+        else:
+            self._emit('{"encoding":"int32le-base64","blocks":[')
+            count = 0
+            for block in self._blocks(known()):
+                sources = _pack_int32([positions[source] for source, _ in block])
+                targets = _pack_int32([positions[target] for _, target in block])
+                self._emit((',' if count else '') + _json({'source': sources, 'target': targets}))
+                count += len(block)
+            self._emit(']}')
+            self.counts['citations'] = count
+        self.counts['droppedCitations'] = dropped
+
+    def _blocks(self, items: Iterable) -> Iterator[List]:
+        block = []
+        for item in items:
+            block.append(item)
+            if len(block) >= self.block_rows:
+                yield block
+                block = []
+        if block:
+            yield block
+
+    def close(self) -> Dict[str, int]:
+        """
+        Finish the blob with a stats section and flush it to the stream.
+
+        Returns:
+            Item count of each section written
+        """
+        if not self._closed:
+            self._emit(',"stats":' + _json(self.counts) + '}')
+            self._flush()
+            self._closed = True
+        return dict(self.counts)
+
+
+def read_exploration_blob(data: bytes) -> Dict:
+    """
+    Decode a blob written by ExplorationBlobWriter.
+
+    Columnar sections are expanded to the rows layout, so both layouts
+    decode to the same document.
+    """
+    blob = json.loads(decompress(data).decode('utf-8'))
+    if blob.get('format', {}).get('layout') != COLUMNAR:
+        return blob
+
+    papers = blob.get('papers')
+    if isinstance(papers, dict):
+        id_key = papers['idKey']
+        rows = []
+        for block in papers['blocks']:
+            missing = block.pop(MISSING_KEY, {})
+            columns = list(block)
+            start = len(rows)
+            rows.extend(dict(zip(columns, values)) for values in zip(*(block[column] for column in columns)))
+            # Fields a paper did not have are null in its block; drop them
+            for column, indices in missing.items():
+                for row in indices:
+                    del rows[start + row][column]
+        blob['papers'] = rows
+
+    citations = blob.get('citations')
+    if isinstance(citations, dict):
+        ids = [paper[id_key] for paper in blob['papers']]
+        blob['citations'] = [
+            {'source': ids[source], 'target': ids[target], 'type': 'cites'}
+            for block in citations['blocks']
+            for source, target in zip(_unpack_int32(block['source']), _unpack_int32(block['target']))
+        ]
+    return blob
+
+
+class LocalBlobStorage:
+    """Blob storage in a local directory (stands in for Cloud Storage)."""
+
+    def __init__(self, root: str = EXPLORATION_BLOB_DIR):
+        """
+        Args:
+            root: Directory blobs are stored under
+        """
+        self.root = root
+
+    def _path(self, name: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, name))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f'Invalid blob name: {name}')
+        return path
+
+    @contextmanager
+    def open_write(self, name: str, content_encoding: Optional[str] = None) -> Iterator[BinaryIO]:
+        """
+        Open a blob for writing.
+
+        The blob is written to a temporary file and moved into place when
+        the block exits, so readers never see a partial blob; on error the
+        temporary file is removed.
+        """
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                yield f
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def read(self, name: str) -> bytes:
+        with open(self._path(name), 'rb') as f:
+            return f.read()
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self._path(name))
+
+    def url(self, name: str) -> str:
+        return f'file://{self._path(name)}'
+
+
+class GCSBlobStorage:
+    """Blob storage in a Cloud Storage bucket."""
+
+    def __init__(self, bucket: str, client=None):
+        """
+        Args:
+            bucket: Bucket name
+            client: google.cloud.storage.Client (created if not given)
+        """
+        if client is None:
+            from google.cloud import storage
+            client = storage.Client()
+        self.bucket_name = bucket
+        self.bucket = client.bucket(bucket)
+
+    @contextmanager
+    def open_write(self, name: str, content_encoding: Optional[str] = None) -> Iterator[BinaryIO]:
+        """
+        Open a blob for a streaming (resumable, chunked) upload.
+
+        The object is only created when the upload completes.
+        """
+        blob = self.bucket.blob(name)
+        blob.content_encoding = content_encoding
+        with blob.open('wb', content_type='application/json', ignore_flush=True) as f:
+            yield f
+
+    def read(self, name: str) -> bytes:
+        # Stored bytes as written, without transcoding by content encoding
+        return self.bucket.blob(name).download_as_bytes(raw_download=True)
+
+    def exists(self, name: str) -> bool:
+        return self.bucket.blob(name).exists()
+
+    def url(self, name: str) -> str:
+        return f'gs://{self.bucket_name}/{name}'
+
+
+_shared_storage = None
+_shared_storage_lock = threading.Lock()
+
+
+def get_blob_storage():
+    """Return the process-wide blob storage (Cloud Storage if EXPLORATION_BLOB_BUCKET is set)."""
+    global _shared_storage
+    with _shared_storage_lock:
+        if _shared_storage is None:
+            if EXPLORATION_BLOB_BUCKET:
+                _shared_storage = GCSBlobStorage(EXPLORATION_BLOB_BUCKET)
+            else:
+                _shared_storage = LocalBlobStorage()
+        return _shared_storage
+
+
+def blob_name(network_id: str, version_id: str, compression: str = GZIP) -> str:
+    """Storage name of a network version's blob (e.g. net123/v7.json.gz)."""
+    return f'{network_id}/{version_id}{EXTENSIONS[compression]}'
+
+
+def write_exploration_blob(
+    storage,
+    network_id: str,
+    version_id: str,
+    papers: Iterable[Dict],
+    citations: Iterable[Tuple[str, str]],
+    authors: Iterable[Dict] = (),
+    clusters: Iterable[Dict] = (),
+    metadata: Optional[Dict] = None,
+    layout: str = EXPLORATION_BLOB_LAYOUT,
+    compression: str = EXPLORATION_BLOB_COMPRESSION,
+    id_key: str = 'id'
+) -> Dict:
+    """
+    Stream a network version's exploration blob to storage.
+
+    Steps 6-8 of compute_exploration_blob: sections are serialized,
+    compressed and uploaded as they are produced, so papers and citations
+    can be generators (e.g. CitationGraph.edges_within for citations).
+
+    Args:
+        storage: LocalBlobStorage or GCSBlobStorage
+        network_id: Research network ID
+        version_id: Network version ID
+        papers: Paper dicts
+        citations: (citing paper ID, cited paper ID) pairs
+        authors: Author dicts
+        clusters: Cluster dicts
+        metadata: Extra metadata fields
+        layout: rows or columnar
+        compression: gzip or zstd (gzip if zstandard is not installed)
+        id_key: Paper field holding the ID citations refer to
+
+    Returns:
+        Dict with name, url, layout, compression, bytes (compressed size)
+        and counts (items per section)
+    """
+    compression = resolve_compression(compression)
+    name = blob_name(network_id, version_id, compression)
+
+    with storage.open_write(name, content_encoding=compression) as raw:
+        counter = _CountingWriter(raw)
+        with compressed_stream(counter, compression) as stream:
+            writer = ExplorationBlobWriter(stream, layout)
+            writer.write_metadata({**(metadata or {}), 'network_id': network_id, 'version_id': version_id})
+            writer.write_papers(papers, id_key)
+            writer.write_citations(citations)
+            writer.write_section('authors', authors)
+            writer.write_section('clusters', clusters)
+            counts = writer.close()
+
+    return {
+        'name': name,
+        'url': storage.url(name),
+        'layout': layout,
+        'compression': compression,
+        'bytes': counter.bytes_written,
+        'counts': counts
+    }
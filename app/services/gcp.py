@@ -0,0 +1,54 @@
+"""
+Process-wide Google Cloud clients.
+
+Firestore and Pub/Sub clients are created on first use instead of at
+startup, so requests that never publish do not pay for the Pub/Sub gRPC
+channel and cold starts do not wait on either client. Every caller
+shares the same instances.
+"""
+
+import threading
+
+from app.utils.startup import startup_profile
+
+
+_firestore_client = None
+_publisher = None
+_lock = threading.Lock()
+
+
+def get_firestore():
+    """
+    Return the shared Firestore client, creating it on first use.
+
+    This is the Firebase Admin SDK's client for the default app, so it is
+    the same instance firebase_admin.firestore.client() returns.
+    """
+    global _firestore_client
+    if _firestore_client is None:
+        with _lock:
+            if _firestore_client is None:
+                with startup_profile.phase('init firestore client'):
+                    from firebase_admin import firestore
+                    _firestore_client = firestore.client()
+    return _firestore_client
+
+
+def get_publisher():
+    """Return the shared Pub/Sub publisher client, creating it on first use."""
+    global _publisher
+    if _publisher is None:
+        with _lock:
+            if _publisher is None:
+                with startup_profile.phase('init pubsub publisher'):
+                    from google.cloud import pubsub_v1
+                    _publisher = pubsub_v1.PublisherClient()
+    return _publisher
+
+
+def reset_clients(firestore_client=None, publisher=None) -> None:
+    """Replace the shared clients (for tests; None recreates on next use)."""
+    global _firestore_client, _publisher
+    with _lock:
+        _firestore_client = firestore_client
+        _publisher = publisher
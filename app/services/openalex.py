@@ -12,19 +12,28 @@ from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 
 
+# Whether collection runs keep each work's outgoing references
+# (referenced_works) to record citation edges. Only the collector's
+# parsing asks for them (see collector.rank_payloads)
+CAPTURE_REFERENCES = os.getenv('COLLECTOR_CAPTURE_REFERENCES', 'false').lower() == 'true'
+
+
 class OpenAlexClient:
     """Client for OpenAlex API"""
 
     BASE_URL = "https://api.openalex.org"
 
-    def __init__(self, email: Optional[str] = None):
+    def __init__(self, email: Optional[str] = None, capture_references: bool = False):
         """
         Initialize OpenAlex client.
 
         Args:
             email: Contact email for polite pool (faster rate limits)
+            capture_references: Add openalexId and references (IDs of
+                                referenced works) to normalized papers
         """
         self.email = email or os.getenv('OPENALEX_EMAIL', 'noreply@example.com')
+        self.capture_references = capture_references
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': f'ResearchWatcher/1.0 (mailto:{self.email})'
@@ -47,6 +56,26 @@ class OpenAlexClient:
         Returns:
             List of paper dictionaries with normalized fields
         """
+        works = self.fetch_raw(query, days_back, max_results)
+        return self.parse_raw(works, max_results)
+
+    def fetch_raw(
+        self,
+        query: str,
+        days_back: int = 7,
+        max_results: int = 50
+    ) -> List[Dict]:
+        """
+        Fetch raw OpenAlex works matching query from recent days.
+
+        Args:
+            query: Search query (keywords, author names, etc.)
+            days_back: How many days back to search
+            max_results: Maximum number of results to return
+
+        Returns:
+            List of raw OpenAlex work objects (empty on API error)
+        """
         # Calculate date range
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days_back)
@@ -74,25 +103,103 @@ class OpenAlexClient:
             )
             response.raise_for_status()
             data = response.json()
+            return data.get('results', [])
+
+        except requests.RequestException as e:
+            print(f'OpenAlex API error: {str(e)}')
+            return []
 
-            papers = []
-            for work in data.get('results', []):
-                paper = self._normalize_paper(work)
-                if paper:
-                    papers.append(paper)
+    def fetch_topic_works(
+        self,
+        topic_ids: List[str],
+        cursor: str = '*',
+        per_page: int = 25,
+        sort: str = 'publication_date:desc',
+        from_date: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Fetch one cursor page of works tagged with any of the given topics.
 
-            return papers[:max_results]
+        Topic IDs are OR-joined into a single topics.id filter, so one
+        request covers up to 50 topics.
+
+        Args:
+            topic_ids: OpenAlex topic IDs (e.g., ["T10312"])
+            cursor: Cursor from the previous page ('*' for the first page)
+            per_page: Works per page (API max is 200)
+            sort: OpenAlex sort expression
+            from_date: Optional earliest publication date (YYYY-MM-DD)
+
+        Returns:
+            Dict with 'results' (raw works), 'next_cursor' and 'count',
+            or None on API error
+        """
+        filters = [f'topics.id:{"|".join(topic_ids)}']
+        if from_date:
+            filters.append(f'from_publication_date:{from_date}')
+
+        params = {
+            'filter': ','.join(filters),
+            'per_page': min(per_page, 200),
+            'cursor': cursor,
+            'sort': sort
+        }
+
+        try:
+            response = self.session.get(
+                f'{self.BASE_URL}/works',
+                params=params,
+                timeout=30
+            )
+            response.raise_for_status()
+            data = response.json()
+            meta = data.get('meta', {})
+            return {
+                'results': data.get('results', []),
+                'next_cursor': meta.get('next_cursor'),
+                'count': meta.get('count', 0)
+            }
 
         except requests.RequestException as e:
             print(f'OpenAlex API error: {str(e)}')
-            return []
+            return None
 
-    def _normalize_paper(self, work: Dict) -> Optional[Dict]:
+    def parse_raw(
+        self,
+        works: List[Dict],
+        max_results: int = 50,
+        capture_references: Optional[bool] = None
+    ) -> List[Dict]:
+        """
+        Normalize raw OpenAlex works.
+
+        Args:
+            works: Raw OpenAlex work objects from fetch_raw
+            max_results: Maximum number of papers to return
+            capture_references: Keep openalexId and references (defaults
+                                to the client's setting)
+
+        Returns:
+            List of paper dictionaries with normalized fields
+        """
+        if capture_references is None:
+            capture_references = self.capture_references
+        papers = []
+        for work in works:
+            paper = self._normalize_paper(work, capture_references)
+            if paper:
+                papers.append(paper)
+
+        return papers[:max_results]
+
+    def _normalize_paper(self, work: Dict, capture_references: Optional[bool] = None) -> Optional[Dict]:
         """
         Normalize OpenAlex work to our paper schema.
 
         Args:
             work: Raw OpenAlex work object
+            capture_references: Keep openalexId and references (defaults
+                                to the client's setting)
 
         Returns:
             Normalized paper dict or None if invalid
@@ -131,7 +238,7 @@ class OpenAlexClient:
             # Abstract (inverted index - need to reconstruct)
             abstract = self._reconstruct_abstract(work.get('abstract_inverted_index'))
 
-            return {
+            paper = {
                 'id': work.get('id', '').replace('https://openalex.org/', ''),
                 'title': work.get('title'),
                 'authors': authors,
@@ -154,6 +261,15 @@ class OpenAlexClient:
                 }
             }
 
+            if self.capture_references if capture_references is None else capture_references:
+                # Only the referenced work IDs are kept from the citation data
+                paper['openalexId'] = paper['id']
+                paper['references'] = [
+                    ref.replace('https://openalex.org/', '') for ref in work.get('referenced_works') or [] if ref
+                ]
+
+            return paper
+
         except Exception as e:
             print(f'Error normalizing OpenAlex paper: {str(e)}')
             return None
@@ -3,13 +3,53 @@ OpenAlex Topics Service
 
 Fetches and caches OpenAlex topics for field-wide discovery.
 Uses the OpenAlex Topics API to build a hierarchical topic structure.
+
+Ingestion is incremental: domains are fetched concurrently within the
+shared OpenAlex rate budget, optionally only topics updated since the
+last sync, and only topics whose content hash changed are written.
 """
 
+import hashlib
+import json
+import os
+import threading
 import requests
-import time
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterable, Optional, Tuple
 from google.cloud import firestore
 
+from .clients import mount_pooled_adapter
+from .rate_limit import get_limiter
+from .topic_aggregates import apply_changes, build_hierarchy, compute_aggregates, get_shared_aggregates
+from .topics_catalog import (
+    CATALOG_DOC, META_COLLECTION, CatalogSnapshot, decode_cursor, encode_cursor, get_shared_cache
+)
+
+
+# Parallel Firestore batch commits during ingestion
+TOPICS_WRITE_WORKERS = int(os.getenv('TOPICS_WRITE_WORKERS', '4'))
+
+# Stored content hashes, used to skip unchanged topics
+HASHES_DOC = "hashes"
+
+# Fields that change on every write and are excluded from the hash
+_UNHASHED_FIELDS = ("created_at", "content_hash")
+
+
+def topic_content_hash(topic: Dict) -> str:
+    """
+    Stable hash of a processed topic's content.
+
+    Args:
+        topic: Processed topic dictionary
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    content = {k: v for k, v in topic.items() if k not in _UNHASHED_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
 
 class OpenAlexTopicsService:
     """Service for fetching and managing OpenAlex topics."""
@@ -25,7 +65,9 @@ class OpenAlexTopicsService:
             db: Firestore client instance
         """
         self.db = db
-        self.session = requests.Session()
+        self.catalog = get_shared_cache(db)
+        self.aggregates = get_shared_aggregates(db)
+        self.session = mount_pooled_adapter(requests.Session())
         self.session.headers.update({
             "User-Agent": f"ResearchWatcher/1.0 (mailto:{self.POLITE_POOL_EMAIL})"
         })
@@ -43,62 +85,128 @@ class OpenAlexTopicsService:
         Returns:
             List of topic dictionaries with hierarchy information
         """
-        topics = []
-        cursor = "*"
-        per_page = 200  # Max allowed by OpenAlex
-
-        # Filter for Social Sciences domain (includes Psychology)
         # Domain ID 2 = Social Sciences
         # https://api.openalex.org/domains/2
-        filter_query = "domain.id:2"
+        return self.fetch_topics(domain_ids=["2"], max_results=max_results)
+
+    def fetch_topics(
+        self,
+        domain_ids: Iterable[str] = ("2",),
+        since: Optional[str] = None,
+        max_results: int = 1000
+    ) -> List[Dict]:
+        """
+        Fetch topics for several domains concurrently.
 
-        print(f"Fetching topics from OpenAlex (domain: Social Sciences)...")
+        Each domain is paged with its own cursor on a separate thread; every
+        page request takes a token from the shared OpenAlex rate limiter.
 
-        while len(topics) < max_results:
-            try:
-                params = {
-                    "filter": filter_query,
-                    "per-page": per_page,
-                    "cursor": cursor
-                }
+        Args:
+            domain_ids: OpenAlex domain IDs (e.g., ["1", "2"])
+            since: Optional ISO date; only topics updated on or after it
+            max_results: Maximum number of topics to fetch per domain
 
-                response = self.session.get(self.BASE_URL, params=params, timeout=30)
-                response.raise_for_status()
+        Returns:
+            List of topic dictionaries with hierarchy information
+        """
+        domain_ids = list(domain_ids)
+        if not domain_ids:
+            return []
 
-                data = response.json()
-                results = data.get("results", [])
+        print(f"Fetching topics from OpenAlex (domains: {', '.join(domain_ids)}"
+              f"{f', updated since {since}' if since else ''})...")
 
-                if not results:
-                    print("No more results to fetch")
-                    break
+        with ThreadPoolExecutor(max_workers=min(4, len(domain_ids))) as executor:
+            results = list(executor.map(
+                lambda domain_id: self._fetch_domain(domain_id, since, max_results),
+                domain_ids
+            ))
 
-                # Process and add topics
-                for topic in results:
-                    processed = self._process_topic(topic)
-                    if processed:
-                        topics.append(processed)
+        topics = [topic for domain_topics in results for topic in domain_topics]
+        print(f"✅ Fetched {len(topics)} total topics")
+        return topics
 
-                print(f"Fetched {len(topics)} topics so far...")
+    def _fetch_domain(self, domain_id: str, since: Optional[str], max_results: int) -> List[Dict]:
+        """
+        Page through the topics of one domain.
 
-                # Get next cursor
-                meta = data.get("meta", {})
-                next_cursor = meta.get("next_cursor")
+        OpenAlex may reject the from_updated_date filter on the topics
+        endpoint; in that case the domain is re-fetched unfiltered and
+        filtered on updated_date locally.
+        """
+        filter_query = f"domain.id:{domain_id}"
+        if since:
+            filter_query += f",from_updated_date:{since}"
 
-                if not next_cursor or next_cursor == cursor:
-                    print("Reached end of results")
-                    break
+        try:
+            return self._fetch_pages(filter_query, max_results, domain_id)
+        except requests.exceptions.HTTPError as e:
+            if not since or e.response is None or e.response.status_code not in (400, 403):
+                print(f"Error fetching topics for domain {domain_id}: {e}")
+                return []
 
-                cursor = next_cursor
+        print(f"Domain {domain_id}: updated-date filter rejected, filtering locally")
+        try:
+            topics = self._fetch_pages(f"domain.id:{domain_id}", max_results, domain_id)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching topics for domain {domain_id}: {e}")
+            return []
+        return [t for t in topics if (t.get("updated_date") or "")[:10] >= since[:10]]
+
+    def _fetch_pages(self, filter_query: str, max_results: int, domain_id: str) -> List[Dict]:
+        """
+        Cursor-page one filter until exhausted or max_results is reached.
+
+        Raises:
+            requests.exceptions.HTTPError: If the first page is rejected
+        """
+        topics = []
+        cursor = "*"
+        per_page = 200  # Max allowed by OpenAlex
+        limiter = get_limiter("openalex")
 
-                # Be polite to OpenAlex API
-                time.sleep(0.1)
+        while len(topics) < max_results:
+            params = {
+                "filter": filter_query,
+                "per-page": per_page,
+                "cursor": cursor
+            }
 
+            limiter.acquire()
+            try:
+                response = self.session.get(self.BASE_URL, params=params, timeout=30)
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                if cursor == "*":
+                    raise
+                print(f"Error fetching topics for domain {domain_id}, keeping {len(topics)}")
+                break
             except requests.exceptions.RequestException as e:
-                print(f"Error fetching topics: {e}")
+                print(f"Error fetching topics for domain {domain_id}: {e}")
                 break
 
-        print(f"✅ Fetched {len(topics)} total topics")
-        return topics
+            data = response.json()
+            results = data.get("results", [])
+
+            if not results:
+                break
+
+            # Process and add topics
+            for topic in results:
+                processed = self._process_topic(topic)
+                if processed:
+                    topics.append(processed)
+
+            print(f"Domain {domain_id}: fetched {len(topics)} topics so far...")
+
+            # Get next cursor
+            next_cursor = data.get("meta", {}).get("next_cursor")
+            if not next_cursor or next_cursor == cursor:
+                break
+
+            cursor = next_cursor
+
+        return topics[:max_results]
 
     def _process_topic(self, raw_topic: Dict) -> Optional[Dict]:
         """
@@ -157,57 +265,188 @@ class OpenAlexTopicsService:
             print(f"Error processing topic: {e}")
             return None
 
-    def cache_topics_in_firestore(self, topics: List[Dict]) -> int:
+    def load_content_hashes(self) -> Dict[str, str]:
+        """
+        Read stored content hashes for every cached topic.
+
+        Returns:
+            Mapping of topic ID to content hash (empty if none stored)
+        """
+        doc = self.db.collection(META_COLLECTION).document(HASHES_DOC).get()
+        if not doc.exists:
+            return {}
+        return doc.to_dict().get("hashes", {})
+
+    def get_last_sync_date(self) -> Optional[str]:
+        """Date (YYYY-MM-DD) of the last successful topics sync, if any."""
+        doc = self.db.collection(META_COLLECTION).document(CATALOG_DOC).get()
+        return doc.to_dict().get("last_synced_date") if doc.exists else None
+
+    def record_sync(self, sync_date: str) -> None:
+        """
+        Remember when topics were last synced (for incremental fetches).
+
+        Args:
+            sync_date: ISO date the sync started on
+        """
+        self.db.collection(META_COLLECTION).document(CATALOG_DOC).set({
+            "last_synced_date": sync_date
+        }, merge=True)
+
+    def _commit_batches(self, topics: List[Dict], max_batch_size: int = 500) -> int:
+        """
+        Write topics in batches of up to max_batch_size, committed in parallel.
+
+        Returns:
+            Number of topics written
+        """
+        chunks = [topics[i:i + max_batch_size] for i in range(0, len(topics), max_batch_size)]
+
+        def _commit(chunk: List[Dict]) -> int:
+            batch = self.db.batch()
+            for topic in chunk:
+                batch.set(self.db.collection("topics").document(topic["id"]), topic)
+            batch.commit()
+            print(f"  Committed batch of {len(chunk)} topics...")
+            return len(chunk)
+
+        if not chunks:
+            return 0
+
+        written = 0
+        with ThreadPoolExecutor(max_workers=max(1, min(TOPICS_WRITE_WORKERS, len(chunks)))) as executor:
+            for count in executor.map(_commit, chunks):
+                written += count
+        return written
+
+    def cache_topics_in_firestore(self, topics: List[Dict], force: bool = False) -> int:
         """
         Cache topics in Firestore for fast retrieval.
 
+        Only topics whose content hash differs from the stored hash are
+        written. Aggregates are then patched for the changed topics (or
+        rebuilt when force is set).
+
         Args:
             topics: List of processed topic dictionaries
+            force: Rewrite every topic regardless of stored hashes
 
         Returns:
-            Number of topics successfully cached
+            Number of topics written
         """
-        cached_count = 0
-        batch = self.db.batch()
-        batch_size = 0
-        max_batch_size = 500  # Firestore limit
-
         print(f"Caching {len(topics)} topics in Firestore...")
 
+        stored_hashes = {} if force else self.load_content_hashes()
+
+        changed = []
         for topic in topics:
+            topic_id = topic.get("id")
+            if not topic_id:
+                continue
+            content_hash = topic_content_hash(topic)
+            if stored_hashes.get(topic_id) != content_hash:
+                changed.append({**topic, "content_hash": content_hash})
+
+        print(f"  {len(changed)} changed, {len(topics) - len(changed)} unchanged")
+        if not changed:
+            return 0
+
+        # Previous versions of changed topics, for patching aggregates
+        previous = {}
+        if not force:
+            refs = [self.db.collection("topics").document(t["id"]) for t in changed]
             try:
-                topic_id = topic.get("id")
-                if not topic_id:
-                    continue
-
-                # Reference to topics collection
-                topic_ref = self.db.collection("topics").document(topic_id)
-                batch.set(topic_ref, topic)
-                batch_size += 1
-                cached_count += 1
-
-                # Commit batch if we hit the limit
-                if batch_size >= max_batch_size:
-                    batch.commit()
-                    print(f"  Committed batch of {batch_size} topics...")
-                    batch = self.db.batch()
-                    batch_size = 0
-                    time.sleep(0.1)  # Brief pause between batches
-
+                for doc in self.db.get_all(refs):
+                    if doc.exists:
+                        previous[doc.id] = {**doc.to_dict(), "id": doc.id}
             except Exception as e:
-                print(f"Error caching topic {topic.get('id')}: {e}")
+                print(f"Error reading previous topics: {e}")
+                force = True
 
-        # Commit remaining topics
-        if batch_size > 0:
-            batch.commit()
-            print(f"  Committed final batch of {batch_size} topics")
+        cached_count = self._commit_batches(changed)
+
+        self.db.collection(META_COLLECTION).document(HASHES_DOC).set({
+            "hashes": {t["id"]: t["content_hash"] for t in changed},
+            "updated_at": firestore.SERVER_TIMESTAMP
+        }, merge=True)
+
+        # Invalidate cached catalogs in every instance and refresh the
+        # derived views for the new version
+        version = self.catalog.bump_version()
+        if force:
+            self.refresh_aggregates(version)
+        else:
+            self.refresh_aggregates(version, upserts=[(previous.get(t["id"]), t) for t in changed])
 
         print(f"✅ Cached {cached_count} topics in Firestore")
         return cached_count
 
+    def refresh_aggregates(
+        self,
+        version,
+        upserts: Optional[List[Tuple[Optional[Dict], Dict]]] = None,
+        removed: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        Recompute and store the hierarchy, fields and stats aggregates.
+
+        When the changed topics are given and the stored aggregates belong
+        to the previous catalog version, they are patched in place of a
+        full rebuild from every topic.
+
+        Args:
+            version: Catalog version the topics were just written as
+            upserts: Optional (previous topic or None, current topic) pairs
+            removed: Optional previous versions of deleted topics
+
+        Returns:
+            The stored aggregates
+        """
+        if upserts is not None or removed is not None:
+            try:
+                stored, stored_version = self.aggregates.read_stored()
+                if (stored is not None and isinstance(version, int)
+                        and stored_version == version - 1):
+                    patched = apply_changes(stored, upserts or [], removed)
+                    if patched is not None:
+                        self.aggregates.store(patched, version)
+                        print(f"✅ Patched topic aggregates for {len(upserts or [])} changed topics")
+                        return patched
+            except Exception as e:
+                print(f"Error patching topic aggregates, rebuilding: {e}")
+
+        catalog = self.catalog.get_catalog()
+        aggregates = compute_aggregates(catalog.topics)
+        self.aggregates.store(aggregates, catalog.version)
+        print(f"✅ Rebuilt topic aggregates (version {catalog.version})")
+        return aggregates
+
+    def get_aggregates(self) -> Dict:
+        """
+        Precomputed hierarchy, fields and stats for the current catalog.
+
+        Returns:
+            Dict with "hierarchy", "fields" and "stats"
+        """
+        return self.aggregates.get()
+
+    def _loaded_catalog(self) -> Optional[CatalogSnapshot]:
+        """
+        The catalog revalidated against its TTL and version, if this
+        process has one loaded; None otherwise (lookups then read
+        Firestore instead of loading the whole catalog).
+        """
+        if self.catalog.peek() is None:
+            return None
+        return self.catalog.get_catalog()
+
     def get_topic_by_id(self, topic_id: str) -> Optional[Dict]:
         """
-        Retrieve a topic from Firestore by ID.
+        Retrieve a topic by ID.
+
+        Served from the in-process catalog when it is loaded; topics it
+        does not hold (or all topics, when it is not loaded) are read
+        directly from Firestore.
 
         Args:
             topic_id: Topic ID (e.g., "T123")
@@ -216,6 +455,12 @@ class OpenAlexTopicsService:
             Topic dictionary or None if not found
         """
         try:
+            catalog = self._loaded_catalog()
+            if catalog is not None:
+                topic = catalog.get_topic(topic_id)
+                if topic is not None:
+                    return topic
+
             topic_ref = self.db.collection("topics").document(topic_id)
             topic_doc = topic_ref.get()
 
@@ -227,38 +472,143 @@ class OpenAlexTopicsService:
             print(f"Error retrieving topic {topic_id}: {e}")
             return None
 
+    def get_topics_by_ids(self, topic_ids: List[str]) -> Tuple[List[Dict], List[str]]:
+        """
+        Retrieve many topics at once.
+
+        Served from the in-process catalog when it is loaded; IDs it does
+        not hold are read with a single batched Firestore read.
+
+        Args:
+            topic_ids: Topic IDs (duplicates are ignored)
+
+        Returns:
+            (topics in request order, IDs that were not found)
+        """
+        topic_ids = list(dict.fromkeys(topic_ids))
+
+        found = {}
+        catalog = self._loaded_catalog()
+        if catalog is not None:
+            found = {topic_id: catalog.get_topic(topic_id) for topic_id in topic_ids}
+
+        unresolved = [topic_id for topic_id in topic_ids if not found.get(topic_id)]
+        if unresolved:
+            refs = [self.db.collection("topics").document(topic_id) for topic_id in unresolved]
+            for doc in self.db.get_all(refs):
+                if doc.exists:
+                    found[doc.id] = {**doc.to_dict(), "id": doc.id}
+
+        topics = [found[topic_id] for topic_id in topic_ids if found.get(topic_id)]
+        missing = [topic_id for topic_id in topic_ids if not found.get(topic_id)]
+        return topics, missing
+
     def get_all_topics(self, field_name: Optional[str] = None) -> List[Dict]:
         """
-        Retrieve all topics from Firestore, optionally filtered by field.
+        Retrieve all topics, optionally filtered by field.
+
+        Served from the process-level catalog cache, which reloads from
+        Firestore when its TTL expires or the catalog version changes.
 
         Args:
             field_name: Optional field name to filter by (e.g., "Psychology")
 
         Returns:
-            List of topic dictionaries
+            List of topic dictionaries ordered by works_count descending
         """
         try:
-            topics_ref = self.db.collection("topics")
+            return self.catalog.get_catalog().get_topics(field_name)
+
+        except Exception as e:
+            print(f"Error retrieving topics: {e}")
+            return []
 
-            if field_name:
-                # Filter by field display_name
-                query = topics_ref.where("field.display_name", "==", field_name)
-            else:
-                query = topics_ref
+    def get_topics_page(
+        self,
+        field_name: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Dict], Optional[str], int]:
+        """
+        One page of topics ordered by works_count descending, then ID.
 
-            # Order by works_count descending for relevance
-            query = query.order_by("works_count", direction=firestore.Query.DESCENDING)
+        Keyset pagination: the cursor encodes the (works_count, id) of the
+        last topic returned, so pages stay consistent without offsets.
 
-            topics = []
-            for doc in query.stream():
-                topic = doc.to_dict()
-                topic["id"] = doc.id  # Ensure ID is included
-                topics.append(topic)
+        Args:
+            field_name: Optional field name to filter by
+            cursor: Cursor from the previous page (None for the first page)
+            limit: Page size
 
-            return topics
+        Returns:
+            (topics, cursor for the next page or None, total topics)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = decode_cursor(cursor) if cursor else None
+        topics, total = self.catalog.get_catalog().page(field_name, after, limit + 1)
+
+        next_cursor = encode_cursor(topics[limit - 1]) if len(topics) > limit else None
+        return topics[:limit], next_cursor, total
+
+    def search_topics(
+        self,
+        query: str,
+        field_name: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict]:
+        """
+        Search topics by relevance.
+
+        Uses the catalog's prebuilt BM25 index over display name, keywords
+        and description; the last query word also matches as a prefix.
+
+        Args:
+            query: Free-text query
+            field_name: Optional field name to filter by
+            limit: Maximum number of results
+
+        Returns:
+            Matching topic dicts, best first, each with a "relevance" score
+        """
+        try:
+            index = self.catalog.get_catalog().search_index
+            return [
+                {**topic, "relevance": round(score, 4)}
+                for topic, score in index.search(query, field_name=field_name, limit=limit)
+            ]
 
         except Exception as e:
-            print(f"Error retrieving topics: {e}")
+            print(f"Error searching topics: {e}")
+            return []
+
+    def get_related_topics(self, topic_id: str, limit: int = 10) -> Optional[List[Dict]]:
+        """
+        Topics most similar to one topic.
+
+        Uses the catalog's precomputed TF-IDF neighbors over display name,
+        keywords and description.
+
+        Args:
+            topic_id: Topic ID
+            limit: Maximum number of related topics
+
+        Returns:
+            Related topic dicts, most similar first, each with a
+            "similarity" score; None if the topic does not exist
+        """
+        try:
+            catalog = self.catalog.get_catalog()
+            if catalog.get_topic(topic_id) is None:
+                return None
+            return [
+                {**topic, "similarity": round(score, 4)}
+                for topic, score in catalog.related_index.related(topic_id, limit=limit)
+            ]
+
+        except Exception as e:
+            print(f"Error finding related topics for {topic_id}: {e}")
             return []
 
     def build_topic_hierarchy(self, topics: List[Dict]) -> Dict:
@@ -285,68 +635,40 @@ class OpenAlexTopicsService:
           }
         }
 
+        Topics in each list are ordered by works_count descending. Serving
+        code should use get_aggregates()["hierarchy"], which is computed
+        once per catalog version.
+
         Args:
             topics: List of topic dictionaries
 
         Returns:
             Hierarchical tree structure
         """
-        hierarchy = {"domains": {}}
+        return build_hierarchy(topics)
 
-        for topic in topics:
-            domain = topic.get("domain")
-            field = topic.get("field")
-            subfield = topic.get("subfield")
 
-            if not domain or not field:
-                continue
+_shared_service: Optional[OpenAlexTopicsService] = None
+_shared_service_lock = threading.Lock()
 
-            domain_id = domain.get("id")
-            field_id = field.get("id")
-            subfield_id = subfield.get("id") if subfield else None
 
-            # Initialize domain
-            if domain_id not in hierarchy["domains"]:
-                hierarchy["domains"][domain_id] = {
-                    "id": domain_id,
-                    "display_name": domain.get("display_name"),
-                    "fields": {}
-                }
+def get_topics_service(db: firestore.Client) -> OpenAlexTopicsService:
+    """
+    Return the process-wide topics service, creating it on first use.
 
-            # Initialize field
-            if field_id not in hierarchy["domains"][domain_id]["fields"]:
-                hierarchy["domains"][domain_id]["fields"][field_id] = {
-                    "id": field_id,
-                    "display_name": field.get("display_name"),
-                    "subfields": {}
-                }
+    The service holds the shared catalog cache (with its search and
+    related-topics indexes), the aggregates cache and a pooled HTTP
+    session, so request handlers should use this instead of
+    constructing a service per request.
 
-            # Initialize subfield (if exists)
-            if subfield_id:
-                if subfield_id not in hierarchy["domains"][domain_id]["fields"][field_id]["subfields"]:
-                    hierarchy["domains"][domain_id]["fields"][field_id]["subfields"][subfield_id] = {
-                        "id": subfield_id,
-                        "display_name": subfield.get("display_name"),
-                        "topics": []
-                    }
+    Args:
+        db: Firestore client (used only on first call)
 
-                # Add topic to subfield
-                hierarchy["domains"][domain_id]["fields"][field_id]["subfields"][subfield_id]["topics"].append({
-                    "id": topic.get("id"),
-                    "display_name": topic.get("display_name"),
-                    "works_count": topic.get("works_count", 0),
-                    "description": topic.get("description", "")
-                })
-            else:
-                # Add topic directly to field if no subfield
-                if "topics" not in hierarchy["domains"][domain_id]["fields"][field_id]:
-                    hierarchy["domains"][domain_id]["fields"][field_id]["topics"] = []
-
-                hierarchy["domains"][domain_id]["fields"][field_id]["topics"].append({
-                    "id": topic.get("id"),
-                    "display_name": topic.get("display_name"),
-                    "works_count": topic.get("works_count", 0),
-                    "description": topic.get("description", "")
-                })
-
-        return hierarchy
+    Returns:
+        Shared OpenAlexTopicsService
+    """
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = OpenAlexTopicsService(db)
+        return _shared_service
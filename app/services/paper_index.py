@@ -0,0 +1,315 @@
+"""
+Local Paper Index
+
+SQLite FTS5 full-text index over the papers the collector has stored,
+so /api/search can answer from the local corpus without calling the
+upstream APIs.
+
+Indexed fields are title, abstract, authors and venue. The index is kept up to date two ways:
+
+    - the collector upserts papers as it writes them to Firestore
+    - a background thread pulls papers changed since the last sync from
+      the Firestore papers collection (by updatedAt)
+
+The first sync reads the whole papers collection, so it is made offline
+by scripts/build_paper_index.py and the index shipped with the service
+(see docs/DEPLOYMENT.md). Web processes only sync an index that has
+been synced before, unless PAPER_INDEX_BOOTSTRAP is set.
+
+Configuration (environment):
+    PAPER_INDEX_PATH          SQLite file (default /tmp/research-watcher-papers.sqlite)
+    PAPER_INDEX_SYNC_SECONDS  Firestore sync interval (default 300, 0 disables)
+    PAPER_INDEX_BOOTSTRAP     Sync a never-synced index from the whole papers
+                              collection in the background (default false)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from .topic_search import tokenize
+
+
+PAPER_INDEX_PATH = os.getenv('PAPER_INDEX_PATH', '/tmp/research-watcher-papers.sqlite')
+PAPER_INDEX_SYNC_SECONDS = int(os.getenv('PAPER_INDEX_SYNC_SECONDS', '300'))
+PAPER_INDEX_BOOTSTRAP = os.getenv('PAPER_INDEX_BOOTSTRAP', 'false').lower() == 'true'
+
+# Function words dropped from queries (they match most papers and make
+# every query scan the whole corpus); kept if the query has nothing else
+QUERY_STOPWORDS = frozenset("""
+    a an and are as at be by for from in into is it of on or the to with
+""".split())
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    rowid INTEGER PRIMARY KEY,
+    paper_id TEXT NOT NULL UNIQUE,
+    title TEXT,
+    abstract TEXT,
+    authors TEXT,
+    venue TEXT,
+    date TEXT,
+    score REAL,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS papers_date ON papers(date);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, authors, venue,
+    content='papers', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts(rowid, title, abstract, authors, venue)
+    VALUES (new.rowid, new.title, new.abstract, new.authors, new.venue);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, authors, venue)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.authors, old.venue);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, authors, venue)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.authors, old.venue);
+    INSERT INTO papers_fts(rowid, title, abstract, authors, venue)
+    VALUES (new.rowid, new.title, new.abstract, new.authors, new.venue);
+END;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+UPSERT = """
+INSERT INTO papers (paper_id, title, abstract, authors, venue, date, score, updated_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(paper_id) DO UPDATE SET
+    title = excluded.title, abstract = excluded.abstract, authors = excluded.authors,
+    venue = excluded.venue, date = excluded.date, score = excluded.score,
+    updated_at = excluded.updated_at, data = excluded.data
+"""
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for a free-text query.
+
+    Every word other than function words is required; the last word also
+    matches as a prefix.
+
+    Returns:
+        Expression, or None if the query has no searchable words
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+    tokens = [token for token in tokens if token not in QUERY_STOPWORDS] or tokens
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' AND '.join(terms)
+
+
+def _row(paper: Dict):
+    authors = paper.get('authors') or []
+    if isinstance(authors, list):
+        authors = ' '.join(a.get('name', '') if isinstance(a, dict) else str(a) for a in authors)
+    return (
+        paper['paperId'],
+        paper.get('title') or '',
+        paper.get('abstract') or '',
+        authors,
+        paper.get('venue') or '',
+        paper.get('date') or (f"{paper['year']}-01-01" if paper.get('year') else None),
+        paper.get('score') or 0.0,
+        paper.get('updatedAt'),
+        json.dumps(paper, default=str)
+    )
+
+
+class PaperIndex:
+    """Thread-safe SQLite FTS5 index of stored papers."""
+
+    def __init__(self, path: str = PAPER_INDEX_PATH):
+        """
+        Open (or create) the index.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection for the calling thread (SQLite connections are per thread)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def upsert(self, papers: Iterable[Dict]) -> int:
+        """
+        Insert or replace papers (by paperId).
+
+        Args:
+            papers: Normalized papers with paperId
+
+        Returns:
+            Number of papers written
+        """
+        rows = [_row(paper) for paper in papers if paper.get('paperId')]
+        if not rows:
+            return 0
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                connection.executemany(UPSERT, rows)
+        return len(rows)
+
+    def search(self, query: str, days_back: Optional[int] = None, limit: int = 20) -> List[Dict]:
+        """
+        Search indexed papers.
+
+        Papers matching every query word in their title, abstract, authors
+        or venue are ordered by paper score, like upstream search results.
+        Only the matching rowids come from FTS5 (no per-match relevance
+        scoring), which keeps queries on common words cheap.
+
+        Args:
+            query: Free-text query
+            days_back: Only papers published in the last N days (None for all)
+            limit: Maximum results
+
+        Returns:
+            Papers, best first
+        """
+        expression = match_expression(query)
+        if expression is None:
+            return []
+
+        sql = 'SELECT data FROM papers WHERE rowid IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)'
+        params: list = [expression]
+        if days_back is not None:
+            sql += ' AND date >= ?'
+            params.append((datetime.utcnow() - timedelta(days=days_back)).strftime('%Y-%m-%d'))
+        sql += ' ORDER BY score DESC LIMIT ?'
+        params.append(limit)
+
+        return [json.loads(data) for data, in self._connection().execute(sql, params)]
+
+    def get(self, paper_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Indexed papers by ID.
+
+        Returns:
+            Dict of paperId to paper for the IDs that are indexed
+        """
+        if not paper_ids:
+            return {}
+        placeholders = ', '.join('?' for _ in paper_ids)
+        rows = self._connection().execute(
+            f'SELECT paper_id, data FROM papers WHERE paper_id IN ({placeholders})', list(paper_ids)
+        )
+        return {paper_id: json.loads(data) for paper_id, data in rows}
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM papers').fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connection().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    'INSERT INTO meta (key, value) VALUES (?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+                    (key, value)
+                )
+
+    def sync_from_firestore(self, db, batch_size: int = 500) -> int:
+        """
+        Pull papers changed since the last sync from Firestore.
+
+        Args:
+            db: Firestore client
+            batch_size: Papers written per SQLite transaction
+
+        Returns:
+            Number of papers indexed
+        """
+        since = self.get_meta('synced_updated_at')
+        query = db.collection('papers')
+        if since:
+            # Inclusive: the collector stamps a whole ranked batch with one
+            # updatedAt and writes it in several Firestore batches, so a
+            # sync can see only part of it. Re-upserting is idempotent.
+            query = query.where('updatedAt', '>=', since)
+
+        indexed, latest, batch = 0, since, []
+        for doc in query.stream():
+            paper = doc.to_dict() or {}
+            paper.setdefault('paperId', doc.id)
+            batch.append(paper)
+            if paper.get('updatedAt') and (latest is None or paper['updatedAt'] > latest):
+                latest = paper['updatedAt']
+            if len(batch) >= batch_size:
+                indexed += self.upsert(batch)
+                batch = []
+        indexed += self.upsert(batch)
+
+        if latest and latest != since:
+            self.set_meta('synced_updated_at', latest)
+        return indexed
+
+
+_shared_index: Optional[PaperIndex] = None
+_shared_index_lock = threading.Lock()
+_syncer: Optional[threading.Thread] = None
+
+
+def get_paper_index(db=None) -> PaperIndex:
+    """
+    Return the process-wide paper index, creating it on first use.
+
+    When a Firestore client is given and PAPER_INDEX_SYNC_SECONDS is set,
+    a background thread syncs the index from the papers collection
+    (immediately, then on that interval). It only starts for an index that
+    has been synced before, or when PAPER_INDEX_BOOTSTRAP allows the first
+    full read of the papers collection.
+
+    Args:
+        db: Firestore client for background sync
+    """
+    global _shared_index, _syncer
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = PaperIndex()
+
+        if (
+            db is not None and PAPER_INDEX_SYNC_SECONDS > 0 and _syncer is None
+            and (PAPER_INDEX_BOOTSTRAP or _shared_index.get_meta('synced_updated_at'))
+        ):
+            _syncer = threading.Thread(
+                target=_sync_loop, args=(_shared_index, db), name='paper-index-sync', daemon=True
+            )
+            _syncer.start()
+        return _shared_index
+
+
+def _sync_loop(index: PaperIndex, db) -> None:
+    while True:
+        try:
+            started = time.perf_counter()
+            count = index.sync_from_firestore(db)
+            if count:
+                print(f'Paper index: synced {count} papers in {time.perf_counter() - started:.1f}s')
+        except Exception as e:
+            print(f'Error syncing paper index: {str(e)}')
+        time.sleep(PAPER_INDEX_SYNC_SECONDS)
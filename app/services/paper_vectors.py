@@ -0,0 +1,655 @@
+"""
+Paper Vectors
+
+CPU-only embedding pipeline and approximate nearest-neighbor index behind
+"related papers".
+
+    PaperVectorizer  Hashed TF-IDF over title + abstract (word unigrams and
+                     bigrams hashed into HASH_FEATURES buckets) projected to
+                     VECTOR_DIM dimensions by a truncated SVD fitted on the
+                     corpus; unit-length float32 vectors
+    VectorStore      Append-only float32 matrix in a memory-mapped file,
+                     plus the paper ID of each row
+    IVFIndex         Inverted-file index: spherical k-means centroids with
+                     rows grouped by nearest centroid. Queries score the
+                     rows of the NPROBE closest lists, plus rows appended
+                     since the lists were last assigned
+    PaperVectors     Ties the three together. Each full build is written
+                     to its own directory under PAPER_VECTORS_DIR and
+                     switched to atomically, so readers never see a
+                     half-written build
+
+Full builds stream the whole papers collection and fit the SVD and
+k-means, so they are made offline by scripts/build_paper_vectors.py and
+shipped with the service (see docs/DEPLOYMENT.md). Web processes only
+build in-process when PAPER_VECTORS_BUILD_IN_PROCESS is set.
+
+Once a build is loaded, new papers are appended as the collector writes
+them and by a background sync from the papers collection (by updatedAt);
+the appended rows are assigned to lists in batches and the centroids are
+retrained once the corpus has grown RETRAIN_GROWTH times since they were
+trained.
+
+Configuration (environment):
+    PAPER_VECTORS_DIR               Storage directory (default /tmp/research-watcher-vectors)
+    PAPER_VECTORS_NPROBE            Lists scanned per query (default 16)
+    PAPER_VECTORS_SYNC_SECONDS      Sync interval from Firestore (default 900, 0 disables)
+    PAPER_VECTORS_BUILD_IN_PROCESS  Build in the background when there is no
+                                    build yet (default false)
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import zlib
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import svds
+
+from .topic_search import tokenize
+from .topic_similarity import STOPWORDS
+
+
+PAPER_VECTORS_DIR = os.getenv('PAPER_VECTORS_DIR', '/tmp/research-watcher-vectors')
+PAPER_VECTORS_NPROBE = int(os.getenv('PAPER_VECTORS_NPROBE', '16'))
+PAPER_VECTORS_SYNC_SECONDS = int(os.getenv('PAPER_VECTORS_SYNC_SECONDS', '900'))
+PAPER_VECTORS_BUILD_IN_PROCESS = os.getenv('PAPER_VECTORS_BUILD_IN_PROCESS', 'false').lower() == 'true'
+
+# Hashed feature space and embedding size
+HASH_FEATURES = 2 ** 16
+VECTOR_DIM = 64
+
+# Papers used to fit IDF and the SVD projection
+FIT_SAMPLE = 50000
+
+# Papers vectorized per batch during a build
+BUILD_BATCH = 5000
+
+# Rows used to train centroids, and k-means iterations
+TRAIN_SAMPLE = 50000
+TRAIN_ITERATIONS = 10
+
+# Appended rows that trigger assignment to lists
+REINDEX_ROWS = 5000
+
+# Corpus growth (relative to the rows centroids were trained on) that
+# triggers retraining
+RETRAIN_GROWTH = 4
+
+# Rows scored per block when assigning rows to centroids
+ASSIGN_BLOCK = 65536
+
+CURRENT_FILE = 'CURRENT'
+
+
+def paper_text(paper: Dict) -> str:
+    """Text a paper is embedded from."""
+    return f"{paper.get('title') or ''} {paper.get('abstract') or ''}"
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class PaperVectorizer:
+    """Hashed TF-IDF + truncated SVD text embedding."""
+
+    def __init__(self, idf: np.ndarray, components: np.ndarray):
+        """
+        Args:
+            idf: IDF weight per hashed feature
+            components: (HASH_FEATURES, dim) SVD projection
+        """
+        self.idf = idf.astype(np.float32, copy=False)
+        self.components = components.astype(np.float32, copy=False)
+
+    @property
+    def dim(self) -> int:
+        return self.components.shape[1]
+
+    @staticmethod
+    def counts(texts: Iterable[str]) -> sparse.csr_matrix:
+        """Sublinear term frequencies of hashed unigrams and bigrams."""
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            tokens = [t for t in tokenize(text) if len(t) > 1 and t not in STOPWORDS]
+            terms = tokens + [f'{a} {b}' for a, b in zip(tokens, tokens[1:])]
+            counts: Dict[int, int] = {}
+            for term in terms:
+                feature = zlib.crc32(term.encode('utf-8')) % HASH_FEATURES
+                counts[feature] = counts.get(feature, 0) + 1
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        tf = np.asarray(data, dtype=np.float32)
+        return sparse.csr_matrix(
+            (1.0 + np.log(tf), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, HASH_FEATURES)
+        )
+
+    @classmethod
+    def fit(cls, texts: List[str], dim: int = VECTOR_DIM, seed: int = 0) -> 'PaperVectorizer':
+        """
+        Fit IDF weights and the SVD projection.
+
+        Raises:
+            ValueError: If there are fewer than two texts
+        """
+        counts = cls.counts(texts)
+        n = counts.shape[0]
+        k = min(dim, n - 1)
+        if k < 1:
+            raise ValueError('At least two papers are needed to fit paper vectors')
+
+        df = np.bincount(counts.indices, minlength=HASH_FEATURES)
+        idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+        matrix = cls._weight(counts, idf)
+
+        _, singular_values, vt = svds(matrix, k=k, random_state=seed)
+        components = vt[np.argsort(-singular_values)].T
+        return cls(idf, components)
+
+    @staticmethod
+    def _weight(counts: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+        """TF-IDF weighted, L2-normalized rows."""
+        matrix = counts.copy()
+        matrix.data *= idf[matrix.indices]
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        matrix.data /= np.repeat(norms, np.diff(matrix.indptr)).astype(np.float32)
+        return matrix
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """Unit-length (n, dim) float32 vectors (zero for texts with no terms)."""
+        matrix = self._weight(self.counts(texts), self.idf)
+        return _normalize_rows(np.asarray(matrix @ self.components))
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            np.savez(f, idf=self.idf, components=self.components)
+
+    @classmethod
+    def load(cls, path: str) -> 'PaperVectorizer':
+        with np.load(path) as data:
+            return cls(data['idf'], data['components'])
+
+
+class VectorStore:
+    """Append-only float32 vectors in a memory-mapped file, keyed by paper ID."""
+
+    def __init__(self, directory: str, dim: int):
+        """
+        Open (or create) the store in a directory.
+
+        Args:
+            directory: Directory holding vectors.f32 and ids.txt
+            dim: Vector dimension
+        """
+        self.dim = dim
+        self.vectors_path = os.path.join(directory, 'vectors.f32')
+        self.ids_path = os.path.join(directory, 'ids.txt')
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.ids_path):
+            with open(self.ids_path, encoding='utf-8') as f:
+                self.ids = f.read().splitlines()
+            self.rows = {paper_id: row for row, paper_id in enumerate(self.ids)}
+
+        capacity = 0
+        if os.path.exists(self.vectors_path):
+            capacity = os.path.getsize(self.vectors_path) // (4 * dim)
+        self._open(capacity)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """(len, dim) view of the stored vectors."""
+        return self._matrix[:len(self.ids)]
+
+    def _open(self, capacity: int) -> None:
+        if capacity == 0:
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        else:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the file (doubling) so it holds at least rows vectors."""
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        capacity = max(rows, 2 * capacity, 1024)
+        # Growing never invalidates existing mappings held by readers
+        with open(self.vectors_path, 'ab') as f:
+            f.truncate(capacity * self.dim * 4)
+        self._open(capacity)
+
+    def put(self, paper_ids: List[str], vectors: np.ndarray) -> int:
+        """
+        Store vectors, overwriting papers already present.
+
+        Vectors are written and flushed before their IDs are appended, so
+        a crash never leaves an ID pointing at an unwritten row.
+
+        Returns:
+            Number of papers appended (not overwritten)
+        """
+        with self._lock:
+            appended: Dict[str, np.ndarray] = {}
+            for paper_id, vector in zip(paper_ids, vectors):
+                row = self.rows.get(paper_id)
+                if row is not None:
+                    self._matrix[row] = vector
+                else:
+                    appended[paper_id] = vector
+            new_ids = list(appended)
+
+            start = len(self.ids)
+            if new_ids:
+                self._reserve(start + len(new_ids))
+                self._matrix[start:start + len(new_ids)] = np.asarray(list(appended.values()), dtype=np.float32)
+            if isinstance(self._matrix, np.memmap):
+                self._matrix.flush()
+
+            if new_ids:
+                with open(self.ids_path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(f'{paper_id}\n' for paper_id in new_ids))
+                self.rows.update((paper_id, start + i) for i, paper_id in enumerate(new_ids))
+                self.ids.extend(new_ids)
+            return len(new_ids)
+
+
+class IVFIndex:
+    """Inverted-file approximate nearest-neighbor index over unit vectors."""
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray, trained_rows: int):
+        """
+        Args:
+            centroids: (lists, dim) unit-length centroids
+            assignments: List of each indexed row (rows 0..len-1)
+            trained_rows: Corpus size the centroids were trained on
+        """
+        self.centroids = centroids.astype(np.float32, copy=False)
+        self.assignments = assignments.astype(np.int32, copy=False)
+        self.trained_rows = trained_rows
+        self._group()
+
+    @property
+    def indexed(self) -> int:
+        """Rows assigned to lists; later rows are scanned exhaustively."""
+        return len(self.assignments)
+
+    def _group(self) -> None:
+        """Rows of each list as CSR (order, offsets)."""
+        self.order = np.argsort(self.assignments, kind='stable').astype(np.int32)
+        counts = np.bincount(self.assignments, minlength=len(self.centroids))
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    @staticmethod
+    def nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Index of each vector's most similar centroid."""
+        nearest = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), ASSIGN_BLOCK):
+            block = np.asarray(vectors[start:start + ASSIGN_BLOCK])
+            nearest[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return nearest
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        iterations: int = TRAIN_ITERATIONS,
+        seed: int = 0
+    ) -> 'IVFIndex':
+        """
+        Train centroids with spherical k-means on a sample and assign every row.
+
+        Args:
+            vectors: (n, dim) unit vectors
+            n_lists: Number of lists (default sqrt(n))
+            iterations: k-means iterations
+            seed: Random seed for sampling and initialization
+        """
+        n = len(vectors)
+        n_lists = max(1, min(n_lists or int(np.sqrt(n)), n))
+        rng = np.random.default_rng(seed)
+
+        sample_rows = np.sort(rng.choice(n, size=min(n, max(TRAIN_SAMPLE, n_lists)), replace=False))
+        sample = np.asarray(vectors[sample_rows])
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            nearest = cls.nearest(sample, centroids)
+            members = sparse.csr_matrix(
+                (np.ones(len(sample), dtype=np.float32), (nearest, np.arange(len(sample)))),
+                shape=(n_lists, len(sample))
+            )
+            sums = np.asarray(members @ sample)
+            empty = np.flatnonzero(np.bincount(nearest, minlength=n_lists) == 0)
+            sums[empty] = sample[rng.choice(len(sample), size=len(empty))]
+            centroids = _normalize_rows(sums)
+
+        return cls(centroids, cls.nearest(vectors, centroids), n)
+
+    def extend(self, vectors: np.ndarray) -> None:
+        """Assign rows appended since the last assignment to lists."""
+        if len(vectors) > self.indexed:
+            tail = self.nearest(vectors[self.indexed:], self.centroids)
+            self.assignments = np.concatenate((self.assignments, tail))
+            self._group()
+
+    def search(
+        self,
+        vectors: np.ndarray,
+        query: np.ndarray,
+        limit: int,
+        nprobe: int = PAPER_VECTORS_NPROBE,
+        exclude: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate most similar rows to a query vector.
+
+        Args:
+            vectors: (n, dim) stored vectors (rows past indexed are scanned)
+            query: Unit query vector
+            limit: Maximum results
+            nprobe: Lists scanned
+            exclude: Row to leave out (the query paper itself)
+
+        Returns:
+            (rows, similarities), most similar first
+        """
+        centroid_scores = self.centroids @ query
+        if nprobe < len(self.centroids):
+            probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        else:
+            probe = np.arange(len(self.centroids))
+
+        parts = [self.order[self.offsets[l]:self.offsets[l + 1]] for l in probe]
+        parts.append(np.arange(self.indexed, len(vectors), dtype=np.int32))
+        candidates = np.concatenate(parts)
+        if exclude is not None:
+            candidates = candidates[candidates != exclude]
+        if len(candidates) == 0:
+            return candidates, np.zeros(0, dtype=np.float32)
+
+        # Row order keeps memory-mapped reads sequential
+        candidates = np.sort(candidates)
+        scores = np.asarray(vectors[candidates]) @ query
+        if limit < len(candidates):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            candidates, scores = candidates[top], scores[top]
+        ranked = np.argsort(-scores, kind='stable')
+        return candidates[ranked], scores[ranked]
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                assignments=self.assignments,
+                trained_rows=np.array(self.trained_rows)
+            )
+
+    @classmethod
+    def load(cls, path: str) -> 'IVFIndex':
+        with np.load(path) as data:
+            return cls(data['centroids'], data['assignments'], int(data['trained_rows']))
+
+
+def _batches(items: Iterator, size: int) -> Iterator[List]:
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _write_json(path: str, data: Dict) -> None:
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class PaperVectors:
+    """Paper embeddings with an ANN index, persisted under a directory."""
+
+    def __init__(self, directory: str = PAPER_VECTORS_DIR, nprobe: int = PAPER_VECTORS_NPROBE):
+        """
+        Open the current build in a directory, if there is one.
+
+        Args:
+            directory: Storage directory
+            nprobe: Lists scanned per query
+        """
+        self.directory = directory
+        self.nprobe = nprobe
+        self.vectorizer: Optional[PaperVectorizer] = None
+        self.store: Optional[VectorStore] = None
+        self.index: Optional[IVFIndex] = None
+        self.meta: Dict = {}
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+
+        current = self._current_build()
+        if current:
+            self._load(current)
+
+    @property
+    def ready(self) -> bool:
+        return self.index is not None
+
+    def __len__(self) -> int:
+        return len(self.store) if self.store is not None else 0
+
+    def _current_build(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE), encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _load(self, build: str) -> None:
+        path = os.path.join(self.directory, build)
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.vectorizer = PaperVectorizer.load(os.path.join(path, 'model.npz'))
+        self.store = VectorStore(path, self.vectorizer.dim)
+        self.index = IVFIndex.load(os.path.join(path, 'index.npz'))
+        self.build_path = path
+
+    def build(self, papers: Iterable[Dict]) -> int:
+        """
+        Build vectors and index from scratch and switch to them.
+
+        The vectorizer is fitted on the first FIT_SAMPLE papers; the rest
+        are streamed through it in batches, so memory stays bounded.
+
+        Args:
+            papers: Papers with paperId, title and abstract
+
+        Returns:
+            Number of papers indexed
+        """
+        papers = iter(p for p in papers if p.get('paperId'))
+        sample = list(islice(papers, FIT_SAMPLE))
+        vectorizer = PaperVectorizer.fit([paper_text(p) for p in sample])
+
+        build = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+        path = os.path.join(self.directory, build)
+        os.makedirs(path)
+        store = VectorStore(path, vectorizer.dim)
+        synced = None
+        for batch in [sample, *_batches(papers, BUILD_BATCH)]:
+            store.put([p['paperId'] for p in batch], vectorizer.transform([paper_text(p) for p in batch]))
+            synced = max([synced or ''] + [p.get('updatedAt') or '' for p in batch]) or None
+
+        index = IVFIndex.train(store.vectors)
+        vectorizer.save(os.path.join(path, 'model.npz'))
+        index.save(os.path.join(path, 'index.npz'))
+        _write_json(os.path.join(path, 'meta.json'), {
+            'builtAt': datetime.utcnow().isoformat() + 'Z',
+            'dim': vectorizer.dim,
+            'syncedUpdatedAt': synced
+        })
+
+        with self._lock:
+            previous = self._current_build()
+            with open(os.path.join(self.directory, f'{CURRENT_FILE}.tmp'), 'w', encoding='utf-8') as f:
+                f.write(build)
+            os.replace(os.path.join(self.directory, f'{CURRENT_FILE}.tmp'), os.path.join(self.directory, CURRENT_FILE))
+            self._load(build)
+
+        # Unlinking is safe while old mappings are still being read
+        if previous and previous != build:
+            shutil.rmtree(os.path.join(self.directory, previous), ignore_errors=True)
+        return len(store)
+
+    def add(self, papers: List[Dict]) -> int:
+        """
+        Embed and append (or overwrite) papers.
+
+        Appended rows are scanned exhaustively until REINDEX_ROWS of them
+        accumulate, then assigned to lists (or the centroids retrained if
+        the corpus grew RETRAIN_GROWTH times).
+
+        Returns:
+            Number of papers embedded (0 before the first build)
+        """
+        papers = [p for p in papers if p.get('paperId')]
+        if not papers or not self.ready:
+            return 0
+
+        with self._lock:
+            vectors = self.vectorizer.transform([paper_text(p) for p in papers])
+            self.store.put([p['paperId'] for p in papers], vectors)
+
+            if len(self.store) - self.index.indexed >= REINDEX_ROWS:
+                if len(self.store) >= RETRAIN_GROWTH * self.index.trained_rows:
+                    index = IVFIndex.train(self.store.vectors)
+                else:
+                    index = IVFIndex(self.index.centroids, self.index.assignments, self.index.trained_rows)
+                    index.extend(self.store.vectors)
+                index.save(os.path.join(self.build_path, 'index.npz'))
+                self.index = index
+
+            synced = max(p.get('updatedAt') or '' for p in papers)
+            if synced > (self.meta.get('syncedUpdatedAt') or ''):
+                self.meta['syncedUpdatedAt'] = synced
+                _write_json(os.path.join(self.build_path, 'meta.json'), self.meta)
+        return len(papers)
+
+    def related(self, paper_id: str, limit: int = 10) -> Optional[List[Tuple[str, float]]]:
+        """
+        Papers most similar to a paper.
+
+        Args:
+            paper_id: Stored paper ID
+            limit: Maximum results
+
+        Returns:
+            (paperId, cosine similarity) pairs, most similar first, or None
+            if the paper has no vector
+        """
+        store, index = self.store, self.index
+        if index is None:
+            return None
+        row = store.rows.get(paper_id)
+        if row is None:
+            return None
+
+        vectors = store.vectors
+        query = np.asarray(vectors[row])
+        if not query.any():
+            return []
+        rows, scores = index.search(vectors, query, limit, self.nprobe, exclude=row)
+        return [(store.ids[r], round(float(s), 4)) for r, s in zip(rows, scores) if s > 0]
+
+    def build_from_firestore(self, db) -> int:
+        """Build from every paper in the papers collection."""
+        return self.build(self._stream(db.collection('papers')))
+
+    def sync_from_firestore(self, db) -> int:
+        """
+        Append papers changed since the last build or sync.
+
+        Returns:
+            Number of papers embedded
+        """
+        query = db.collection('papers')
+        synced = self.meta.get('syncedUpdatedAt')
+        if synced:
+            # Inclusive, like PaperIndex.sync_from_firestore: papers sharing
+            # the last seen updatedAt may have been written after the last
+            # sync read it. Existing IDs are overwritten.
+            query = query.where('updatedAt', '>=', synced)
+        return sum(self.add(batch) for batch in _batches(self._stream(query), BUILD_BATCH))
+
+    @staticmethod
+    def _stream(query) -> Iterator[Dict]:
+        for doc in query.select(['title', 'abstract', 'updatedAt']).stream():
+            paper = doc.to_dict() or {}
+            paper['paperId'] = doc.id
+            yield paper
+
+
+_shared_vectors: Optional[PaperVectors] = None
+_shared_vectors_lock = threading.Lock()
+_syncer: Optional[threading.Thread] = None
+
+
+def get_paper_vectors(db=None) -> PaperVectors:
+    """
+    Return the process-wide paper vectors, loading them on first use.
+
+    When a Firestore client is given and PAPER_VECTORS_SYNC_SECONDS is set,
+    a background thread appends changed papers on that interval. It only
+    starts when a build is loaded, or when PAPER_VECTORS_BUILD_IN_PROCESS
+    allows it to build from the whole papers collection first.
+
+    Args:
+        db: Firestore client for background build and sync
+    """
+    global _shared_vectors, _syncer
+    with _shared_vectors_lock:
+        if _shared_vectors is None:
+            _shared_vectors = PaperVectors()
+
+        if (
+            db is not None and PAPER_VECTORS_SYNC_SECONDS > 0 and _syncer is None
+            and (_shared_vectors.ready or PAPER_VECTORS_BUILD_IN_PROCESS)
+        ):
+            _syncer = threading.Thread(
+                target=_sync_loop, args=(_shared_vectors, db), name='paper-vectors-sync', daemon=True
+            )
+            _syncer.start()
+        return _shared_vectors
+
+
+def _sync_loop(vectors: PaperVectors, db) -> None:
+    while True:
+        try:
+            started = time.perf_counter()
+            if vectors.ready:
+                count = vectors.sync_from_firestore(db)
+            else:
+                count = vectors.build_from_firestore(db)
+            if count:
+                print(f'Paper vectors: embedded {count} papers in {time.perf_counter() - started:.1f}s')
+        except Exception as e:
+            print(f'Error syncing paper vectors: {str(e)}')
+        time.sleep(PAPER_VECTORS_SYNC_SECONDS)
@@ -0,0 +1,96 @@
+"""
+Upstream rate limiting.
+
+Token buckets shared by every thread in the process so that concurrent
+collection work stays within each source's request budget.
+
+Configuration (environment, requests per second):
+    OPENALEX_RATE_LIMIT   default 10 (polite pool)
+    S2_RATE_LIMIT         default 1 (unauthenticated)
+    ARXIV_RATE_LIMIT      default 0.34 (one request every 3 seconds)
+"""
+
+import os
+import threading
+import time
+from typing import Dict
+
+
+DEFAULT_RATES = {
+    'openalex': float(os.getenv('OPENALEX_RATE_LIMIT', '10')),
+    's2': float(os.getenv('S2_RATE_LIMIT', '1')),
+    'arxiv': float(os.getenv('ARXIV_RATE_LIMIT', '0.34'))
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second (0 or less disables limiting)
+            burst: Maximum tokens that can accumulate
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, blocking until they are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+
+                wait = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(source: str) -> TokenBucket:
+    """
+    Return the process-wide token bucket for a source.
+
+    Args:
+        source: Source key ('openalex', 's2', 'arxiv', ...)
+
+    Returns:
+        Shared TokenBucket (unlimited for unknown sources)
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(source)
+        if limiter is None:
+            limiter = _limiters[source] = TokenBucket(DEFAULT_RATES.get(source, 0))
+        return limiter
+
+
+def get_source_limiters() -> Dict[str, TokenBucket]:
+    """Return the shared token buckets for all collector sources."""
+    return {source: get_limiter(source) for source in DEFAULT_RATES}
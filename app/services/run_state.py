@@ -0,0 +1,242 @@
+"""
+Collection run state.
+
+Persists per-run and per-user progress for collector runs so that an
+interrupted run can be resumed by re-invoking it with the same runId.
+
+Firestore layout:
+    runs/{runId}                 Run summary (status, cursor, timestamps)
+    runs/{runId}/users/{uid}     Per-user status and attempt count
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+
+from google.cloud import firestore
+
+
+# User states that never need to be processed again within a run
+FINISHED_STATES = ('done',)
+
+# Default cap on attempts per user within a single run
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+class RunStateStore:
+    """Reads and writes collection run state documents."""
+
+    def __init__(self, db: firestore.Client, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        """
+        Initialize the run state store.
+
+        Args:
+            db: Firestore client instance
+            max_attempts: Maximum attempts per user before giving up
+        """
+        self.db = db
+        self.max_attempts = max_attempts
+
+    def _run_ref(self, run_id: str):
+        return self.db.collection('runs').document(run_id)
+
+    def _user_ref(self, run_id: str, uid: str):
+        return self._run_ref(run_id).collection('users').document(uid)
+
+    def start_run(self, run_id: str, timestamp: str) -> Dict:
+        """
+        Create the run document, or mark an existing run as resumed.
+
+        Args:
+            run_id: Collection run ID
+            timestamp: Run creation timestamp (kept stable across resumes)
+
+        Returns:
+            Run document data, with 'resumed' set when the run already existed
+        """
+        run_ref = self._run_ref(run_id)
+        run_doc = run_ref.get()
+
+        if run_doc.exists:
+            run_data = run_doc.to_dict()
+            run_ref.update({
+                'status': 'running',
+                'resumedAt': _now(),
+                'resumeCount': firestore.Increment(1)
+            })
+            run_data['resumed'] = True
+            return run_data
+
+        run_data = {
+            'runId': run_id,
+            'status': 'running',
+            'createdAt': timestamp,
+            'cursor': None,
+            'resumeCount': 0,
+            'maxAttempts': self.max_attempts
+        }
+        run_ref.set(run_data)
+        run_data['resumed'] = False
+        return run_data
+
+    def get_run(self, run_id: str) -> Optional[Dict]:
+        """
+        Retrieve the run document.
+
+        Args:
+            run_id: Collection run ID
+
+        Returns:
+            Run document data or None if the run does not exist
+        """
+        run_doc = self._run_ref(run_id).get()
+        return run_doc.to_dict() if run_doc.exists else None
+
+    def get_user_states(self, run_id: str) -> Dict[str, Dict]:
+        """
+        Retrieve all per-user state documents for a run.
+
+        Args:
+            run_id: Collection run ID
+
+        Returns:
+            Dict mapping uid to user state
+        """
+        states = {}
+        for doc in self._run_ref(run_id).collection('users').stream():
+            states[doc.id] = doc.to_dict()
+        return states
+
+    def should_process(self, state: Optional[Dict]) -> bool:
+        """
+        Decide whether a user still needs work in this run.
+
+        Users with no state are new. Finished users are skipped. Users that
+        failed (or were interrupted mid-run) are retried until they have used
+        up max_attempts.
+
+        Args:
+            state: User state document or None
+
+        Returns:
+            True if the user should be (re)processed
+        """
+        if not state:
+            return True
+        if state.get('status') in FINISHED_STATES:
+            return False
+        return state.get('attempts', 0) < self.max_attempts
+
+    def mark_user_started(self, run_id: str, uid: str, seed_count: int) -> None:
+        """Record the start of an attempt for a user."""
+        self._user_ref(run_id, uid).set({
+            'uid': uid,
+            'status': 'running',
+            'seedCount': seed_count,
+            'attempts': firestore.Increment(1),
+            'startedAt': _now()
+        }, merge=True)
+
+    def mark_user_done(self, run_id: str, uid: str, paper_count: int, wal_message_id: Optional[str] = None) -> None:
+        """Record successful completion for a user."""
+        update = {
+            'status': 'done',
+            'paperCount': paper_count,
+            'error': None,
+            'completedAt': _now()
+        }
+        if wal_message_id:
+            update['walMessageId'] = wal_message_id
+        self._user_ref(run_id, uid).set(update, merge=True)
+
+    def mark_user_failed(self, run_id: str, uid: str, error: str) -> None:
+        """Record a failed attempt for a user."""
+        self._user_ref(run_id, uid).set({
+            'status': 'failed',
+            'error': error,
+            'failedAt': _now()
+        }, merge=True)
+
+    def advance_cursor(self, run_id: str, uid: str, progress: Optional[Dict] = None) -> None:
+        """
+        Record the last user processed in users-collection order.
+
+        Args:
+            run_id: Collection run ID
+            uid: Last processed user ID
+            progress: Optional live progress snapshot to store alongside
+        """
+        update = {
+            'cursor': uid,
+            'updatedAt': _now()
+        }
+        if progress is not None:
+            update['progress'] = progress
+        self._run_ref(run_id).update(update)
+
+    def finish_run(self, run_id: str, stats: Dict) -> None:
+        """
+        Mark the run as finished.
+
+        Args:
+            run_id: Collection run ID
+            stats: Final stats for this invocation
+        """
+        status = 'completed_with_errors' if stats.get('errors') else 'completed'
+        self._run_ref(run_id).update({
+            'status': status,
+            'completedAt': _now(),
+            'lastStats': stats
+        })
+
+    def fail_run(self, run_id: str, error: str) -> None:
+        """Mark the run as failed so a later invocation can resume it."""
+        self._run_ref(run_id).update({
+            'status': 'failed',
+            'error': error,
+            'updatedAt': _now()
+        })
+
+    def get_progress(self, run_id: str) -> Optional[Dict]:
+        """
+        Summarize how far a run got.
+
+        Args:
+            run_id: Collection run ID
+
+        Returns:
+            Progress dict or None if the run does not exist
+        """
+        run_data = self.get_run(run_id)
+        if run_data is None:
+            return None
+
+        counts = {'running': 0, 'done': 0, 'failed': 0}
+        exhausted = 0
+        papers = 0
+        for state in self.get_user_states(run_id).values():
+            status = state.get('status', 'running')
+            counts[status] = counts.get(status, 0) + 1
+            papers += state.get('paperCount', 0)
+            if status == 'failed' and state.get('attempts', 0) >= self.max_attempts:
+                exhausted += 1
+
+        return {
+            'runId': run_id,
+            'status': run_data.get('status'),
+            'createdAt': run_data.get('createdAt'),
+            'completedAt': run_data.get('completedAt'),
+            'cursor': run_data.get('cursor'),
+            'resumeCount': run_data.get('resumeCount', 0),
+            'users': {
+                'done': counts.get('done', 0),
+                'failed': counts.get('failed', 0),
+                'running': counts.get('running', 0),
+                'exhausted': exhausted
+            },
+            'papersCollected': papers,
+            'progress': run_data.get('progress')
+        }
@@ -0,0 +1,177 @@
+"""
+Weighted fair scheduling for collection work.
+
+Collection work is split into (user, seed) tasks. Tasks are handed out
+with deficit round-robin (DRR) across users: on each turn a user earns a
+quantum proportional to its tier weight and may run that many tasks.
+A user with many seeds therefore cannot starve users with few seeds,
+and paid tiers get proportionally more of the shared upstream capacity.
+"""
+
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+# Scheduling weight per user tier (tasks per round)
+TIER_WEIGHTS = {
+    'free': 1,
+    'beta': 2,
+    'pro': 4
+}
+
+
+def tier_weight(tier: Optional[str]) -> int:
+    """Scheduling weight for a tier (unknown tiers get the free weight)."""
+    return TIER_WEIGHTS.get(tier or 'free', TIER_WEIGHTS['free'])
+
+
+class _UserQueue:
+    """Pending tasks and DRR state for one user."""
+
+    def __init__(self, uid: str, tier: str, tasks: List):
+        self.uid = uid
+        self.tier = tier
+        self.weight = tier_weight(tier)
+        self.tasks = deque(tasks)
+        self.total = len(tasks)
+        self.outstanding = 0
+        self.completed = 0
+        self.deficit = 0
+
+
+class FairScheduler:
+    """
+    Thread-safe deficit round-robin scheduler over per-user task queues.
+
+    Workers call next_task() to pull work and task_done() when finished.
+    task_done() reports when a user's last task completes so the caller
+    can finalize that user (rank papers, write the digest).
+    """
+
+    def __init__(self, quantum: int = 1):
+        """
+        Initialize the scheduler.
+
+        Args:
+            quantum: Tasks granted per unit of tier weight on each turn
+        """
+        self.quantum = quantum
+        self._users: Dict[str, _UserQueue] = {}
+        self._active = deque()
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._completion: Dict[str, float] = {}
+
+    def add_user(self, uid: str, tier: str, tasks: List) -> None:
+        """
+        Queue tasks for a user.
+
+        Args:
+            uid: User ID
+            tier: User tier (selects the scheduling weight)
+            tasks: Opaque task objects, run in the given order
+        """
+        with self._lock:
+            queue = _UserQueue(uid, tier, tasks)
+            self._users[uid] = queue
+            if queue.tasks:
+                self._active.append(queue)
+
+    def next_task(self) -> Optional[Tuple[str, object]]:
+        """
+        Pull the next task in fair order.
+
+        Returns:
+            (uid, task) or None when no tasks are pending
+        """
+        with self._lock:
+            while self._active:
+                queue = self._active[0]
+
+                if not queue.tasks:
+                    self._active.popleft()
+                    queue.deficit = 0
+                    continue
+
+                if queue.deficit < 1:
+                    # Start this user's turn
+                    queue.deficit += self.quantum * queue.weight
+
+                task = queue.tasks.popleft()
+                queue.deficit -= 1
+                queue.outstanding += 1
+
+                if not queue.tasks:
+                    self._active.popleft()
+                    queue.deficit = 0
+                elif queue.deficit < 1:
+                    # Turn over: move to the back of the round
+                    self._active.rotate(-1)
+
+                return queue.uid, task
+
+            return None
+
+    def task_done(self, uid: str) -> bool:
+        """
+        Mark one of a user's tasks as finished.
+
+        Args:
+            uid: User ID
+
+        Returns:
+            True if this was the user's last outstanding task
+        """
+        with self._lock:
+            queue = self._users[uid]
+            queue.outstanding -= 1
+            queue.completed += 1
+            if queue.completed == queue.total:
+                self._completion[uid] = time.monotonic() - self._started
+                return True
+            return False
+
+    def pending(self) -> int:
+        """Number of tasks not yet handed out."""
+        with self._lock:
+            return sum(len(queue.tasks) for queue in self._active)
+
+    def completion_times(self) -> Dict[str, Tuple[str, float]]:
+        """Seconds from scheduler start to each finished user's last task."""
+        with self._lock:
+            return {uid: (self._users[uid].tier, seconds)
+                    for uid, seconds in self._completion.items()}
+
+
+def summarize_completion(times: List[Tuple[str, float]]) -> Dict:
+    """
+    Summarize per-user completion times.
+
+    Args:
+        times: (tier, seconds) for each finished user
+
+    Returns:
+        Dict with count, p50/p90/max seconds overall and per tier
+    """
+    def _summary(values: List[float]) -> Dict:
+        if not values:
+            return {'count': 0, 'p50Seconds': None, 'p90Seconds': None, 'maxSeconds': None}
+        ordered = sorted(values)
+        p90_index = min(len(ordered) - 1, int(round(0.9 * (len(ordered) - 1))))
+        return {
+            'count': len(ordered),
+            'p50Seconds': round(statistics.median(ordered), 2),
+            'p90Seconds': round(ordered[p90_index], 2),
+            'maxSeconds': round(ordered[-1], 2)
+        }
+
+    by_tier: Dict[str, List[float]] = {}
+    for tier, seconds in times:
+        by_tier.setdefault(tier or 'free', []).append(seconds)
+
+    summary = _summary([seconds for _, seconds in times])
+    summary['byTier'] = {tier: _summary(values) for tier, values in sorted(by_tier.items())}
+    return summary
@@ -0,0 +1,203 @@
+"""
+Search Result Cache
+
+Caches /api/search results per normalized (query, days_back, max_results)
+in two tiers:
+
+    memory     Per-process LRU (TTLCache)
+    Firestore  Optional shared tier (search_cache/{key hash}) so instances
+               reuse each other's results
+
+Entries are fresh for SEARCH_CACHE_TTL seconds. Older entries, up to
+SEARCH_CACHE_STALE_SECONDS, are still served immediately while a
+background thread recomputes them (stale-while-revalidate).
+
+Configuration (environment):
+    SEARCH_CACHE_SIZE           Cached searches per process (default 1000)
+    SEARCH_CACHE_TTL            Seconds an entry is fresh (default 600)
+    SEARCH_CACHE_STALE_SECONDS  Seconds an entry may be served stale (default 3600)
+    SEARCH_CACHE_FIRESTORE      Enable the shared Firestore tier (default false)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.utils.cache import TTLCache
+
+
+SEARCH_CACHE_SIZE = int(os.getenv('SEARCH_CACHE_SIZE', '1000'))
+SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', '600'))
+SEARCH_CACHE_STALE_SECONDS = int(os.getenv('SEARCH_CACHE_STALE_SECONDS', '3600'))
+SEARCH_CACHE_FIRESTORE = os.getenv('SEARCH_CACHE_FIRESTORE', 'false').lower() == 'true'
+
+CACHE_COLLECTION = 'search_cache'
+
+# Cache statuses reported to clients and recorded on search events
+HIT = 'hit'
+STALE = 'stale'
+MISS = 'miss'
+
+SearchKey = Tuple[str, int, int]
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a query and collapse whitespace."""
+    return ' '.join(query.lower().split())
+
+
+def search_key(query: str, days_back: int, max_results: int) -> SearchKey:
+    """Cache key for a search."""
+    return normalize_query(query), days_back, max_results
+
+
+def _doc_id(key: SearchKey) -> str:
+    return hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest()
+
+
+class SearchResultCache:
+    """Two-tier search result cache with stale-while-revalidate."""
+
+    def __init__(
+        self,
+        db=None,
+        memory: Optional[TTLCache] = None,
+        ttl_seconds: int = SEARCH_CACHE_TTL,
+        stale_seconds: int = SEARCH_CACHE_STALE_SECONDS
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            db: Firestore client for the shared tier (None disables it)
+            memory: In-process tier (defaults to a TTLCache from the environment)
+            ttl_seconds: Seconds an entry is fresh
+            stale_seconds: Seconds an entry may be served while refreshing
+        """
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = max(stale_seconds, ttl_seconds)
+        self.memory = memory or TTLCache(SEARCH_CACHE_SIZE, self.stale_seconds)
+        self.counts = {HIT: 0, STALE: 0, MISS: 0}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key: SearchKey, compute: Callable[[], List[Dict]]) -> Tuple[List[Dict], str, float]:
+        """
+        Cached results for a search, computing them on a miss.
+
+        Args:
+            key: Key from search_key()
+            compute: Returns fresh results for the search
+
+        Returns:
+            (papers, status, age in seconds) where status is hit, stale or miss
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            age = max(0.0, time.time() - entry['computedAt'])
+            if age < self.ttl_seconds:
+                return entry['papers'], self._count(HIT), age
+            if age < self.stale_seconds:
+                self._refresh_in_background(key, compute)
+                return entry['papers'], self._count(STALE), age
+
+        papers = compute()
+        self.put(key, papers)
+        return papers, self._count(MISS), 0.0
+
+    def put(self, key: SearchKey, papers: List[Dict]) -> None:
+        """Store results in both tiers."""
+        entry = {'papers': papers, 'computedAt': time.time()}
+        self.memory.set(key, entry)
+
+        if self.db is not None:
+            query, days_back, max_results = key
+            try:
+                self.db.collection(CACHE_COLLECTION).document(_doc_id(key)).set({
+                    'query': query,
+                    'daysBack': days_back,
+                    'maxResults': max_results,
+                    **entry
+                })
+            except Exception as e:
+                print(f'Warning: Failed to write search cache: {e}')
+
+    def stats(self) -> Dict:
+        """Status counts and hit rate (stale responses count as hits)."""
+        with self._lock:
+            counts = dict(self.counts)
+        total = sum(counts.values())
+        return {
+            **counts,
+            'hitRate': round((counts[HIT] + counts[STALE]) / total, 4) if total else 0.0,
+            'memory': self.memory.stats()
+        }
+
+    def _lookup(self, key: SearchKey) -> Optional[Dict]:
+        """Entry from memory, falling back to the shared tier."""
+        entry = self.memory.get(key)
+        if entry is not None or self.db is None:
+            return entry
+
+        try:
+            doc = self.db.collection(CACHE_COLLECTION).document(_doc_id(key)).get()
+        except Exception as e:
+            print(f'Warning: Failed to read search cache: {e}')
+            return None
+        if not doc.exists:
+            return None
+
+        data = doc.to_dict() or {}
+        if 'papers' not in data or 'computedAt' not in data:
+            return None
+        entry = {'papers': data['papers'], 'computedAt': data['computedAt']}
+        age = time.time() - entry['computedAt']
+        if age < self.stale_seconds:
+            self.memory.set(key, entry, ttl_seconds=self.stale_seconds - age)
+        return entry
+
+    def _refresh_in_background(self, key: SearchKey, compute: Callable[[], List[Dict]]) -> None:
+        """Recompute a stale entry on a daemon thread (once per key at a time)."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                self.put(key, compute())
+            except Exception as e:
+                print(f'Error refreshing search "{key[0]}": {e}')
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_refresh, name='search-cache-refresh', daemon=True).start()
+
+    def _count(self, status: str) -> str:
+        with self._lock:
+            self.counts[status] += 1
+        return status
+
+
+_shared_cache: Optional[SearchResultCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_search_cache(db=None) -> SearchResultCache:
+    """
+    Return the process-wide search cache, creating it on first use.
+
+    Args:
+        db: Firestore client, used for the shared tier when
+            SEARCH_CACHE_FIRESTORE is enabled (only on first call)
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SearchResultCache(db if SEARCH_CACHE_FIRESTORE else None)
+        return _shared_cache
@@ -0,0 +1,92 @@
+"""
+Typed research seeds.
+
+Seeds in seeds/{uid}.items are either plain strings (free-text queries,
+the original format) or typed objects:
+
+    "working memory"                                  query seed
+    {"type": "query", "query": "working memory"}      query seed
+    {"type": "topic", "id": "T10312", "name": "..."}  OpenAlex topic seed
+
+Query seeds are stored as plain strings so existing clients keep working.
+Topic seeds are collected with topics.id filters instead of search.
+"""
+
+import re
+from typing import Dict, List, Tuple, Union
+
+SEED_TYPES = ('query', 'topic')
+
+# OpenAlex topic IDs, bare or as URLs (https://openalex.org/T10312)
+TOPIC_ID_PATTERN = re.compile(r'^(?:https?://openalex\.org/)?(T\d+)$', re.IGNORECASE)
+
+Seed = Union[str, Dict]
+
+
+def normalize_topic_id(value) -> str:
+    """
+    Canonical topic ID ("T10312") from a bare ID or OpenAlex URL.
+
+    Raises:
+        ValueError: If the value is not an OpenAlex topic ID
+    """
+    match = TOPIC_ID_PATTERN.match(str(value or '').strip())
+    if not match:
+        raise ValueError(f'Invalid topic ID: {value!r}')
+    return match.group(1).upper()
+
+
+def canonical_seed(item) -> Seed:
+    """
+    Validate a seed and return its stored form.
+
+    Args:
+        item: Seed as sent by a client
+
+    Returns:
+        Query string, or {"type": "topic", "id": ..., ["name": ...]}
+
+    Raises:
+        ValueError: If the seed is malformed
+    """
+    if isinstance(item, str):
+        if not item.strip():
+            raise ValueError('Query seeds must not be empty')
+        return item.strip()
+
+    if not isinstance(item, dict) or item.get('type') not in SEED_TYPES:
+        raise ValueError(f'Seeds must be strings or objects with type in {SEED_TYPES}')
+
+    if item['type'] == 'query':
+        return canonical_seed(item.get('query') if isinstance(item.get('query'), str) else '')
+
+    seed = {'type': 'topic', 'id': normalize_topic_id(item.get('id'))}
+    if isinstance(item.get('name'), str) and item['name'].strip():
+        seed['name'] = item['name'].strip()
+    return seed
+
+
+def split_seeds(items: List[Seed]) -> Tuple[List[str], List[str]]:
+    """
+    Split stored seeds into query strings and topic IDs.
+
+    Malformed entries are skipped; duplicates are kept once.
+
+    Args:
+        items: Stored seeds (seeds/{uid}.items)
+
+    Returns:
+        (queries, topic_ids), each in seed order
+    """
+    queries: Dict[str, None] = {}
+    topic_ids: Dict[str, None] = {}
+    for item in items or []:
+        try:
+            seed = canonical_seed(item)
+        except ValueError:
+            continue
+        if isinstance(seed, str):
+            queries[seed] = None
+        else:
+            topic_ids[seed['id']] = None
+    return list(queries), list(topic_ids)
@@ -48,6 +48,26 @@ class SemanticScholarClient:
         Returns:
             List of normalized paper dicts
         """
+        raw_papers = self.fetch_raw(query, days_back, max_results)
+        return self.parse_raw(raw_papers, max_results)
+
+    def fetch_raw(
+        self,
+        query: str,
+        days_back: int = 7,
+        max_results: int = 50
+    ) -> List[Dict]:
+        """
+        Fetch raw S2 paper objects matching query.
+
+        Args:
+            query: Search query
+            days_back: How many days back to search
+            max_results: Maximum number of results
+
+        Returns:
+            List of raw S2 paper objects (empty on API error)
+        """
         # Calculate year filter (S2 doesn't support date range, only year)
         current_year = datetime.utcnow().year
         year_filter = f'{current_year}-'
@@ -67,19 +87,31 @@ class SemanticScholarClient:
             )
             response.raise_for_status()
             data = response.json()
-
-            papers = []
-            for paper in data.get('data', []):
-                normalized = self._normalize_paper(paper)
-                if normalized:
-                    papers.append(normalized)
-
-            return papers[:max_results]
+            return data.get('data', [])
 
         except requests.RequestException as e:
             print(f'Semantic Scholar API error: {str(e)}')
             return []
 
+    def parse_raw(self, raw_papers: List[Dict], max_results: int = 50) -> List[Dict]:
+        """
+        Normalize raw S2 paper objects.
+
+        Args:
+            raw_papers: Raw S2 paper objects from fetch_raw
+            max_results: Maximum number of papers to return
+
+        Returns:
+            List of normalized paper dicts
+        """
+        papers = []
+        for paper in raw_papers:
+            normalized = self._normalize_paper(paper)
+            if normalized:
+                papers.append(normalized)
+
+        return papers[:max_results]
+
     def _normalize_paper(self, paper: Dict) -> Optional[Dict]:
         """
         Normalize S2 paper to our schema.
@@ -0,0 +1,519 @@
+"""
+Topic Aggregates
+
+Derived views of the topics catalog (hierarchy tree, field list and
+collection statistics), computed once per catalog version at ingest and
+stored as a single gzipped JSON blob in topics_meta/aggregates.
+
+Serving instances read that one document and keep it in memory until the
+catalog version changes. When only a few topics change, the stored views
+can be patched with apply_changes instead of being rebuilt from every
+topic.
+"""
+
+import copy
+import gzip
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from google.cloud import firestore
+
+from .topics_catalog import (
+    CATALOG_TTL_SECONDS,
+    META_COLLECTION,
+    VERSION_CHECK_SECONDS,
+    TopicsCatalogCache,
+    get_shared_cache,
+    topic_sort_key
+)
+
+
+AGGREGATES_DOC = "aggregates"
+
+# Bumped when the aggregates layout changes; older blobs are recomputed
+SCHEMA_VERSION = 2
+
+# Hierarchy levels, outermost first
+HIERARCHY_LEVELS = ("domain", "field", "subfield")
+
+# Number of topics listed in stats.top_topics
+TOP_TOPICS = 10
+
+# Firestore documents are limited to 1 MiB
+MAX_BLOB_BYTES = 1_000_000
+
+
+def _topic_summary(topic: Dict) -> Dict:
+    return {
+        "id": topic.get("id"),
+        "display_name": topic.get("display_name"),
+        "works_count": topic.get("works_count", 0),
+        "description": topic.get("description", "")
+    }
+
+
+def _top_topic(topic: Dict) -> Dict:
+    return {
+        "id": topic.get("id"),
+        "display_name": topic.get("display_name"),
+        "works_count": topic.get("works_count"),
+        "field": (topic.get("field") or {}).get("display_name")
+    }
+
+
+def _insert_topic(hierarchy: Dict, topic: Dict) -> List[Dict]:
+    """Add a topic to the hierarchy; returns the topic list it went into."""
+    domain = topic.get("domain")
+    field = topic.get("field")
+    subfield = topic.get("subfield")
+
+    if not domain or not field:
+        return []
+
+    domain_node = hierarchy["domains"].setdefault(domain.get("id"), {
+        "id": domain.get("id"),
+        "display_name": domain.get("display_name"),
+        "topic_count": 0,
+        "fields": {}
+    })
+    field_node = domain_node["fields"].setdefault(field.get("id"), {
+        "id": field.get("id"),
+        "display_name": field.get("display_name"),
+        "topic_count": 0,
+        "subfields": {}
+    })
+    domain_node["topic_count"] += 1
+    field_node["topic_count"] += 1
+
+    if subfield and subfield.get("id"):
+        subfield_node = field_node["subfields"].setdefault(subfield.get("id"), {
+            "id": subfield.get("id"),
+            "display_name": subfield.get("display_name"),
+            "topic_count": 0,
+            "topics": []
+        })
+        subfield_node["topic_count"] += 1
+        topics = subfield_node["topics"]
+    else:
+        # Topics without a subfield hang directly off the field
+        topics = field_node.setdefault("topics", [])
+
+    topics.append(_topic_summary(topic))
+    return topics
+
+
+def _remove_topic(hierarchy: Dict, topic: Dict) -> None:
+    """Remove a topic from the hierarchy, pruning nodes left empty."""
+    domain = topic.get("domain")
+    field = topic.get("field")
+    subfield = topic.get("subfield")
+
+    if not domain or not field:
+        return
+
+    domain_node = hierarchy["domains"].get(domain.get("id"))
+    field_node = domain_node["fields"].get(field.get("id")) if domain_node else None
+    if not field_node:
+        return
+
+    if subfield and subfield.get("id"):
+        subfield_node = field_node["subfields"].get(subfield.get("id"))
+        if not subfield_node:
+            return
+        remaining = [t for t in subfield_node["topics"] if t["id"] != topic.get("id")]
+        if len(remaining) == len(subfield_node["topics"]):
+            return
+        subfield_node["topics"] = remaining
+        subfield_node["topic_count"] -= 1
+        if not remaining:
+            del field_node["subfields"][subfield.get("id")]
+    else:
+        remaining = [t for t in field_node.get("topics", []) if t["id"] != topic.get("id")]
+        if len(remaining) == len(field_node.get("topics", [])):
+            return
+        field_node["topics"] = remaining
+        if not remaining:
+            del field_node["topics"]
+
+    domain_node["topic_count"] -= 1
+    field_node["topic_count"] -= 1
+
+    if not field_node["subfields"] and not field_node.get("topics"):
+        del domain_node["fields"][field.get("id")]
+    if not domain_node["fields"]:
+        del hierarchy["domains"][domain.get("id")]
+
+
+def _count_topic(stats: Dict, fields: Dict[str, Dict], topic: Dict, sign: int) -> None:
+    """Add (sign=1) or subtract (sign=-1) a topic from the counters."""
+    works = topic.get("works_count", 0) or 0
+    stats["total_topics"] += sign
+    stats["total_works"] += sign * works
+
+    field = topic.get("field") or {}
+
+    if field.get("display_name"):
+        entry = stats["fields"].setdefault(field["display_name"], {"topic_count": 0, "works_count": 0})
+        entry["topic_count"] += sign
+        entry["works_count"] += sign * works
+        if entry["topic_count"] <= 0:
+            del stats["fields"][field["display_name"]]
+
+    if field.get("id"):
+        entry = fields.setdefault(field["id"], {
+            "id": field["id"],
+            "display_name": field.get("display_name"),
+            "topic_count": 0
+        })
+        entry["topic_count"] += sign
+        if entry["topic_count"] <= 0:
+            del fields[field["id"]]
+
+
+def _sorted_fields(fields: Dict[str, Dict]) -> List[Dict]:
+    return sorted(fields.values(), key=lambda f: (-f["topic_count"], f["id"]))
+
+
+def build_hierarchy(topics: List[Dict]) -> Dict:
+    """
+    Build the domain > field > subfield > topics tree.
+
+    Topics in each list are ordered by works_count descending.
+
+    Args:
+        topics: List of topic dictionaries
+
+    Returns:
+        Hierarchical tree structure
+    """
+    hierarchy = {"domains": {}}
+    for topic in sorted(topics, key=topic_sort_key):
+        _insert_topic(hierarchy, topic)
+    return hierarchy
+
+
+def compute_aggregates(topics: List[Dict]) -> Dict:
+    """
+    Compute every derived view from the full topic list.
+
+    Args:
+        topics: All topic dictionaries
+
+    Returns:
+        Dict with "hierarchy", "fields" and "stats"
+    """
+    ordered = sorted(topics, key=topic_sort_key)
+    stats = {"total_topics": 0, "total_works": 0, "fields": {}}
+    fields: Dict[str, Dict] = {}
+
+    for topic in ordered:
+        _count_topic(stats, fields, topic, 1)
+
+    stats["top_topics"] = [_top_topic(t) for t in ordered[:TOP_TOPICS]]
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "hierarchy": build_hierarchy(ordered),
+        "fields": _sorted_fields(fields),
+        "stats": stats
+    }
+
+
+def apply_changes(
+    aggregates: Dict,
+    upserts: List[Tuple[Optional[Dict], Dict]],
+    removed: Optional[List[Dict]] = None
+) -> Optional[Dict]:
+    """
+    Patch stored aggregates for a set of changed topics.
+
+    Args:
+        aggregates: Aggregates from compute_aggregates (not modified)
+        upserts: (previous topic or None if new, current topic) pairs
+        removed: Previous versions of deleted topics
+
+    Returns:
+        Updated aggregates, or None when the top-topics list cannot be
+        patched (a listed topic shrank or was removed) and a full
+        compute_aggregates is required
+    """
+    if aggregates.get("schema") != SCHEMA_VERSION:
+        return None
+
+    removed = removed or []
+    result = copy.deepcopy(aggregates)
+    hierarchy = result["hierarchy"]
+    stats = result["stats"]
+    fields = {f["id"]: f for f in result["fields"]}
+
+    top = stats["top_topics"]
+    top_by_id = {t["id"]: t for t in top}
+    top_complete = len(top) < TOP_TOPICS  # Every topic is already listed
+
+    for old in removed:
+        if old.get("id") in top_by_id and not top_complete:
+            return None
+    for old, new in upserts:
+        if old and old.get("id") in top_by_id and not top_complete:
+            if (new.get("works_count") or 0) < (old.get("works_count") or 0):
+                return None
+
+    touched_lists = []
+    for old in removed + [old for old, _ in upserts if old]:
+        _remove_topic(hierarchy, old)
+        _count_topic(stats, fields, old, -1)
+
+    for _, new in upserts:
+        touched_lists.append(_insert_topic(hierarchy, new))
+        _count_topic(stats, fields, new, 1)
+
+    for topics in touched_lists:
+        topics.sort(key=topic_sort_key)
+
+    touched_ids = {t.get("id") for t in removed} | {new.get("id") for _, new in upserts}
+    candidates = [t for t in top if t["id"] not in touched_ids]
+    candidates.extend(_top_topic(new) for _, new in upserts)
+    stats["top_topics"] = sorted(candidates, key=topic_sort_key)[:TOP_TOPICS]
+
+    result["fields"] = _sorted_fields(fields)
+    return result
+
+
+def filter_hierarchy(hierarchy: Dict, field_name: str) -> Dict:
+    """
+    Restrict a hierarchy to one field (matched by display name).
+
+    Args:
+        hierarchy: Full hierarchy
+        field_name: Field display name
+
+    Returns:
+        Hierarchy containing only the matching field and its domain
+    """
+    domains = {}
+    for domain_id, domain in hierarchy["domains"].items():
+        fields = {
+            field_id: field for field_id, field in domain["fields"].items()
+            if field.get("display_name") == field_name
+        }
+        if fields:
+            domains[domain_id] = {**domain, "fields": fields}
+    return {"domains": domains}
+
+
+def hierarchy_outline(hierarchy: Dict, depth: str) -> Dict:
+    """
+    Hierarchy truncated below a level, for lazy expansion.
+
+    Nodes keep their topic_count; children below depth and all topic
+    lists are dropped.
+
+    Args:
+        hierarchy: Full hierarchy
+        depth: Deepest level to include ("domain", "field" or "subfield")
+
+    Returns:
+        Truncated hierarchy
+    """
+    levels = HIERARCHY_LEVELS[:HIERARCHY_LEVELS.index(depth) + 1]
+
+    def _node(node: Dict, level: int) -> Dict:
+        outline = {"id": node["id"], "display_name": node["display_name"],
+                   "topic_count": node["topic_count"]}
+        if level + 1 < len(levels):
+            key = f"{levels[level + 1]}s"
+            outline[key] = {
+                child_id: _node(child, level + 1)
+                for child_id, child in node.get(key, {}).items()
+            }
+        return outline
+
+    return {"domains": {d_id: _node(d, 0) for d_id, d in hierarchy["domains"].items()}}
+
+
+def hierarchy_subtree(hierarchy: Dict, level: str, node_id: str) -> Optional[Dict]:
+    """
+    One domain, field or subfield node with everything below it.
+
+    Args:
+        hierarchy: Full hierarchy
+        level: "domain", "field" or "subfield"
+        node_id: ID of the node at that level
+
+    Returns:
+        The node, or None if it does not exist
+    """
+    nodes = list(hierarchy["domains"].values())
+    for index, current in enumerate(HIERARCHY_LEVELS):
+        if current == level:
+            return next((node for node in nodes if node["id"] == node_id), None)
+        if index + 1 < len(HIERARCHY_LEVELS):
+            child_key = f"{HIERARCHY_LEVELS[index + 1]}s"
+            nodes = [child for node in nodes for child in node.get(child_key, {}).values()]
+    return None
+
+
+def encode_aggregates(aggregates: Dict) -> bytes:
+    """Serialize aggregates as gzipped JSON."""
+    return gzip.compress(json.dumps(aggregates, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_aggregates(data: bytes) -> Dict:
+    """Inverse of encode_aggregates."""
+    return json.loads(gzip.decompress(data).decode("utf-8"))
+
+
+class TopicAggregatesCache:
+    """In-process copy of the stored aggregates, revalidated by catalog version."""
+
+    def __init__(
+        self,
+        db: firestore.Client,
+        catalog: TopicsCatalogCache,
+        ttl_seconds: int = CATALOG_TTL_SECONDS,
+        version_check_seconds: int = VERSION_CHECK_SECONDS
+    ):
+        """
+        Initialize the aggregates cache.
+
+        Args:
+            db: Firestore client instance
+            catalog: Catalog cache (source of the version and fallback topics)
+            ttl_seconds: Maximum age of loaded aggregates
+            version_check_seconds: Interval between version document reads
+        """
+        self.db = db
+        self.catalog = catalog
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self._aggregates: Optional[Dict] = None
+        self._version = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _ref(self):
+        return self.db.collection(META_COLLECTION).document(AGGREGATES_DOC)
+
+    def read_stored(self) -> Tuple[Optional[Dict], object]:
+        """
+        Read the stored aggregates document.
+
+        Returns:
+            (aggregates, version), or (None, None) if nothing is stored
+        """
+        doc = self._ref().get()
+        if not doc.exists:
+            return None, None
+        data = doc.to_dict()
+        return decode_aggregates(data["data"]), data.get("version")
+
+    def store(self, aggregates: Dict, version) -> bool:
+        """
+        Write aggregates for a catalog version and cache them locally.
+
+        Args:
+            aggregates: Aggregates to store
+            version: Catalog version they were computed from
+
+        Returns:
+            True if written (False if the blob is too large to store)
+        """
+        blob = encode_aggregates(aggregates)
+        with self._lock:
+            self._aggregates, self._version = aggregates, version
+            self._loaded_at = self._checked_at = time.monotonic()
+
+        if len(blob) > MAX_BLOB_BYTES:
+            print(f"Topic aggregates too large to store ({len(blob)} bytes)")
+            return False
+
+        self._ref().set({
+            "version": version,
+            "encoding": "gzip+json",
+            "data": blob,
+            "updated_at": firestore.SERVER_TIMESTAMP
+        })
+        return True
+
+    def invalidate(self) -> None:
+        """Drop the cached aggregates so the next read reloads them."""
+        with self._lock:
+            self._aggregates = None
+
+    def get(self) -> Dict:
+        """
+        Return aggregates for the current catalog version.
+
+        Reads the stored blob when the local copy is missing or stale, and
+        computes from the catalog if the stored blob is missing or was
+        built for a different version.
+
+        Returns:
+            Dict with "hierarchy", "fields" and "stats"
+        """
+        now = time.monotonic()
+        aggregates = self._aggregates
+
+        if aggregates is not None and now - self._loaded_at < self.ttl_seconds:
+            if now - self._checked_at < self.version_check_seconds:
+                return aggregates
+
+        with self._lock:
+            now = time.monotonic()
+            aggregates = self._aggregates
+
+            if aggregates is not None and now - self._loaded_at < self.ttl_seconds:
+                if now - self._checked_at < self.version_check_seconds:
+                    return aggregates
+
+                try:
+                    version = self.catalog.read_version()
+                except Exception as e:
+                    # Keep serving the cached aggregates if the check fails
+                    print(f"Error checking topics catalog version: {e}")
+                    self._checked_at = now
+                    return aggregates
+
+                self._checked_at = now
+                if version == self._version:
+                    return aggregates
+
+            self._aggregates, self._version = self._load()
+            self._loaded_at = self._checked_at = time.monotonic()
+            return self._aggregates
+
+    def _load(self) -> Tuple[Dict, object]:
+        """Load stored aggregates, falling back to computing them."""
+        version = self.catalog.read_version()
+        aggregates, stored_version = self.read_stored()
+        if (aggregates is not None and stored_version == version
+                and aggregates.get("schema") == SCHEMA_VERSION):
+            return aggregates, version
+
+        print(f"Stored topic aggregates missing or stale (version {stored_version}), computing")
+        catalog = self.catalog.get_catalog()
+        return compute_aggregates(catalog.topics), catalog.version
+
+
+_shared_aggregates: Optional[TopicAggregatesCache] = None
+_shared_aggregates_lock = threading.Lock()
+
+
+def get_shared_aggregates(db: firestore.Client) -> TopicAggregatesCache:
+    """
+    Return the process-wide aggregates cache, creating it on first use.
+
+    Args:
+        db: Firestore client instance
+
+    Returns:
+        Shared TopicAggregatesCache
+    """
+    global _shared_aggregates
+    with _shared_aggregates_lock:
+        if _shared_aggregates is None:
+            _shared_aggregates = TopicAggregatesCache(db, get_shared_cache(db))
+        return _shared_aggregates
@@ -0,0 +1,191 @@
+"""
+Topic Paper Feeds
+
+Recent papers within a topic, fetched from OpenAlex with a topics.id
+filter and cursor paging, normalized and scored like collector results.
+
+Pages are cached per (topic, sort, cursor, page size) with a TTL. First
+pages of the most viewed topics are refreshed in the background before
+they expire, so topic landing pages are served from cache.
+
+Configuration (environment):
+    TOPIC_PAPERS_CACHE_TTL        Page lifetime in seconds (default 900)
+    TOPIC_PAPERS_CACHE_SIZE       Cached pages per process (default 2000)
+    TOPIC_PAPERS_REFRESH_SECONDS  Background refresh interval (default 600, 0 disables)
+    TOPIC_PAPERS_POPULAR          Topics refreshed per cycle (default 20)
+    TOPIC_PAPERS_REFRESH_PAGES    Leading pages refreshed per topic (default 1)
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from app.utils.cache import TTLCache
+
+from .clients import get_client
+from .collector import rank_shard
+from .rate_limit import get_limiter
+
+
+TOPIC_PAPERS_CACHE_TTL = int(os.getenv('TOPIC_PAPERS_CACHE_TTL', '900'))
+TOPIC_PAPERS_CACHE_SIZE = int(os.getenv('TOPIC_PAPERS_CACHE_SIZE', '2000'))
+TOPIC_PAPERS_REFRESH_SECONDS = int(os.getenv('TOPIC_PAPERS_REFRESH_SECONDS', '600'))
+TOPIC_PAPERS_POPULAR = int(os.getenv('TOPIC_PAPERS_POPULAR', '20'))
+TOPIC_PAPERS_REFRESH_PAGES = int(os.getenv('TOPIC_PAPERS_REFRESH_PAGES', '1'))
+
+# API sort name -> OpenAlex sort expression
+SORTS = {
+    'date': 'publication_date:desc',
+    'citations': 'cited_by_count:desc'
+}
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+FIRST_PAGE = '*'
+
+
+class TopicPaperFeed:
+    """Cached, cursor-paged paper feeds per topic."""
+
+    def __init__(
+        self,
+        client=None,
+        cache: Optional[TTLCache] = None,
+        refresh_seconds: int = TOPIC_PAPERS_REFRESH_SECONDS,
+        popular: int = TOPIC_PAPERS_POPULAR,
+        refresh_pages: int = TOPIC_PAPERS_REFRESH_PAGES
+    ):
+        """
+        Initialize the feed.
+
+        Args:
+            client: OpenAlex client (defaults to the shared client)
+            cache: Page cache (defaults to a TTLCache from the environment)
+            refresh_seconds: Background refresh interval (0 disables it)
+            popular: Number of most viewed feeds refreshed per cycle
+            refresh_pages: Leading pages refreshed per feed
+        """
+        self.client = client or get_client('openalex')
+        self.cache = cache or TTLCache(TOPIC_PAPERS_CACHE_SIZE, TOPIC_PAPERS_CACHE_TTL)
+        self.refresh_seconds = refresh_seconds
+        self.popular = popular
+        self.refresh_pages = refresh_pages
+        self._views = Counter()
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+
+    def get_page(
+        self,
+        topic_id: str,
+        sort: str = 'date',
+        cursor: Optional[str] = None,
+        per_page: int = DEFAULT_PAGE_SIZE
+    ) -> Optional[Dict]:
+        """
+        One page of a topic's papers.
+
+        Args:
+            topic_id: Topic ID (e.g., "T10312")
+            sort: Key of SORTS
+            cursor: Cursor from the previous page (None for the first page)
+            per_page: Papers per page
+
+        Returns:
+            Dict with papers, next_cursor, count and cache info, or None
+            if OpenAlex could not be reached
+        """
+        cursor = cursor or FIRST_PAGE
+        if cursor == FIRST_PAGE:
+            self._record_view(topic_id, sort, per_page)
+
+        key = (topic_id, sort, cursor, per_page)
+        entry = self.cache.get_entry(key)
+        if entry is not None:
+            page, age = entry
+            return {**page, 'cache': {'hit': True, 'ageSeconds': round(age, 1)}}
+
+        page = self._fetch(topic_id, sort, cursor, per_page)
+        if page is None:
+            return None
+
+        self.cache.set(key, page)
+        return {**page, 'cache': {'hit': False, 'ageSeconds': 0.0}}
+
+    def _fetch(self, topic_id: str, sort: str, cursor: str, per_page: int) -> Optional[Dict]:
+        """Fetch, normalize and score one page from OpenAlex."""
+        get_limiter('openalex').acquire()
+        data = self.client.fetch_topic_works([topic_id], cursor=cursor, per_page=per_page, sort=SORTS[sort])
+        if data is None:
+            return None
+
+        # Same ID assignment and scoring as collector and search results
+        papers = rank_shard(self.client.parse_raw(data['results'], max_results=len(data['results'])))
+
+        return {
+            'papers': papers,
+            'next_cursor': data['next_cursor'],
+            'count': data['count']
+        }
+
+    def _record_view(self, topic_id: str, sort: str, per_page: int) -> None:
+        """Count a landing-page view and make sure the refresher runs."""
+        with self._lock:
+            self._views[(topic_id, sort, per_page)] += 1
+
+            if self.refresh_seconds > 0 and self._refresher is None:
+                self._refresher = threading.Thread(
+                    target=self._refresh_loop, name='topic-papers-refresh', daemon=True
+                )
+                self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            time.sleep(self.refresh_seconds)
+            try:
+                self.refresh_popular()
+            except Exception as e:
+                print(f'Error refreshing topic feeds: {str(e)}')
+
+    def refresh_popular(self) -> int:
+        """
+        Re-fetch the leading pages of the most viewed feeds.
+
+        View counts are halved after each cycle so popularity follows
+        recent traffic.
+
+        Returns:
+            Number of pages refreshed
+        """
+        with self._lock:
+            feeds = [feed for feed, _ in self._views.most_common(self.popular)]
+            self._views = Counter({feed: count // 2 for feed, count in self._views.items() if count // 2})
+
+        refreshed = 0
+        for topic_id, sort, per_page in feeds:
+            cursor = FIRST_PAGE
+            for _ in range(self.refresh_pages):
+                page = self._fetch(topic_id, sort, cursor, per_page)
+                if page is None:
+                    break
+                self.cache.set((topic_id, sort, cursor, per_page), page)
+                refreshed += 1
+                cursor = page['next_cursor']
+                if not cursor:
+                    break
+        return refreshed
+
+
+_shared_feed: Optional[TopicPaperFeed] = None
+_shared_feed_lock = threading.Lock()
+
+
+def get_topic_feed() -> TopicPaperFeed:
+    """Return the process-wide topic paper feed, creating it on first use."""
+    global _shared_feed
+    with _shared_feed_lock:
+        if _shared_feed is None:
+            _shared_feed = TopicPaperFeed()
+        return _shared_feed
@@ -0,0 +1,193 @@
+"""
+Topic Search Index
+
+Inverted index and prefix trie over topic display names, keywords and
+descriptions, scored with BM25F (per-field boosts and length
+normalization). Built once per catalog version and queried in memory.
+
+Query semantics:
+- Every query token must match the topic in at least one field
+- The last token also matches as a prefix (search-as-you-type), at a
+  reduced weight
+"""
+
+import math
+import re
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+# Field name -> boost
+FIELD_BOOSTS = {
+    "display_name": 3.0,
+    "keywords": 2.0,
+    "description": 1.0
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Weight of prefix (non-exact) term matches relative to exact matches
+PREFIX_WEIGHT = 0.5
+
+# Maximum number of indexed terms a prefix expands to
+MAX_PREFIX_EXPANSIONS = 50
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+_TERM = "$"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a text."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class TopicSearchIndex:
+    """BM25F inverted index with prefix expansion over a topic list."""
+
+    def __init__(self, topics: List[Dict]):
+        """
+        Build the index.
+
+        Args:
+            topics: Topic dicts (order is used to break score ties)
+        """
+        self.topics = topics
+        self.fields = list(FIELD_BOOSTS)
+        self.boosts = [FIELD_BOOSTS[f] for f in self.fields]
+
+        # term -> {doc index: [tf per field]}
+        self.postings: Dict[str, Dict[int, List[int]]] = {}
+        self.lengths: List[List[int]] = []
+        self.field_names: List[Optional[str]] = []
+
+        for doc_index, topic in enumerate(topics):
+            doc_lengths = []
+            for field_index, field in enumerate(self.fields):
+                tokens = self._field_tokens(topic, field)
+                doc_lengths.append(len(tokens))
+                for token in tokens:
+                    tfs = self.postings.setdefault(token, {}).setdefault(doc_index, [0] * len(self.fields))
+                    tfs[field_index] += 1
+            self.lengths.append(doc_lengths)
+            self.field_names.append((topic.get("field") or {}).get("display_name"))
+
+        count = max(1, len(topics))
+        self.avg_lengths = [
+            max(1.0, sum(doc[i] for doc in self.lengths) / count)
+            for i in range(len(self.fields))
+        ]
+        self.idf = {
+            term: math.log(1 + (len(topics) - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+        self.trie: Dict = {}
+        for term in self.postings:
+            node = self.trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[_TERM] = term
+
+    @staticmethod
+    def _field_tokens(topic: Dict, field: str) -> List[str]:
+        if field == "keywords":
+            return [token for keyword in topic.get("keywords") or [] for token in tokenize(keyword)]
+        return tokenize(topic.get(field) or "")
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """
+        Indexed terms starting with prefix (up to MAX_PREFIX_EXPANSIONS).
+
+        Args:
+            prefix: Lowercase term prefix
+
+        Returns:
+            Matching terms, shortest first
+        """
+        node = self.trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        # Breadth-first, so terms come out by length and truncation keeps
+        # the shortest completions
+        terms = []
+        queue = deque([node])
+        while queue and len(terms) < MAX_PREFIX_EXPANSIONS:
+            current = queue.popleft()
+            if _TERM in current:
+                terms.append(current[_TERM])
+            queue.extend(child for key, child in current.items() if key != _TERM)
+        return terms
+
+    def _term_scores(self, term: str, weight: float) -> Dict[int, float]:
+        """BM25F contribution of one term for every document containing it."""
+        docs = self.postings.get(term)
+        if not docs:
+            return {}
+
+        idf = self.idf[term]
+        scores = {}
+        for doc_index, tfs in docs.items():
+            lengths = self.lengths[doc_index]
+            tf = 0.0
+            for i, raw_tf in enumerate(tfs):
+                if raw_tf:
+                    norm = 1 - B + B * lengths[i] / self.avg_lengths[i]
+                    tf += self.boosts[i] * raw_tf / norm
+            scores[doc_index] = weight * idf * tf * (K1 + 1) / (tf + K1)
+        return scores
+
+    def search(
+        self,
+        query: str,
+        field_name: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Rank topics for a query.
+
+        Args:
+            query: Free-text query
+            field_name: Optional field display name to restrict results to
+            limit: Maximum number of results
+
+        Returns:
+            (topic, score) pairs, best first
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        totals: Optional[Dict[int, float]] = None
+        for position, token in enumerate(tokens):
+            token_scores = dict(self._term_scores(token, 1.0))
+
+            if position == len(tokens) - 1:
+                for term in self.expand_prefix(token):
+                    if term == token:
+                        continue
+                    for doc_index, score in self._term_scores(term, PREFIX_WEIGHT).items():
+                        if score > token_scores.get(doc_index, 0.0):
+                            token_scores[doc_index] = score
+
+            if totals is None:
+                totals = token_scores
+            else:
+                totals = {
+                    doc_index: total + token_scores[doc_index]
+                    for doc_index, total in totals.items()
+                    if doc_index in token_scores
+                }
+            if not totals:
+                return []
+
+        if field_name:
+            totals = {d: s for d, s in totals.items() if self.field_names[d] == field_name}
+
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(self.topics[doc_index], score) for doc_index, score in ranked]
@@ -0,0 +1,185 @@
+"""
+Related Topics
+
+Precomputed "related topics" neighbors from a sparse TF-IDF model over
+topic names, keywords and descriptions.
+
+Each topic becomes an L2-normalized sparse vector; cosine similarities
+are computed block-wise as sparse matrix products and only the top-N
+neighbors per topic are kept. Built once per catalog version.
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .topic_search import tokenize
+
+
+DEFAULT_NEIGHBORS = 10
+
+# Rows per similarity block (bounds the dense block at BLOCK_ROWS x topics)
+BLOCK_ROWS = 256
+
+# Terms in more than this share of topics are dropped: they barely move
+# similarities but dominate the cost of the sparse products
+MAX_DF_RATIO = 0.2
+
+# Feature weights per source field
+NAME_WEIGHT = 2.0
+KEYWORD_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Common words in topic descriptions that carry no topical signal
+STOPWORDS = frozenset("""
+    a an and are as at be been by for from has have in into is it its of on or
+    such that the their these this those to was were which with within
+    research researchers study studies studied topic covers cover including
+    include includes various aspects role impact effects effect analysis
+    understanding focus focuses explores examines investigates using use
+""".split())
+
+
+def _features(topic: Dict) -> Dict[str, float]:
+    """Weighted term counts for one topic."""
+    counts: Dict[str, float] = {}
+
+    def _add(term: str, weight: float):
+        counts[term] = counts.get(term, 0.0) + weight
+
+    for token in tokenize(topic.get("display_name") or ""):
+        if token not in STOPWORDS:
+            _add(token, NAME_WEIGHT)
+
+    for keyword in topic.get("keywords") or []:
+        phrase = " ".join(tokenize(keyword))
+        if not phrase:
+            continue
+        # Whole keyword phrase as its own feature, plus its words
+        _add(f"kw:{phrase}", KEYWORD_WEIGHT)
+        for token in phrase.split():
+            if token not in STOPWORDS:
+                _add(token, KEYWORD_WEIGHT)
+
+    for token in tokenize(topic.get("description") or ""):
+        if token not in STOPWORDS:
+            _add(token, DESCRIPTION_WEIGHT)
+
+    return counts
+
+
+def build_tfidf_matrix(topics: List[Dict]) -> sparse.csr_matrix:
+    """
+    Sparse TF-IDF matrix (one L2-normalized row per topic).
+
+    Term frequencies are sublinear (1 + log tf); IDF is smoothed. Terms
+    found in more than MAX_DF_RATIO of the topics are dropped.
+
+    Args:
+        topics: Topic dictionaries
+
+    Returns:
+        CSR matrix of shape (len(topics), vocabulary size)
+    """
+    vocabulary: Dict[str, int] = {}
+    rows, cols, values = [], [], []
+
+    for row, topic in enumerate(topics):
+        for term, weight in _features(topic).items():
+            col = vocabulary.setdefault(term, len(vocabulary))
+            rows.append(row)
+            cols.append(col)
+            values.append(1.0 + math.log(weight))
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float32), (rows, cols)),
+        shape=(len(topics), max(1, len(vocabulary))),
+        dtype=np.float32
+    )
+
+    df = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = np.log((1 + len(topics)) / (1 + df)).astype(np.float32) + 1.0
+    idf[df > max(2, MAX_DF_RATIO * len(topics))] = 0.0
+    matrix = matrix @ sparse.diags(idf)
+    matrix.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix, dtype=np.float32)
+
+
+def top_neighbors(matrix: sparse.csr_matrix, n: int = DEFAULT_NEIGHBORS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-n most similar rows for every row (excluding itself).
+
+    Args:
+        matrix: L2-normalized CSR matrix
+        n: Neighbors per row
+
+    Returns:
+        (indices, similarities), both of shape (rows, n); rows with fewer
+        than n positive similarities are padded with index -1
+    """
+    count = matrix.shape[0]
+    n = min(n, max(0, count - 1))
+    indices = np.full((count, n), -1, dtype=np.int32)
+    scores = np.zeros((count, n), dtype=np.float32)
+    if n == 0:
+        return indices, scores
+
+    transposed = matrix.T.tocsr()
+    for start in range(0, count, BLOCK_ROWS):
+        end = min(start + BLOCK_ROWS, count)
+        block = (matrix[start:end] @ transposed).toarray()
+        block[np.arange(end - start), np.arange(start, end)] = -1.0  # Exclude self
+
+        top = np.argpartition(-block, n - 1, axis=1)[:, :n]
+        top_scores = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        positive = top_scores > 0
+        indices[start:end] = np.where(positive, top, -1)
+        scores[start:end] = np.where(positive, top_scores, 0.0)
+
+    return indices, scores
+
+
+class RelatedTopicsIndex:
+    """Top-N related topics per topic ID."""
+
+    def __init__(self, topics: List[Dict], neighbors: int = DEFAULT_NEIGHBORS):
+        """
+        Build the index.
+
+        Args:
+            topics: Topic dictionaries
+            neighbors: Neighbors stored per topic
+        """
+        self.topics = topics
+        self._row = {t.get("id"): i for i, t in enumerate(topics)}
+        self._indices, self._scores = top_neighbors(build_tfidf_matrix(topics), neighbors)
+
+    def related(self, topic_id: str, limit: int = DEFAULT_NEIGHBORS) -> List[Tuple[Dict, float]]:
+        """
+        Most similar topics to one topic.
+
+        Args:
+            topic_id: Topic ID
+            limit: Maximum neighbors (at most the number stored)
+
+        Returns:
+            (topic, cosine similarity) pairs, most similar first; empty if
+            the topic is unknown
+        """
+        row = self._row.get(topic_id)
+        if row is None:
+            return []
+        return [
+            (self.topics[index], float(score))
+            for index, score in zip(self._indices[row][:limit], self._scores[row][:limit])
+            if index >= 0
+        ]
@@ -0,0 +1,332 @@
+"""
+Topics Catalog Cache
+
+In-process cache of the OpenAlex topics collection. The full catalog
+(about 1,500 topics) is read from Firestore once and served from memory
+until its TTL expires or the catalog version changes.
+
+The catalog version lives in topics_meta/catalog and is bumped by
+OpenAlexTopicsService.cache_topics_in_firestore after each refresh.
+Instances check that single document periodically, so a refresh made
+by another process is picked up without re-reading every topic.
+
+When TOPICS_CATALOG_FILE is set, the first worker to load a version
+writes it to that path in the compact binary format (topics_mmap) and
+every worker on the host maps the file instead of holding its own dicts.
+"""
+
+import base64
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from google.cloud import firestore
+
+from .topic_search import TopicSearchIndex
+from .topics_mmap import MmapTopicsCatalog, write_catalog_file
+
+
+# Matches the daily topics refresh cadence
+CATALOG_TTL_SECONDS = int(os.getenv('TOPICS_CATALOG_TTL_SECONDS', str(24 * 3600)))
+
+# How often a warm cache re-reads the version document
+VERSION_CHECK_SECONDS = int(os.getenv('TOPICS_VERSION_CHECK_SECONDS', '300'))
+
+# Optional compact catalog file shared by workers (e.g. /tmp/topics_catalog.bin)
+CATALOG_FILE = os.getenv('TOPICS_CATALOG_FILE', '')
+
+META_COLLECTION = "topics_meta"
+CATALOG_DOC = "catalog"
+
+
+def topic_sort_key(topic: Dict) -> Tuple[int, str]:
+    """Catalog order: works_count descending, then ID."""
+    return (-(topic.get("works_count") or 0), topic.get("id") or "")
+
+
+def encode_cursor(topic: Dict) -> str:
+    """Opaque keyset cursor pointing just after a topic."""
+    raw = json.dumps([topic.get("works_count") or 0, topic.get("id")], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """
+    Inverse of encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        works_count, topic_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(works_count, int) or not isinstance(topic_id, str):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return works_count, topic_id
+
+
+class TopicsCatalog:
+    """Immutable snapshot of the topics collection at one version."""
+
+    def __init__(self, topics: List[Dict], version):
+        """
+        Build lookup views over a topic list.
+
+        Args:
+            topics: Topic dicts (sorted here by works_count descending, then ID)
+            version: Catalog version the topics were read at
+        """
+        self.version = version
+        self.topics = sorted(topics, key=topic_sort_key)
+        self.by_id = {t["id"]: t for t in self.topics if t.get("id")}
+
+        self.by_field: Dict[str, List[Dict]] = {}
+        for topic in self.topics:
+            field_name = (topic.get("field") or {}).get("display_name")
+            if field_name:
+                self.by_field.setdefault(field_name, []).append(topic)
+
+        # Sort keys per listing, for keyset pagination
+        self._keys = {None: [topic_sort_key(t) for t in self.topics]}
+        for field_name, field_topics in self.by_field.items():
+            self._keys[field_name] = [topic_sort_key(t) for t in field_topics]
+
+        self._search_index: Optional[TopicSearchIndex] = None
+        self._related_index = None
+        self._lock = threading.Lock()
+
+    @property
+    def search_index(self) -> TopicSearchIndex:
+        """Search index for this catalog version, built on first use."""
+        if self._search_index is None:
+            with self._lock:
+                if self._search_index is None:
+                    self._search_index = TopicSearchIndex(self.topics)
+        return self._search_index
+
+    @property
+    def related_index(self):
+        """Related-topics index for this catalog version, built on first use."""
+        if self._related_index is None:
+            # Imported here so NumPy/SciPy load only when related topics are used
+            from .topic_similarity import RelatedTopicsIndex
+            with self._lock:
+                if self._related_index is None:
+                    self._related_index = RelatedTopicsIndex(self.topics)
+        return self._related_index
+
+    def get_topics(self, field_name: Optional[str] = None) -> List[Dict]:
+        """
+        Topics ordered by works_count descending, optionally for one field.
+
+        Returns a new list; the topic dicts themselves are shared and must
+        not be mutated.
+        """
+        if field_name:
+            return list(self.by_field.get(field_name, []))
+        return list(self.topics)
+
+    def get_topic(self, topic_id: str) -> Optional[Dict]:
+        """Topic by ID, or None."""
+        return self.by_id.get(topic_id)
+
+    def page(
+        self,
+        field_name: Optional[str] = None,
+        after: Optional[Tuple[int, str]] = None,
+        limit: int = 100
+    ) -> Tuple[List[Dict], int]:
+        """
+        One page of topics in (works_count desc, id) order.
+
+        Args:
+            field_name: Optional field to list
+            after: (works_count, id) of the last topic of the previous page
+            limit: Page size
+
+        Returns:
+            (topics on this page, total topics in the listing)
+        """
+        topics = self.by_field.get(field_name, []) if field_name else self.topics
+        keys = self._keys.get(field_name, [])
+        start = bisect.bisect_right(keys, (-after[0], after[1])) if after else 0
+        return topics[start:start + limit], len(topics)
+
+
+# Either in-memory or file-backed catalog; both expose the same lookups
+CatalogSnapshot = Union[TopicsCatalog, MmapTopicsCatalog]
+
+
+class TopicsCatalogCache:
+    """Thread-safe TTL + version-invalidated cache of the topics catalog."""
+
+    def __init__(
+        self,
+        db: firestore.Client,
+        ttl_seconds: int = CATALOG_TTL_SECONDS,
+        version_check_seconds: int = VERSION_CHECK_SECONDS,
+        catalog_file: str = CATALOG_FILE
+    ):
+        """
+        Initialize the catalog cache.
+
+        Args:
+            db: Firestore client instance
+            ttl_seconds: Maximum age of a loaded catalog
+            version_check_seconds: Interval between version document reads
+            catalog_file: Optional path of a shared compact catalog file
+        """
+        self.db = db
+        self.catalog_file = catalog_file
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self._catalog: Optional[CatalogSnapshot] = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _meta_ref(self):
+        return self.db.collection(META_COLLECTION).document(CATALOG_DOC)
+
+    def read_version(self):
+        """Read the current catalog version from Firestore (None if unset)."""
+        doc = self._meta_ref().get()
+        return doc.to_dict().get("version") if doc.exists else None
+
+    def bump_version(self):
+        """
+        Mark the stored catalog as changed.
+
+        Called after topics are written so every instance reloads, and
+        drops this instance's copy immediately.
+
+        Returns:
+            The new catalog version
+        """
+        self._meta_ref().set({
+            "version": firestore.Increment(1),
+            "updated_at": firestore.SERVER_TIMESTAMP
+        }, merge=True)
+        self.invalidate()
+        return self.read_version()
+
+    def invalidate(self) -> None:
+        """Drop the cached catalog so the next read reloads it."""
+        with self._lock:
+            self._catalog = None
+
+    def peek(self) -> Optional[CatalogSnapshot]:
+        """Return the cached catalog without loading or revalidating it."""
+        return self._catalog
+
+    def get_catalog(self) -> CatalogSnapshot:
+        """
+        Return the current catalog, loading it if missing, expired or stale.
+
+        Returns:
+            Catalog snapshot (file-backed when a catalog file is configured)
+        """
+        now = time.monotonic()
+        catalog = self._catalog
+
+        if catalog is not None and now - self._loaded_at < self.ttl_seconds:
+            if now - self._checked_at < self.version_check_seconds:
+                return catalog
+
+        with self._lock:
+            now = time.monotonic()
+            catalog = self._catalog
+
+            if catalog is not None and now - self._loaded_at < self.ttl_seconds:
+                if now - self._checked_at < self.version_check_seconds:
+                    return catalog
+
+                try:
+                    version = self.read_version()
+                except Exception as e:
+                    # Keep serving the cached catalog if the check fails
+                    print(f"Error checking topics catalog version: {e}")
+                    self._checked_at = now
+                    return catalog
+
+                self._checked_at = now
+                if version == catalog.version:
+                    return catalog
+
+            self._catalog = self._load()
+            self._loaded_at = self._checked_at = time.monotonic()
+            return self._catalog
+
+    def _load(self) -> CatalogSnapshot:
+        """
+        Read the version and all topics.
+
+        With a catalog file configured, a file already written for the
+        current version (by another worker) is mapped without reading
+        any topics from Firestore.
+        """
+        version = self.read_version()
+
+        if self.catalog_file:
+            catalog = self._open_file(version)
+            if catalog is not None:
+                return catalog
+
+        topics = []
+        for doc in self.db.collection("topics").stream():
+            topic = doc.to_dict()
+            topic["id"] = doc.id  # Ensure ID is included
+            topics.append(topic)
+
+        print(f"Loaded topics catalog: {len(topics)} topics (version {version})")
+
+        if self.catalog_file and isinstance(version, int):
+            try:
+                write_catalog_file(topics, self.catalog_file, version)
+                catalog = self._open_file(version)
+                if catalog is not None:
+                    return catalog
+            except OSError as e:
+                print(f"Error writing topics catalog file: {e}")
+
+        return TopicsCatalog(topics, version)
+
+    def _open_file(self, version) -> Optional[MmapTopicsCatalog]:
+        """Map the catalog file if it exists and holds the given version."""
+        if version is None or not os.path.exists(self.catalog_file):
+            return None
+        try:
+            catalog = MmapTopicsCatalog(self.catalog_file)
+        except (OSError, ValueError) as e:
+            print(f"Error opening topics catalog file: {e}")
+            return None
+        if catalog.version != version:
+            return None
+        print(f"Mapped topics catalog file: {len(catalog)} topics (version {version})")
+        return catalog
+
+
+_shared_cache: Optional[TopicsCatalogCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache(db: firestore.Client) -> TopicsCatalogCache:
+    """
+    Return the process-wide catalog cache, creating it on first use.
+
+    Args:
+        db: Firestore client instance
+
+    Returns:
+        Shared TopicsCatalogCache
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = TopicsCatalogCache(db)
+        return _shared_cache
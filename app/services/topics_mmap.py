@@ -0,0 +1,405 @@
+"""
+Compact Topics Catalog File
+
+Binary, memory-mapped representation of the topics catalog. Gunicorn
+workers on one host map the same read-only file, so the catalog pages
+are shared through the OS page cache instead of every worker holding
+its own copy as Python dicts. Opening the file only parses the header
+and the small hierarchy tables; topics are decoded on lookup.
+
+Layout (little-endian):
+
+    header      magic, format version, catalog version, counts, and an
+                (offset, length) pair for each section below
+    strings     UTF-8 string table; records refer to (offset, length)
+    records     one fixed-width record per topic, by works_count desc
+    id_index    u32 per numeric topic ID (T12345 -> slot 12345) holding
+                record number + 1, 0 if absent (direct-address lookup)
+    domains     fixed-width hierarchy node records
+    fields      (id, name, parent, member offset, member count)
+    subfields
+    field_members     u32 record numbers grouped by field
+    subfield_members  u32 record numbers grouped by subfield
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Tuple
+
+from .topic_search import TopicSearchIndex
+
+
+MAGIC = b"RWTC"
+FORMAT_VERSION = 1
+
+SECTIONS = (
+    "strings", "records", "id_index", "domains", "fields", "subfields",
+    "field_members", "subfield_members"
+)
+
+_HEADER = struct.Struct("<4sHHqIIII")
+_SECTION = struct.Struct("<QQ")
+# id number, 6 string refs (id, openalex_id, display_name, description,
+# keywords JSON, updated_date), works_count, cited_by_count, domain,
+# field, subfield, padding
+_RECORD = struct.Struct("<I12IQQHHHH")
+# id ref, name ref, parent, padding, member offset, member count
+_NODE = struct.Struct("<IIIIHHII")
+_U32 = struct.Struct("<I")
+
+NO_NODE = 0xFFFF
+NO_VERSION = -1
+
+
+def _topic_number(topic_id: str) -> Optional[int]:
+    """Numeric part of an OpenAlex topic ID ("T12345" -> 12345)."""
+    if topic_id and topic_id[0] in "Tt" and topic_id[1:].isdigit():
+        return int(topic_id[1:])
+    return None
+
+
+class _StringTable:
+    """Deduplicating UTF-8 string table builder."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets: Dict[str, tuple] = {}
+
+    def add(self, value: Optional[str]) -> tuple:
+        value = value or ""
+        ref = self.offsets.get(value)
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = self.offsets[value] = (len(self.data), len(encoded))
+            self.data += encoded
+        return ref
+
+
+def write_catalog_file(topics: List[Dict], path: str, version=None) -> int:
+    """
+    Write topics to a compact catalog file.
+
+    The file is written to a temporary name and renamed into place, so
+    processes that have the previous file mapped keep reading it safely.
+
+    Args:
+        topics: Processed topic dictionaries (OpenAlexTopicsService format)
+        path: Destination path
+        version: Catalog version to record (int or None)
+
+    Returns:
+        Size of the written file in bytes
+    """
+    ordered = sorted(
+        (t for t in topics if _topic_number(t.get("id", "")) is not None),
+        key=lambda t: (-(t.get("works_count") or 0), t["id"])
+    )
+    strings = _StringTable()
+
+    nodes = {"domains": {}, "fields": {}, "subfields": {}}
+    members = {"fields": {}, "subfields": {}}
+
+    def _node(kind: str, ref: Optional[Dict], parent: int) -> int:
+        if not ref or not ref.get("id"):
+            return NO_NODE
+        table = nodes[kind]
+        if ref["id"] not in table:
+            table[ref["id"]] = (len(table), ref["id"], ref.get("display_name"), parent)
+        return table[ref["id"]][0]
+
+    records = bytearray()
+    max_number = 0
+    for record_number, topic in enumerate(ordered):
+        domain = _node("domains", topic.get("domain"), NO_NODE)
+        field = _node("fields", topic.get("field"), domain)
+        subfield = _node("subfields", topic.get("subfield"), field)
+        if field != NO_NODE:
+            members["fields"].setdefault(field, []).append(record_number)
+        if subfield != NO_NODE:
+            members["subfields"].setdefault(subfield, []).append(record_number)
+
+        number = _topic_number(topic["id"])
+        max_number = max(max_number, number)
+        refs = [
+            strings.add(topic["id"]),
+            strings.add(topic.get("openalex_id")),
+            strings.add(topic.get("display_name")),
+            strings.add(topic.get("description")),
+            strings.add(json.dumps(topic.get("keywords") or [], separators=(",", ":"))),
+            strings.add(topic.get("updated_date")),
+        ]
+        records += _RECORD.pack(
+            number, *[value for ref in refs for value in ref],
+            topic.get("works_count") or 0, topic.get("cited_by_count") or 0,
+            domain, field, subfield, 0
+        )
+
+    id_index = bytearray(_U32.size * (max_number + 1 if ordered else 0))
+    for record_number, topic in enumerate(ordered):
+        _U32.pack_into(id_index, _U32.size * _topic_number(topic["id"]), record_number + 1)
+
+    sections = {"records": bytes(records), "id_index": bytes(id_index)}
+    for kind in ("domains", "fields", "subfields"):
+        table = bytearray()
+        member_table = bytearray()
+        for index, node_id, name, parent in sorted(nodes[kind].values()):
+            node_members = members.get(kind, {}).get(index, [])
+            table += _NODE.pack(
+                *strings.add(node_id), *strings.add(name), parent, 0,
+                len(member_table) // _U32.size, len(node_members)
+            )
+            for record_number in node_members:
+                member_table += _U32.pack(record_number)
+        sections[kind] = bytes(table)
+        if kind != "domains":
+            sections[f"{kind[:-1]}_members"] = bytes(member_table)
+    sections["strings"] = bytes(strings.data)
+
+    header_size = _HEADER.size + _SECTION.size * len(SECTIONS)
+    offset = header_size
+    layout = []
+    for name in SECTIONS:
+        layout.append((offset, len(sections[name])))
+        offset += len(sections[name])
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0,
+        version if isinstance(version, int) else NO_VERSION,
+        len(ordered), len(nodes["domains"]), len(nodes["fields"]), len(nodes["subfields"])
+    ) + b"".join(_SECTION.pack(*entry) for entry in layout)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".topics-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            for name in SECTIONS:
+                f.write(sections[name])
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return offset
+
+
+class MmapTopicsCatalog:
+    """
+    Read-only catalog backed by a memory-mapped compact file.
+
+    Offers the same lookups as TopicsCatalog (get_topic, get_topics,
+    topics, search_index, related_index). Topic dicts are decoded on
+    each lookup and never cached, including by the search and
+    related-topics indexes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a catalog file.
+
+        Args:
+            path: Path written by write_catalog_file
+
+        Raises:
+            ValueError: If the file is not a compatible catalog file
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"{path} is not a topics catalog file")
+        magic, format_version, _, version, count, *_ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} topics catalog file")
+
+        self.version = None if version == NO_VERSION else version
+        self.count = count
+        self._sections = {
+            name: _SECTION.unpack_from(self._mm, _HEADER.size + i * _SECTION.size)
+            for i, name in enumerate(SECTIONS)
+        }
+        self._strings = self._sections["strings"][0]
+
+        # Hierarchy tables are small; decode them up front
+        self._nodes = {kind: self._read_nodes(kind) for kind in ("domains", "fields", "subfields")}
+        self._field_by_name = {}
+        for index, node in enumerate(self._nodes["fields"]):
+            self._field_by_name.setdefault(node["display_name"], index)
+        self._subfield_by_id = {node["id"]: index for index, node in enumerate(self._nodes["subfields"])}
+
+        self._search_index: Optional[TopicSearchIndex] = None
+        self._related_index = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _str(self, offset: int, length: int) -> str:
+        start = self._strings + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _read_nodes(self, kind: str) -> List[Dict]:
+        offset, length = self._sections[kind]
+        nodes = []
+        for position in range(offset, offset + length, _NODE.size):
+            id_off, id_len, name_off, name_len, parent, _, member_offset, member_count = \
+                _NODE.unpack_from(self._mm, position)
+            nodes.append({
+                "id": self._str(id_off, id_len),
+                "display_name": self._str(name_off, name_len),
+                "parent": parent,
+                "member_offset": member_offset,
+                "member_count": member_count
+            })
+        return nodes
+
+    def _node_ref(self, kind: str, index: int) -> Optional[Dict]:
+        if index == NO_NODE:
+            return None
+        node = self._nodes[kind][index]
+        return {"id": node["id"], "display_name": node["display_name"]}
+
+    def _record(self, record_number: int) -> Dict:
+        offset = self._sections["records"][0] + record_number * _RECORD.size
+        values = _RECORD.unpack_from(self._mm, offset)
+        refs = values[1:13]
+        works_count, cited_by_count, domain, field, subfield = values[13:18]
+        return {
+            "id": self._str(refs[0], refs[1]),
+            "openalex_id": self._str(refs[2], refs[3]),
+            "display_name": self._str(refs[4], refs[5]),
+            "description": self._str(refs[6], refs[7]),
+            "keywords": json.loads(self._str(refs[8], refs[9])),
+            "works_count": works_count,
+            "cited_by_count": cited_by_count,
+            "domain": self._node_ref("domains", domain),
+            "field": self._node_ref("fields", field),
+            "subfield": self._node_ref("subfields", subfield),
+            "updated_date": self._str(refs[10], refs[11])
+        }
+
+    def _members(self, kind: str, index: int) -> List[Dict]:
+        return [self._record(n) for n in self._member_numbers(kind, index)]
+
+    def _record_key(self, record_number: int) -> Tuple[int, str]:
+        """Sort key (-works_count, id) of a record without decoding it."""
+        offset = self._sections["records"][0] + record_number * _RECORD.size
+        values = _RECORD.unpack_from(self._mm, offset)
+        return (-values[13], self._str(values[1], values[2]))
+
+    def _member_numbers(self, kind: str, index: int) -> List[int]:
+        node = self._nodes[kind][index]
+        base = self._sections[f"{kind[:-1]}_members"][0] + node["member_offset"] * _U32.size
+        return [
+            _U32.unpack_from(self._mm, base + i * _U32.size)[0]
+            for i in range(node["member_count"])
+        ]
+
+    def page(
+        self,
+        field_name: Optional[str] = None,
+        after: Optional[Tuple[int, str]] = None,
+        limit: int = 100
+    ) -> Tuple[List[Dict], int]:
+        """
+        One page of topics in (works_count desc, id) order.
+
+        Binary-searches the sorted records for the cursor and decodes
+        only the topics on the page.
+
+        Args:
+            field_name: Optional field to list
+            after: (works_count, id) of the last topic of the previous page
+            limit: Page size
+
+        Returns:
+            (topics on this page, total topics in the listing)
+        """
+        if field_name:
+            index = self._field_by_name.get(field_name)
+            numbers = self._member_numbers("fields", index) if index is not None else []
+        else:
+            numbers = range(self.count)
+
+        start = 0
+        if after:
+            start = bisect.bisect_right(numbers, (-after[0], after[1]), key=self._record_key)
+        return [self._record(n) for n in numbers[start:start + limit]], len(numbers)
+
+    def get_topic(self, topic_id: str) -> Optional[Dict]:
+        """Topic by ID, or None."""
+        number = _topic_number(topic_id or "")
+        offset, length = self._sections["id_index"]
+        if number is None or number * _U32.size >= length:
+            return None
+        slot = _U32.unpack_from(self._mm, offset + number * _U32.size)[0]
+        return self._record(slot - 1) if slot else None
+
+    def get_topics(self, field_name: Optional[str] = None) -> List[Dict]:
+        """Topics ordered by works_count descending, optionally for one field."""
+        if field_name:
+            index = self._field_by_name.get(field_name)
+            return self._members("fields", index) if index is not None else []
+        return list(self.topics)
+
+    def get_subfield_topics(self, subfield_id: str) -> List[Dict]:
+        """Topics in one subfield, ordered by works_count descending."""
+        index = self._subfield_by_id.get(subfield_id)
+        return self._members("subfields", index) if index is not None else []
+
+    @property
+    def topics(self) -> Sequence[Dict]:
+        """Every topic, in record order, decoded from the map on access."""
+        return _RecordView(self)
+
+    @property
+    def search_index(self) -> TopicSearchIndex:
+        """Search index for this catalog version, built on first use."""
+        if self._search_index is None:
+            with self._lock:
+                if self._search_index is None:
+                    self._search_index = TopicSearchIndex(self.topics)
+        return self._search_index
+
+    @property
+    def related_index(self):
+        """Related-topics index for this catalog version, built on first use."""
+        if self._related_index is None:
+            # Imported here so NumPy/SciPy load only when related topics are used
+            from .topic_similarity import RelatedTopicsIndex
+            with self._lock:
+                if self._related_index is None:
+                    self._related_index = RelatedTopicsIndex(self.topics)
+        return self._related_index
+
+
+class _RecordView(Sequence):
+    """
+    Read-only sequence over a mapped catalog's records.
+
+    Topics are decoded on each access and not kept, so the search and
+    related-topics indexes built over it hold only their own postings and
+    matrices; the topics they return are decoded from the shared map.
+    """
+
+    def __init__(self, catalog: MmapTopicsCatalog):
+        self._catalog = catalog
+
+    def __len__(self) -> int:
+        return self._catalog.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._catalog._record(i) for i in range(*index.indices(self._catalog.count))]
+        if index < 0:
+            index += self._catalog.count
+        if not 0 <= index < self._catalog.count:
+            raise IndexError("topic index out of range")
+        return self._catalog._record(index)
@@ -2,19 +2,135 @@
 Authentication utilities for Research Watcher API.
 
 Provides Firebase ID token validation and @login_required decorator.
+
+Verified token claims are cached in-process (keyed by a SHA-256 of the
+token) until the token's exp, so repeat requests from a session skip
+signature verification. Google's signing certificates are refreshed in
+the background so verification of new tokens rarely waits on a fetch.
+
+Configuration (environment):
+    AUTH_TOKEN_CACHE_SIZE     Cached verified tokens (default 10000, 0 disables)
+    AUTH_CHECK_REVOKED        Also check revocation with Firebase (default false)
+    AUTH_REVOCATION_TTL       Seconds a cached token is trusted when revocation
+                              is checked (default 300)
+    AUTH_KEY_REFRESH_SECONDS  Signing key refresh interval (default 600, 0 disables)
 """
 
+import hashlib
+import os
+import threading
+import time
 from functools import wraps
+from typing import Dict, Optional
+
 from flask import request, jsonify, current_app
 from firebase_admin import auth
 
+from app.utils.cache import TTLCache
+
+
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv('AUTH_TOKEN_CACHE_SIZE', '10000'))
+AUTH_CHECK_REVOKED = os.getenv('AUTH_CHECK_REVOKED', 'false').lower() == 'true'
+AUTH_REVOCATION_TTL = int(os.getenv('AUTH_REVOCATION_TTL', '300'))
+AUTH_KEY_REFRESH_SECONDS = int(os.getenv('AUTH_KEY_REFRESH_SECONDS', '600'))
+
+# Google's x509 certificates for Firebase ID tokens
+ID_TOKEN_CERT_URI = 'https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com'
+
+_token_cache = TTLCache(maxsize=max(1, AUTH_TOKEN_CACHE_SIZE), ttl_seconds=AUTH_REVOCATION_TTL)
+
+_key_refresher: Optional[threading.Thread] = None
+_key_refresher_lock = threading.Lock()
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def verify_token(token: str) -> Dict:
+    """
+    Verify a Firebase ID token, reusing earlier verifications.
+
+    Claims are cached until the token expires (or for at most
+    AUTH_REVOCATION_TTL seconds when AUTH_CHECK_REVOKED is set).
+    Failed verifications are never cached.
+
+    Args:
+        token: Encoded Firebase ID token
+
+    Returns:
+        Decoded token claims
+
+    Raises:
+        firebase_admin.auth errors from verify_id_token
+    """
+    if AUTH_TOKEN_CACHE_SIZE <= 0:
+        return auth.verify_id_token(token, check_revoked=AUTH_CHECK_REVOKED)
+
+    key = _token_key(token)
+    claims = _token_cache.get(key)
+    if claims is not None:
+        return claims
+
+    claims = auth.verify_id_token(token, check_revoked=AUTH_CHECK_REVOKED)
+
+    ttl = claims.get('exp', 0) - time.time()
+    if AUTH_CHECK_REVOKED:
+        ttl = min(ttl, AUTH_REVOCATION_TTL)
+    if ttl > 0:
+        _token_cache.set(key, claims, ttl_seconds=ttl)
+    return claims
+
+
+def clear_token_cache() -> None:
+    """Forget every cached verification (e.g. after revoking a user's tokens)."""
+    _token_cache.clear()
+
+
+def refresh_signing_keys() -> None:
+    """
+    Fetch Google's token signing certificates through Firebase's verifier.
+
+    The verifier's HTTP session honors Cache-Control, so this refreshes
+    the certificates it uses once the cached copy has expired.
+    """
+    client = auth._get_client(None)
+    client._token_verifier.request(ID_TOKEN_CERT_URI, method='GET')
+
+
+def _refresh_keys_loop() -> None:
+    while True:
+        try:
+            refresh_signing_keys()
+        except Exception as e:
+            print(f'Error refreshing token signing keys: {str(e)}')
+        time.sleep(AUTH_KEY_REFRESH_SECONDS)
+
+
+def start_key_refresher() -> bool:
+    """
+    Pre-warm and periodically refresh the signing keys in the background.
+
+    Returns:
+        True if the refresher is running
+    """
+    global _key_refresher
+    if AUTH_KEY_REFRESH_SECONDS <= 0:
+        return False
+    with _key_refresher_lock:
+        if _key_refresher is None:
+            _key_refresher = threading.Thread(target=_refresh_keys_loop, name='auth-key-refresh', daemon=True)
+            _key_refresher.start()
+    return True
+
 
 def login_required(f):
     """
     Decorator to require Firebase authentication for routes.
 
     Extracts Firebase ID token from Authorization header,
-    verifies it, and injects uid into the request context.
+    verifies it (see verify_token), and injects uid into the request
+    context.
 
     Usage:
         @bp.route('/protected')
@@ -50,7 +166,7 @@ def login_required(f):
 
         try:
             # Verify Firebase ID token
-            decoded_token = auth.verify_id_token(token)
+            decoded_token = verify_token(token)
             uid = decoded_token['uid']
 
             # Inject uid into request context
@@ -0,0 +1,82 @@
+"""
+Startup profiling.
+
+Records how long each module import and client initialization takes so
+cold starts can be held to a budget. Disabled unless STARTUP_PROFILE is
+set; phases are then logged as they finish and summarized by create_app.
+
+For a full import tree, run with `python -X importtime main.py`.
+
+Configuration (environment):
+    STARTUP_PROFILE    Record and log startup phases (default false)
+    STARTUP_BUDGET_MS  Warn when create_app exceeds this many ms (default 0, no budget)
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+STARTUP_PROFILE = os.getenv('STARTUP_PROFILE', 'false').lower() == 'true'
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', '0'))
+
+
+class StartupProfile:
+    """Thread-safe list of (phase, milliseconds) timings."""
+
+    def __init__(self, enabled: bool = STARTUP_PROFILE, budget_ms: float = STARTUP_BUDGET_MS):
+        """
+        Initialize the profile.
+
+        Args:
+            enabled: Record phases (when False, phase() only runs the block)
+            budget_ms: create_app budget in milliseconds (0 for none)
+        """
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+        self.phases: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as one phase."""
+        if not self.enabled:
+            yield
+            return
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def record(self, name: str, ms: float) -> None:
+        """Record a phase and log it."""
+        with self._lock:
+            self.phases.append((name, ms))
+        print(f'[startup] {name}: {ms:.1f} ms')
+
+    def report(self, total_ms: float) -> str:
+        """
+        Summary of the recorded phases, slowest first.
+
+        Args:
+            total_ms: Total time of the measured startup
+
+        Returns:
+            Multi-line report, flagging a blown budget
+        """
+        with self._lock:
+            phases = sorted(self.phases, key=lambda item: -item[1])
+
+        lines = [f'Startup profile: {total_ms:.1f} ms total']
+        lines.extend(f'  {ms:>9.1f} ms  {name}' for name, ms in phases)
+        if self.budget_ms:
+            status = 'OVER BUDGET' if total_ms > self.budget_ms else 'within budget'
+            lines.append(f'  budget {self.budget_ms:.0f} ms: {status}')
+        return '\n'.join(lines)
+
+
+startup_profile = StartupProfile()
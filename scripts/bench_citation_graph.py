@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the citation graph store
+
+Generates a synthetic citation graph in which each paper cites earlier
+papers, skewed toward the oldest ones so a few papers are highly cited.
+Measures:
+
+- build time from (citing, cited) ID pairs
+- save, load (memory-mapped) and file size
+- expansion latency by depth and direction, on node IDs (expand_nodes)
+  and with paper ID mapping (expand_citations), compared with a BFS over
+  a dict of adjacency lists
+
+Usage:
+    python scripts/bench_citation_graph.py [--papers 60000] [--refs 10] [--seeds 5] [--runs 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.citation_graph import BOTH, CITES, CitationGraph, expand_citations
+
+
+def _edges(papers: int, refs: int, rng: np.random.Generator):
+    citing = np.repeat(np.arange(1, papers), refs)
+    # Cube of a uniform skews references toward old (low ID) papers
+    cited = (citing * rng.random(len(citing)) ** 3).astype(np.int64)
+    return [(f'W{s}', f'W{t}') for s, t in zip(citing.tolist(), cited.tolist())]
+
+
+def _dict_bfs(references, citations, seeds, depth):
+    hops = {seed: 0 for seed in seeds}
+    frontier = list(seeds)
+    for hop in range(1, depth + 1):
+        next_frontier = []
+        for paper in frontier:
+            for neighbor in references.get(paper, []) + citations.get(paper, []):
+                if neighbor not in hops:
+                    hops[neighbor] = hop
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return hops
+
+
+def _timed(fn, runs):
+    samples, result = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the citation graph store')
+    parser.add_argument('--papers', type=int, default=60000)
+    parser.add_argument('--refs', type=int, default=10)
+    parser.add_argument('--seeds', type=int, default=5)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    edges = _edges(args.papers, args.refs, rng)
+
+    started = time.perf_counter()
+    graph = CitationGraph.from_edges(edges)
+    print(f'Built {graph.node_count:,} papers / {graph.edge_count:,} edges '
+          f'in {time.perf_counter() - started:.2f}s')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'citations.graph')
+        started = time.perf_counter()
+        graph.save(path)
+        save_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        graph = CitationGraph.load(path)
+        print(f'Saved in {save_seconds:.2f}s ({os.path.getsize(path) / 1e6:.1f} MB), '
+              f'loaded (mmap) in {time.perf_counter() - started:.2f}s')
+
+        references, citations = defaultdict(list), defaultdict(list)
+        for source, target in edges:
+            references[source].append(target)
+            citations[target].append(source)
+
+        seeds = [f'W{i}' for i in rng.choice(np.arange(args.papers // 2, args.papers), args.seeds, replace=False)]
+        print(f'\nExpansion from {len(seeds)} seeds (median of {args.runs} runs)')
+        seed_nodes = np.asarray([graph.nodes[seed] for seed in seeds], dtype=np.int32)
+        print(f'{"depth":>5}  {"direction":>9}  {"papers":>8}  {"nodes ms":>8}  {"IDs ms":>8}  {"dict ms":>8}')
+        for depth in range(1, 6):
+            for direction in (CITES, BOTH):
+                nodes_ms, _ = _timed(lambda: graph.expand_nodes(seed_nodes, depth, direction), args.runs)
+                ids_ms, reached = _timed(lambda: expand_citations(graph, seeds, depth, direction), args.runs)
+                dict_ms = ''
+                if direction == BOTH:
+                    baseline_ms, _ = _timed(lambda: _dict_bfs(references, citations, seeds, depth), max(1, args.runs // 5))
+                    dict_ms = f'{baseline_ms:.2f}'
+                print(f'{depth:>5}  {direction:>9}  {len(reached):>8,}  {nodes_ms:>8.2f}  {ids_ms:>8.2f}  {dict_ms:>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark the CPU stage (parse/normalize/dedup/score)
+
+Generates synthetic OpenAlex, Semantic Scholar and arXiv payloads with
+overlapping papers and times app.services.collector.rank_payloads
+in-process and on the process pool with increasing worker counts.
+
+Usage:
+    python scripts/bench_cpu_stage.py [--records 20000] [--workers 1,2,4,8] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import cpu_stage
+from app.services.collector import rank_payloads
+
+WORDS = (
+    "memory attention cognition learning network model behavior social "
+    "neural working emotion perception language development clinical study "
+    "effect response task control analysis adult child brain data evidence"
+).split()
+
+PER_PAYLOAD = 50
+
+
+def _abstract_index(rng, length=180):
+    index = {}
+    for position in range(length):
+        index.setdefault(rng.choice(WORDS), []).append(position)
+    return index
+
+
+def _title(n):
+    return f"Synthetic paper {n} on {WORDS[n % len(WORDS)]} and {WORDS[(n * 7) % len(WORDS)]}"
+
+
+def openalex_payload(rng, ids):
+    return [{
+        'id': f'https://openalex.org/W{n}',
+        'doi': f'https://doi.org/10.5555/{n}',
+        'title': _title(n),
+        'authorships': [{'author': {'display_name': f'Author {n}-{a}'}} for a in range(6)],
+        'primary_location': {'source': {'display_name': 'Journal of Synthetic Results'}},
+        'publication_date': '2025-11-01',
+        'publication_year': 2025,
+        'cited_by_count': rng.randint(0, 500),
+        'open_access': {'is_oa': n % 2 == 0, 'oa_url': None},
+        'abstract_inverted_index': _abstract_index(rng)
+    } for n in ids]
+
+
+def s2_payload(rng, ids):
+    return [{
+        'paperId': f's2-{n}',
+        'title': _title(n),
+        'authors': [{'name': f'Author {n}-{a}'} for a in range(6)],
+        'venue': 'Journal of Synthetic Results',
+        'year': 2025,
+        'publicationDate': '2025-11-01',
+        'abstract': ' '.join(rng.choice(WORDS) for _ in range(180)),
+        'citationCount': rng.randint(0, 500),
+        'isOpenAccess': True,
+        'openAccessPdf': None,
+        'externalIds': {'DOI': f'10.5555/{n}'}
+    } for n in ids]
+
+
+def arxiv_payload(rng, ids):
+    entries = []
+    for n in ids:
+        authors = ''.join(f'<author><name>Author {n}-{a}</name></author>' for a in range(6))
+        summary = ' '.join(rng.choice(WORDS) for _ in range(180))
+        entries.append(
+            f'<entry><id>http://arxiv.org/abs/2511.{n:05d}v1</id>'
+            f'<title>{_title(n)}</title>{authors}<summary>{summary}</summary>'
+            f'<published>2025-11-01T00:00:00Z</published>'
+            f'<link title="pdf" href="http://arxiv.org/pdf/2511.{n:05d}v1"/>'
+            f'<arxiv:primary_category term="cs.LG"/></entry>'
+        )
+    return (
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        + ''.join(entries) + '</feed>'
+    ).encode('utf-8')
+
+
+def build_payloads(records, seed=7):
+    """Build payloads totalling roughly `records` raw records (~1/3 duplicates)."""
+    rng = random.Random(seed)
+    payloads = []
+    universe = max(PER_PAYLOAD, int(records * 0.66))
+    generators = [('openalex', openalex_payload), ('s2', s2_payload), ('arxiv', arxiv_payload)]
+    total = 0
+    i = 0
+    while total < records:
+        source, generator = generators[i % 3]
+        ids = [rng.randrange(universe) for _ in range(PER_PAYLOAD)]
+        payloads.append((source, generator(rng, ids)))
+        total += PER_PAYLOAD
+        i += 1
+    return payloads
+
+
+def time_run(payloads, workers, repeat):
+    best = None
+    count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if workers:
+            papers = rank_payloads(payloads, workers=workers, min_records=0)
+        else:
+            papers = rank_payloads(payloads, workers=0)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+        count = len(papers)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the collector CPU stage")
+    parser.add_argument("--records", type=int, default=20000, help="Raw records per run (default: 20000)")
+    parser.add_argument("--workers", type=str, default=None,
+                        help="Comma-separated worker counts (default: 1,2,4,... up to CPU count)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per configuration (default: 3)")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(',')]
+    else:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cpus:
+            worker_counts.append(worker_counts[-1] * 2)
+
+    print("=" * 60)
+    print("CPU Stage Benchmark")
+    print("=" * 60)
+    print(f"CPU count: {cpus}")
+    print(f"Raw records: {args.records}")
+    print()
+
+    payloads = build_payloads(args.records)
+
+    baseline, count = time_run(payloads, 0, args.repeat)
+    print(f"{'mode':<16}{'seconds':>10}{'speedup':>10}{'papers':>10}")
+    print(f"{'in-process':<16}{baseline:>10.3f}{1.0:>10.2f}{count:>10}")
+
+    for workers in worker_counts:
+        # Warm the pool so process start-up is not measured
+        rank_payloads(payloads[:3], workers=workers, min_records=0)
+        elapsed, count = time_run(payloads, workers, args.repeat)
+        print(f"{f'pool x{workers}':<16}{elapsed:>10.3f}{baseline / elapsed:>10.2f}{count:>10}")
+
+    cpu_stage.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark exploration blob writing
+
+Builds a synthetic network (papers with title, authors, year, citation
+count and topics; citation edges between them) and compares:
+
+- in-memory: one dict, json.dumps and gzip.compress (the current
+  compute_exploration_blob design)
+- streaming rows and streaming columnar layouts written with
+  write_exploration_blob to local storage
+
+For each, reports write time, peak Python memory (tracemalloc, the blob
+inputs excluded), compressed size, and the time to decompress and
+json.loads the blob as a client would.
+
+Usage:
+    python scripts/bench_exploration_blob.py [--papers 30000] [--edges 600000]
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.exploration_blob import LocalBlobStorage, decompress, write_exploration_blob
+
+
+def _network(papers: int, edges: int, rng: np.random.Generator):
+    rows = [
+        {
+            'id': f'W{n}',
+            'title': f'Synthetic paper {n} on topic {n % 300}',
+            'authors': [f'Author {a}' for a in rng.integers(0, papers // 3, size=3).tolist()],
+            'year': int(2000 + n % 25),
+            'citations': int(rng.zipf(2.0)),
+            'topics': [f'T{t}' for t in rng.integers(10000, 14500, size=2).tolist()]
+        }
+        for n in range(papers)
+    ]
+    citing = rng.integers(0, papers, size=edges)
+    cited = (citing * rng.random(edges)).astype(np.int64)
+    pairs = [(f'W{s}', f'W{t}') for s, t in zip(citing.tolist(), cited.tolist()) if s != t]
+    return rows, pairs
+
+
+def _measure(fn):
+    # Timed without tracemalloc, which slows allocation-heavy code
+    started = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def _parse_seconds(data: bytes) -> float:
+    started = time.perf_counter()
+    json.loads(decompress(data))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark exploration blob writing')
+    parser.add_argument('--papers', type=int, default=30000)
+    parser.add_argument('--edges', type=int, default=600000)
+    args = parser.parse_args()
+
+    papers, edges = _network(args.papers, args.edges, np.random.default_rng(0))
+    print(f'{len(papers):,} papers, {len(edges):,} edges\n')
+    print(f'{"method":>18}  {"write s":>8}  {"peak MB":>8}  {"size MB":>8}  {"parse s":>8}')
+
+    def in_memory():
+        graph = {
+            'metadata': {'network_id': 'net1', 'version_id': 'v1'},
+            'papers': papers,
+            'citations': [{'source': s, 'target': t, 'type': 'cites'} for s, t in edges],
+            'authors': [],
+            'clusters': []
+        }
+        return gzip.compress(json.dumps(graph).encode('utf-8'))
+
+    data, seconds, peak = _measure(in_memory)
+    print(f'{"in-memory":>18}  {seconds:>8.2f}  {peak / 1e6:>8.1f}  {len(data) / 1e6:>8.2f}  {_parse_seconds(data):>8.2f}')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalBlobStorage(tmp)
+        for layout in ('rows', 'columnar'):
+            result, seconds, peak = _measure(lambda: write_exploration_blob(
+                storage, 'net1', layout, iter(papers), iter(edges), layout=layout, compression='gzip'
+            ))
+            data = storage.read(result['name'])
+            print(f'{"streaming " + layout:>18}  {seconds:>8.2f}  {peak / 1e6:>8.1f}  '
+                  f'{len(data) / 1e6:>8.2f}  {_parse_seconds(data):>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
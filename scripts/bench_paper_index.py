@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local paper index
+
+Builds a PaperIndex over synthetic papers (Zipf-distributed vocabulary,
+so common words match many papers) and measures bulk indexing time and
+search latency for one- and two-word queries, with and without a
+days_back filter. Query words skip the most frequent ranks, which stand
+in for the function words the index drops from queries.
+
+Usage:
+    python scripts/bench_paper_index.py [--papers 50000] [--queries 2000]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.paper_index import PaperIndex
+
+VOCABULARY = 20000
+
+# Ranks standing in for function words (never queried)
+FUNCTION_WORDS = 20
+
+
+def _word(rng: random.Random, min_rank: int = 1) -> str:
+    rank = 0
+    while rank < min_rank:
+        rank = min(int(rng.paretovariate(1.1)), VOCABULARY)
+    return f'w{rank}'
+
+
+def _query_word(rng: random.Random) -> str:
+    return _word(rng, FUNCTION_WORDS + 1)
+
+
+def _papers(count: int, rng: random.Random):
+    today = datetime.utcnow()
+    for i in range(count):
+        yield {
+            'paperId': f'W{i}',
+            'title': ' '.join(_word(rng) for _ in range(10)),
+            'abstract': ' '.join(_word(rng) for _ in range(150)),
+            'authors': [f'Author {rng.randrange(count)}' for _ in range(4)],
+            'venue': f'Venue {rng.randrange(500)}',
+            'date': (today - timedelta(days=rng.randrange(365))).strftime('%Y-%m-%d'),
+            'score': rng.random(),
+            'updatedAt': today.isoformat() + 'Z'
+        }
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return {
+        'p50': statistics.median(samples),
+        'p95': samples[int(len(samples) * 0.95)],
+        'max': samples[-1]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the local paper index')
+    parser.add_argument('--papers', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = PaperIndex(str(Path(tmp) / 'papers.sqlite'))
+
+        started = time.perf_counter()
+        batch = []
+        for paper in _papers(args.papers, rng):
+            batch.append(paper)
+            if len(batch) == 1000:
+                index.upsert(batch)
+                batch = []
+        index.upsert(batch)
+        print(f'Indexed {len(index)} papers in {time.perf_counter() - started:.1f}s')
+
+        cases = [
+            ('1 word', lambda: _query_word(rng), None),
+            ('2 words', lambda: f'{_query_word(rng)} {_query_word(rng)}', None),
+            ('2 words, 7 days', lambda: f'{_query_word(rng)} {_query_word(rng)}', 7)
+        ]
+        for name, make_query, days_back in cases:
+            latencies = []
+            for _ in range(args.queries):
+                query = make_query()
+                started = time.perf_counter()
+                index.search(query, days_back=days_back, limit=20)
+                latencies.append((time.perf_counter() - started) * 1000)
+            stats = _percentiles(latencies)
+            print(f'{name:>16}: p50 {stats["p50"]:.2f} ms  p95 {stats["p95"]:.2f} ms  max {stats["max"]:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark paper vectors and the related-papers index
+
+1. Embedding pipeline: fits PaperVectorizer on synthetic title + abstract
+   texts (topic-clustered Zipf vocabulary) and measures fit time and
+   transform throughput.
+2. Nearest-neighbor index: at each corpus size, writes synthetic clustered
+   unit vectors to a memory-mapped VectorStore, trains an IVFIndex and
+   compares IVF queries at several nprobe values against exact brute force
+   (recall@10 and latency).
+
+Vectors for the index benchmark are generated directly rather than
+embedded, so 1M papers run in minutes.
+
+Usage:
+    python scripts/bench_paper_vectors.py [--texts 20000] [--sizes 100000,1000000] [--queries 200]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.paper_vectors import VECTOR_DIM, IVFIndex, PaperVectorizer, VectorStore
+
+TOPICS = 200
+WORDS_PER_TOPIC = 200
+CLUSTERS = 2000
+K = 10
+
+
+def _texts(count: int, rng: random.Random):
+    for _ in range(count):
+        topic = rng.randrange(TOPICS)
+        words = []
+        for _ in range(170):
+            # Mostly topic words, some shared across topics
+            pool = topic if rng.random() < 0.7 else rng.randrange(TOPICS)
+            words.append(f't{pool}w{min(int(rng.paretovariate(1.2)), WORDS_PER_TOPIC)}')
+        yield ' '.join(words)
+
+
+def _clustered_vectors(n: int, dim: int, rng: np.random.Generator, block: int = 100000):
+    centers = rng.normal(size=(CLUSTERS, dim)).astype(np.float32)
+    for start in range(0, n, block):
+        size = min(block, n - start)
+        vectors = centers[rng.integers(CLUSTERS, size=size)] + rng.normal(scale=1.0, size=(size, dim)).astype(np.float32)
+        yield vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _ms(samples):
+    samples = sorted(samples)
+    return f'p50 {statistics.median(samples):.2f} ms  p95 {samples[int(len(samples) * 0.95)]:.2f} ms'
+
+
+def bench_embedding(count: int) -> None:
+    rng = random.Random(0)
+    texts = list(_texts(count, rng))
+
+    started = time.perf_counter()
+    vectorizer = PaperVectorizer.fit(texts)
+    fit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    vectorizer.transform(texts)
+    transform_seconds = time.perf_counter() - started
+    print(f'Embedding: fit {count} papers in {fit_seconds:.1f}s, '
+          f'transform {count / transform_seconds:,.0f} papers/s')
+
+
+def bench_index(n: int, queries: int, nprobes) -> None:
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VectorStore(tmp, VECTOR_DIM)
+        started = time.perf_counter()
+        offset = 0
+        for block in _clustered_vectors(n, VECTOR_DIM, rng):
+            store.put([f'W{offset + i}' for i in range(len(block))], block)
+            offset += len(block)
+        write_seconds = time.perf_counter() - started
+
+        vectors = store.vectors
+        started = time.perf_counter()
+        index = IVFIndex.train(vectors)
+        train_seconds = time.perf_counter() - started
+        print(f'\n{n:,} papers: stored in {write_seconds:.1f}s, '
+              f'IVF ({len(index.centroids)} lists) trained + assigned in {train_seconds:.1f}s')
+
+        query_rows = rng.choice(n, size=queries, replace=False)
+        exact, latencies = {}, []
+        for row in query_rows:
+            started = time.perf_counter()
+            scores = np.asarray(vectors) @ vectors[row]
+            scores[row] = -np.inf
+            exact[row] = set(np.argpartition(-scores, K)[:K].tolist())
+            latencies.append((time.perf_counter() - started) * 1000)
+        print(f'  brute force:  recall 1.000  {_ms(latencies)}')
+
+        for nprobe in nprobes:
+            hits, latencies = 0, []
+            for row in query_rows:
+                started = time.perf_counter()
+                rows, _ = index.search(vectors, np.asarray(vectors[row]), K, nprobe=nprobe, exclude=row)
+                latencies.append((time.perf_counter() - started) * 1000)
+                hits += len(exact[row] & set(rows.tolist()))
+            print(f'  nprobe {nprobe:>4}:  recall {hits / (K * queries):.3f}  {_ms(latencies)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark paper vectors and the related-papers index')
+    parser.add_argument('--texts', type=int, default=20000)
+    parser.add_argument('--sizes', type=str, default='100000,1000000')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--nprobe', type=str, default='4,8,16,32,64')
+    args = parser.parse_args()
+
+    bench_embedding(args.texts)
+    nprobes = [int(v) for v in args.nprobe.split(',')]
+    for size in (int(v) for v in args.sizes.split(',')):
+        bench_index(size, args.queries, nprobes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the related-topics index
+
+Builds the TF-IDF neighbor index over synthetic topics (words drawn from
+a Zipf-distributed vocabulary, like real topic text) and compares the
+one-off build cost per catalog version with scoring every topic against
+the requested one on each request (the naive alternative).
+
+Usage:
+    python scripts/bench_related_topics.py [--topics 1500,5000,20000] [--queries 200]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.topic_similarity import RelatedTopicsIndex, build_tfidf_matrix
+
+from bench_topics_catalog import build_topics
+
+
+VOCABULARY_SIZE = 8000
+
+
+def build_text_topics(count, seed=5):
+    """Synthetic topics whose names, keywords and descriptions share a Zipf vocabulary."""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(VOCABULARY_SIZE)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+
+    def words(k):
+        return " ".join(rng.choices(vocabulary, weights, k=k))
+
+    topics = build_topics(count)
+    for topic in topics:
+        topic["display_name"] = words(4)
+        topic["keywords"] = [words(2) for _ in range(10)]
+        topic["description"] = words(45)
+    return topics
+
+
+def naive_related(matrix, row, limit=10):
+    """Score one topic against all others on demand."""
+    scores = (matrix @ matrix[row].T).toarray().ravel()
+    scores[row] = -1.0
+    return scores.argsort()[::-1][:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the related-topics index")
+    parser.add_argument("--topics", type=str, default="1500,5000,20000",
+                        help="Comma-separated catalog sizes (default: 1500,5000,20000)")
+    parser.add_argument("--queries", type=int, default=200, help="Lookups timed per size (default: 200)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Related Topics Benchmark")
+    print("=" * 60)
+    print(f"{'topics':>8}{'build s':>10}{'lookup us':>11}{'naive ms':>10}{'break-even':>12}")
+
+    for count in [int(c) for c in args.topics.split(",")]:
+        topics = build_text_topics(count)
+        rng = random.Random(3)
+        ids = [topics[rng.randrange(count)]["id"] for _ in range(args.queries)]
+
+        started = time.perf_counter()
+        index = RelatedTopicsIndex(topics)
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for topic_id in ids:
+            index.related(topic_id)
+        lookup_us = (time.perf_counter() - started) / args.queries * 1e6
+
+        # Naive cost excludes vectorizing, which a per-request approach would also pay
+        matrix = build_tfidf_matrix(topics)
+        rows = [rng.randrange(count) for _ in range(args.queries)]
+        started = time.perf_counter()
+        for row in rows:
+            naive_related(matrix, row)
+        naive_ms = (time.perf_counter() - started) / args.queries * 1000
+
+        print(f"{count:>8}{build_seconds:>10.2f}{lookup_us:>11.1f}{naive_ms:>10.2f}"
+              f"{build_seconds * 1000 / naive_ms:>12.0f}")
+
+    print("\nbreak-even: requests per catalog version after which the precomputed index is cheaper.")
+
+
+if __name__ == "__main__":
+    main()
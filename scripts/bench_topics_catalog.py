@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark the topics catalog: Python dicts vs memory-mapped file
+
+Generates synthetic topics in the OpenAlexTopicsService format and, in a
+fresh subprocess per mode, measures start-up time, resident memory and
+lookup latency for:
+
+    dict   TopicsCatalog built from decoded JSON (what each worker holds
+           after loading the catalog from Firestore)
+    mmap   MmapTopicsCatalog over the compact file from write_catalog_file
+
+Memory is reported from /proc/self/status: RssAnon is private to the
+worker, RssFile is backed by the page cache and shared by every worker
+that maps the same file. A second table shows memory after the first
+search and related-topics requests, which build those indexes.
+
+Usage:
+    python scripts/bench_topics_catalog.py [--topics 1500,20000] [--lookups 20000]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.topics_mmap import write_catalog_file
+
+WORDS = (
+    "memory attention cognition learning network model behavior social "
+    "neural working emotion perception language development clinical study "
+    "effect response task control analysis adult child brain data evidence"
+).split()
+
+
+def build_topics(count, seed=7):
+    """Synthetic topics with a realistic shape (26 fields, ~250 subfields)."""
+    rng = random.Random(seed)
+    topics = []
+    for n in range(count):
+        field = n % 26
+        subfield = field * 10 + rng.randrange(10)
+        topics.append({
+            "id": f"T{10000 + n}",
+            "openalex_id": f"https://openalex.org/T{10000 + n}",
+            "display_name": " ".join(rng.choice(WORDS).title() for _ in range(4)),
+            "description": " ".join(rng.choice(WORDS) for _ in range(45)),
+            "keywords": [" ".join(rng.sample(WORDS, 2)) for _ in range(10)],
+            "works_count": rng.randint(100, 200000),
+            "cited_by_count": rng.randint(100, 2000000),
+            "domain": {"id": str(field % 4 + 1), "display_name": f"Domain {field % 4 + 1}"},
+            "field": {"id": str(field), "display_name": f"Field {field}"},
+            "subfield": {"id": str(subfield), "display_name": f"Subfield {subfield}"},
+            "updated_date": "2025-11-01T00:00:00.000000"
+        })
+    return topics
+
+
+def _memory_kb():
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def run_child(mode, path, lookups):
+    """Measure one mode in this (fresh) process and print a JSON result."""
+    from app.services.topics_catalog import TopicsCatalog
+    from app.services.topics_mmap import MmapTopicsCatalog
+
+    before = _memory_kb()
+    started = time.perf_counter()
+    if mode == "dict":
+        with open(path) as f:
+            catalog = TopicsCatalog(json.load(f), version=1)
+    else:
+        catalog = MmapTopicsCatalog(path)
+    load_seconds = time.perf_counter() - started
+
+    count = len(catalog.topics) if mode == "dict" else len(catalog)
+    rng = random.Random(1)
+    ids = [f"T{10000 + rng.randrange(count)}" for _ in range(lookups)]
+
+    started = time.perf_counter()
+    for topic_id in ids:
+        catalog.get_topic(topic_id)
+    lookup_us = (time.perf_counter() - started) / lookups * 1e6
+
+    started = time.perf_counter()
+    for field in range(26):
+        catalog.get_topics(f"Field {field}")
+    field_ms = (time.perf_counter() - started) / 26 * 1000
+
+    after = _memory_kb()
+
+    # First search and related-topics requests build both indexes
+    started = time.perf_counter()
+    catalog.search_index.search("working memory", limit=20)
+    catalog.related_index.related(ids[0], limit=10)
+    index_seconds = time.perf_counter() - started
+    indexed = _memory_kb()
+
+    print(json.dumps({
+        "load_ms": load_seconds * 1000,
+        "lookup_us": lookup_us,
+        "field_ms": field_ms,
+        "anon_kb": after["RssAnon"] - before["RssAnon"],
+        "file_kb": after["RssFile"] - before["RssFile"],
+        "index_ms": index_seconds * 1000,
+        "indexed_anon_kb": indexed["RssAnon"] - before["RssAnon"],
+        "indexed_file_kb": indexed["RssFile"] - before["RssFile"]
+    }))
+
+
+def measure(mode, path, lookups):
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", mode, "--path", path, "--lookups", str(lookups)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dict vs mmap topics catalog")
+    parser.add_argument("--topics", type=str, default="1500,20000",
+                        help="Comma-separated catalog sizes (default: 1500,20000)")
+    parser.add_argument("--lookups", type=int, default=20000, help="Random ID lookups (default: 20000)")
+    parser.add_argument("--child", type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.path, args.lookups)
+        return
+
+    print("=" * 60)
+    print("Topics Catalog Benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in [int(c) for c in args.topics.split(",")]:
+            topics = build_topics(count)
+            json_path = os.path.join(tmp, f"topics-{count}.json")
+            bin_path = os.path.join(tmp, f"topics-{count}.bin")
+            with open(json_path, "w") as f:
+                json.dump(topics, f)
+            size = write_catalog_file(topics, bin_path, version=1)
+
+            print(f"\n{count} topics (JSON {os.path.getsize(json_path) // 1024} KB, "
+                  f"catalog file {size // 1024} KB)")
+            print(f"{'mode':<8}{'load ms':>10}{'lookup us':>11}{'field ms':>10}"
+                  f"{'private KB':>12}{'shared KB':>11}")
+            results = {}
+            for mode, path in (("dict", json_path), ("mmap", bin_path)):
+                result = results[mode] = measure(mode, path, args.lookups)
+                print(f"{mode:<8}{result['load_ms']:>10.2f}{result['lookup_us']:>11.2f}"
+                      f"{result['field_ms']:>10.3f}{result['anon_kb']:>12}{result['file_kb']:>11}")
+
+            print("after first search + related request:")
+            print(f"{'mode':<8}{'index ms':>10}{'private KB':>12}{'shared KB':>11}")
+            for mode, result in results.items():
+                print(f"{mode:<8}{result['index_ms']:>10.1f}"
+                      f"{result['indexed_anon_kb']:>12}{result['indexed_file_kb']:>11}")
+
+    print("\nprivate KB is paid by every worker; shared KB is paid once per host.")
+    print("Search and related-topics indexes are built per worker in both modes.")
+
+
+if __name__ == "__main__":
+    main()
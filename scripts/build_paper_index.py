@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Build the Local Paper Index from Firestore
+
+Syncs a SQLite FTS5 paper index from the Firestore papers collection. A
+new file reads the whole collection; an existing one only reads papers
+changed since its last sync. Run it before building the API image so
+instances start with a synced index instead of reading the collection in
+the web process (see docs/DEPLOYMENT.md).
+
+Usage:
+    python scripts/build_paper_index.py [--path data/papers.sqlite]
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+from app.services.paper_index import PAPER_INDEX_PATH, PaperIndex
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(
+        description="Build the local paper index from the Firestore papers collection"
+    )
+    parser.add_argument(
+        "--path",
+        type=str,
+        default=PAPER_INDEX_PATH,
+        help=f"SQLite file (default: PAPER_INDEX_PATH, {PAPER_INDEX_PATH})"
+    )
+    args = parser.parse_args()
+
+    try:
+        firebase_admin.get_app()
+    except ValueError:
+        cred_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "./serviceAccountKey.json")
+        if not os.path.exists(cred_path):
+            print(f"❌ Error: Service account key not found at {cred_path}")
+            print("Set GOOGLE_APPLICATION_CREDENTIALS environment variable")
+            sys.exit(1)
+        firebase_admin.initialize_app(credentials.Certificate(cred_path))
+
+    db = firestore.client()
+
+    print(f"Syncing paper index {args.path}...")
+    started = time.perf_counter()
+    index = PaperIndex(args.path)
+    count = index.sync_from_firestore(db)
+    print(f"✅ Indexed {count} papers in {time.perf_counter() - started:.1f}s ({len(index)} total)")
+    print(f"   Synced up to updatedAt {index.get_meta('synced_updated_at')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Build Paper Vectors from Firestore
+
+Embeds every paper in the Firestore papers collection and trains the
+related-papers index, writing a build under the given directory. Run it
+before building the API image so instances start with a build instead of
+making one in the web process (see docs/DEPLOYMENT.md).
+
+Usage:
+    python scripts/build_paper_vectors.py [--dir data/paper-vectors]
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+from app.services.paper_vectors import PAPER_VECTORS_DIR, PaperVectors
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(
+        description="Build paper vectors from the Firestore papers collection"
+    )
+    parser.add_argument(
+        "--dir",
+        type=str,
+        default=PAPER_VECTORS_DIR,
+        help=f"Output directory (default: PAPER_VECTORS_DIR, {PAPER_VECTORS_DIR})"
+    )
+    args = parser.parse_args()
+
+    try:
+        firebase_admin.get_app()
+    except ValueError:
+        cred_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "./serviceAccountKey.json")
+        if not os.path.exists(cred_path):
+            print(f"❌ Error: Service account key not found at {cred_path}")
+            print("Set GOOGLE_APPLICATION_CREDENTIALS environment variable")
+            sys.exit(1)
+        firebase_admin.initialize_app(credentials.Certificate(cred_path))
+
+    db = firestore.client()
+
+    print(f"Building paper vectors in {args.dir}...")
+    started = time.perf_counter()
+    vectors = PaperVectors(args.dir)
+    count = vectors.build_from_firestore(db)
+    print(f"✅ Embedded {count} papers in {time.perf_counter() - started:.1f}s")
+    print(f"   Build: {vectors.build_path}")
+    print(f"   Synced up to updatedAt {vectors.meta.get('syncedUpdatedAt')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,20 @@ Fetch OpenAlex Topics and Cache in Firestore
 This script fetches all psychology-related topics from OpenAlex
 and caches them in Firestore for the Enhanced Discovery feature.
 
+Only topics whose content changed since the last run are written.
+With --incremental (or --since) only topics updated in OpenAlex since
+the last sync (or the given date) are fetched.
+
 Usage:
     python scripts/fetch_openalex_topics.py [--max-results 1000] [--field Psychology]
+    python scripts/fetch_openalex_topics.py --incremental
+    python scripts/fetch_openalex_topics.py --since 2025-01-01 --domains 1,2
 """
 
 import os
 import sys
 import argparse
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Add parent directory to path
@@ -31,7 +38,29 @@ def main():
         "--max-results",
         type=int,
         default=1000,
-        help="Maximum number of topics to fetch (default: 1000)"
+        help="Maximum number of topics to fetch per domain (default: 1000)"
+    )
+    parser.add_argument(
+        "--domains",
+        type=str,
+        default="2",
+        help="Comma-separated OpenAlex domain IDs, fetched concurrently (default: 2)"
+    )
+    parser.add_argument(
+        "--since",
+        type=str,
+        default=None,
+        help="Only fetch topics updated on or after this date (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch topics updated since the last recorded sync"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rewrite every fetched topic, ignoring stored content hashes"
     )
     parser.add_argument(
         "--field",
@@ -46,12 +75,16 @@ def main():
     )
 
     args = parser.parse_args()
+    domain_ids = [d.strip() for d in args.domains.split(",") if d.strip()]
+    sync_date = datetime.now(timezone.utc).date().isoformat()
 
     print("=" * 60)
     print("OpenAlex Topics Fetcher")
     print("=" * 60)
-    print(f"Max results: {args.max_results}")
+    print(f"Max results: {args.max_results} per domain")
+    print(f"Domains: {', '.join(domain_ids)}")
     print(f"Field filter: {args.field or 'None (all Social Sciences)'}")
+    print(f"Updated since: {args.since or ('last sync' if args.incremental else 'any time')}")
     print(f"Dry run: {args.dry_run}")
     print("=" * 60)
     print()
@@ -84,9 +117,23 @@ def main():
     print("\n" + "=" * 60)
     print("STEP 1: Fetching topics from OpenAlex API")
     print("=" * 60)
-    topics = topics_service.fetch_psychology_topics(max_results=args.max_results)
+    since = args.since
+    if args.incremental and not since:
+        since = topics_service.get_last_sync_date()
+        print(f"Last sync: {since or 'never (fetching everything)'}")
+
+    topics = topics_service.fetch_topics(
+        domain_ids=domain_ids,
+        since=since,
+        max_results=args.max_results
+    )
 
     if not topics:
+        if since:
+            print("✅ No topics updated since last sync. Nothing to do.")
+            if not args.dry_run:
+                topics_service.record_sync(sync_date)
+            sys.exit(0)
         print("❌ No topics fetched. Exiting.")
         sys.exit(1)
 
@@ -118,9 +165,11 @@ def main():
         print("\n" + "=" * 60)
         print("STEP 2: Caching topics in Firestore")
         print("=" * 60)
-        cached_count = topics_service.cache_topics_in_firestore(topics)
+        cached_count = topics_service.cache_topics_in_firestore(topics, force=args.force)
+        topics_service.record_sync(sync_date)
 
-        print(f"\n✅ Successfully cached {cached_count} topics in Firestore")
+        print(f"\n✅ Wrote {cached_count} changed topics to Firestore "
+              f"({len(topics) - cached_count} unchanged)")
     else:
         print("\n⏭️  Dry run mode - skipping Firestore caching")
 
@@ -154,7 +203,7 @@ def main():
     print("=" * 60)
     print(f"✅ Fetched: {len(topics)} topics")
     if not args.dry_run:
-        print(f"✅ Cached: {cached_count} topics in Firestore")
+        print(f"✅ Written: {cached_count} changed topics in Firestore")
     print(f"✅ Domains: {len(domains)}")
     print("\nTopics are now ready for the Enhanced Discovery API!")
     print("\nNext steps:")
@@ -0,0 +1,67 @@
+"""
+Auth Unit Tests
+
+Tests the verified-token cache used by @login_required.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.utils import auth as auth_utils
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    auth_utils.clear_token_cache()
+    yield
+    auth_utils.clear_token_cache()
+
+
+def _claims(uid, expires_in=3600):
+    return {'uid': uid, 'exp': time.time() + expires_in}
+
+
+@pytest.mark.unit
+class TestTokenCache:
+    """Test reuse of verified token claims"""
+
+    def test_repeat_token_verified_once(self):
+        with patch.object(auth_utils.auth, 'verify_id_token', return_value=_claims('u1')) as verify:
+            first = auth_utils.verify_token('token-a')
+            second = auth_utils.verify_token('token-a')
+
+        assert first is second
+        assert verify.call_count == 1
+
+    def test_tokens_cached_separately_by_hash(self):
+        with patch.object(auth_utils.auth, 'verify_id_token', side_effect=[_claims('u1'), _claims('u2')]):
+            assert auth_utils.verify_token('token-a')['uid'] == 'u1'
+            assert auth_utils.verify_token('token-b')['uid'] == 'u2'
+
+        assert 'token-a' not in auth_utils._token_cache._entries
+
+    def test_expired_token_not_cached(self):
+        with patch.object(auth_utils.auth, 'verify_id_token', return_value=_claims('u1', expires_in=-1)) as verify:
+            auth_utils.verify_token('token-a')
+            auth_utils.verify_token('token-a')
+
+        assert verify.call_count == 2
+
+    def test_failures_not_cached(self):
+        error = auth_utils.auth.InvalidIdTokenError('bad signature')
+        with patch.object(auth_utils.auth, 'verify_id_token', side_effect=[error, _claims('u1')]):
+            with pytest.raises(auth_utils.auth.InvalidIdTokenError):
+                auth_utils.verify_token('token-a')
+            assert auth_utils.verify_token('token-a')['uid'] == 'u1'
+
+    def test_revocation_check_bounds_cache_lifetime(self):
+        with patch.object(auth_utils, 'AUTH_CHECK_REVOKED', True), \
+                patch.object(auth_utils, 'AUTH_REVOCATION_TTL', 0), \
+                patch.object(auth_utils.auth, 'verify_id_token', return_value=_claims('u1')) as verify:
+            auth_utils.verify_token('token-a')
+            auth_utils.verify_token('token-a')
+
+        assert verify.call_count == 2
+        assert verify.call_args[1] == {'check_revoked': True}
@@ -0,0 +1,49 @@
+"""
+Cache Utility Unit Tests
+
+Tests the in-process LRU + TTL cache.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.utils.cache import TTLCache
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    """Test LRU eviction and expiry"""
+
+    def test_get_and_set(self):
+        cache = TTLCache(maxsize=4, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing", "default") == "default"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert len(cache) == 2
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=4, ttl_seconds=10)
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+            cache.set("b", 2, ttl_seconds=60)
+        with patch("app.utils.cache.time.monotonic", return_value=130.0):
+            assert cache.get("a") is None
+            value, age = cache.get_entry("b")
+
+        assert value == 2
+        assert age == 30.0
+        assert len(cache) == 1
@@ -0,0 +1,129 @@
+"""
+Citation Edge Unit Tests
+
+Tests OpenAlex reference capture, the deduplicated edge log and its
+compaction into a citation graph file.
+"""
+
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.citation_edges import CitationEdgeLog, take_references
+from app.services.citation_graph import CitationGraph
+from app.services.openalex import OpenAlexClient
+
+
+def _work(n, references):
+    return {
+        'id': f'https://openalex.org/W{n}',
+        'title': f'Paper {n}',
+        'authorships': [],
+        'publication_year': 2025,
+        'cited_by_count': 0,
+        'referenced_works': [f'https://openalex.org/W{r}' for r in references]
+    }
+
+
+@pytest.mark.unit
+class TestReferenceCapture:
+    """Test capturing referenced_works from OpenAlex"""
+
+    def test_normalize_keeps_reference_ids_when_enabled(self):
+        paper = OpenAlexClient(capture_references=True)._normalize_paper(_work(1, [2, 3]))
+
+        assert paper['openalexId'] == 'W1'
+        assert paper['references'] == ['W2', 'W3']
+
+    def test_normalize_drops_references_by_default(self):
+        paper = OpenAlexClient()._normalize_paper(_work(1, [2, 3]))
+
+        assert 'references' not in paper
+        assert 'openalexId' not in paper
+
+    def test_only_collector_ranking_keeps_references(self):
+        from app.services.collector import rank_payloads
+
+        shared = rank_payloads([('openalex', [_work(1, [2, 3])])])
+        collected = rank_payloads([('openalex', [_work(1, [2, 3])])], capture_references=True)
+
+        assert 'references' not in shared[0]
+        assert collected[0]['references'] == ['W2', 'W3']
+
+    def test_take_references_strips_papers(self):
+        papers = [
+            {'paperId': 'a', 'openalexId': 'W1', 'references': ['W2', 'W1', 'W3']},
+            {'paperId': 'b', 'references': ['W4']},
+            {'paperId': 'c'}
+        ]
+
+        assert take_references(papers) == [('W1', 'W2'), ('W1', 'W3')]
+        assert all('references' not in paper for paper in papers)
+        assert papers[0]['openalexId'] == 'W1'
+
+    def test_runner_appends_edges_without_storing_references(self):
+        from app.services.collection_runner import CollectionRunner
+
+        edges = MagicMock()
+        runner = CollectionRunner(MagicMock(), MagicMock(), 'topic', MagicMock(), citation_edges=edges)
+        papers = [{'paperId': 'a', 'openalexId': 'W1', 'references': ['W2']}]
+
+        runner._write_user_results('run-1', '2025-11-01T00:00:00Z', 'u1', papers, None)
+
+        edges.append.assert_called_once_with([('W1', 'W2')])
+        assert 'references' not in papers[0]
+
+
+@pytest.mark.unit
+class TestCitationEdgeLog:
+    """Test the append-only edge log and compaction"""
+
+    def test_append_skips_duplicates_and_survives_reopen(self, tmp_path):
+        log = CitationEdgeLog(str(tmp_path))
+
+        assert log.append([('W1', 'W2'), ('W1', 'W2'), ('W1', 'W1')]) == 1
+        assert log.append([('W1', 'W2'), ('W2', 'W3')]) == 1
+
+        reopened = CitationEdgeLog(str(tmp_path))
+        assert reopened.pending == 2
+        assert reopened.append([('W2', 'W3')]) == 0
+
+    def test_compact_writes_graph_and_clears_log(self, tmp_path):
+        log = CitationEdgeLog(str(tmp_path))
+        log.append([('W1', 'W2'), ('W1', 'W3'), ('W2', 'W3')])
+
+        assert log.compact() == 3
+        assert log.pending == 0
+        assert not os.path.exists(log.log_path)
+
+        graph = CitationGraph.load(log.graph_path)
+        assert graph.references('W1') == ['W2', 'W3']
+        assert graph.citations('W3') == ['W1', 'W2']
+
+    def test_compaction_merges_with_existing_graph(self, tmp_path):
+        log = CitationEdgeLog(str(tmp_path))
+        log.append([('W1', 'W2')])
+        log.compact()
+
+        # Edges already in the graph are not logged again
+        assert log.append([('W1', 'W2'), ('W3', 'W1')]) == 1
+        assert log.compact() == 2
+
+        graph = CitationEdgeLog(str(tmp_path)).graph
+        assert graph.expand(['W3'], depth=2, direction='cites') == {'W3': 0, 'W1': 1, 'W2': 2}
+
+    def test_append_compacts_at_threshold(self, tmp_path):
+        log = CitationEdgeLog(str(tmp_path), compact_edges=3)
+        log.append([('W1', 'W2'), ('W1', 'W3')])
+        assert log.graph is None
+
+        log.append([('W2', 'W3')])
+        assert log.pending == 0
+        assert log.graph.edge_count == 3
+
+    def test_torn_log_line_is_skipped(self, tmp_path):
+        (tmp_path / 'edges.log').write_text('W1\tW2\nW3\t')
+
+        log = CitationEdgeLog(str(tmp_path))
+        assert log.pending == 1
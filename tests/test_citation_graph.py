@@ -0,0 +1,85 @@
+"""
+Citation Graph Unit Tests
+
+Tests the CSR citation graph, multi-source k-hop expansion and the
+memory-mappable file format.
+"""
+
+import numpy as np
+import pytest
+
+from app.services.citation_graph import CitationGraph, expand_citations
+
+
+# A cites B and C, B cites D, C cites D, D cites E, F cites A
+EDGES = [('A', 'B'), ('A', 'C'), ('B', 'D'), ('C', 'D'), ('D', 'E'), ('F', 'A')]
+
+
+@pytest.fixture
+def graph():
+    return CitationGraph.from_edges(EDGES)
+
+
+@pytest.mark.unit
+class TestCitationGraph:
+    """Test building and expanding the citation graph"""
+
+    def test_build_drops_duplicates_and_self_citations(self):
+        graph = CitationGraph.from_edges(EDGES + [('A', 'B'), ('E', 'E')])
+
+        assert graph.node_count == 6
+        assert graph.edge_count == 6
+        assert graph.references('A') == ['B', 'C']
+        assert graph.citations('D') == ['B', 'C']
+        assert graph.out_targets.dtype == np.int32
+
+    def test_expand_both_directions(self, graph):
+        assert expand_citations(graph, ['B'], depth=1) == {'B': 0, 'A': 1, 'D': 1}
+        assert expand_citations(graph, ['B'], depth=2) == {'B': 0, 'A': 1, 'D': 1, 'C': 2, 'E': 2, 'F': 2}
+
+    def test_expand_one_direction(self, graph):
+        assert graph.expand(['A'], depth=5, direction='cites') == {'A': 0, 'B': 1, 'C': 1, 'D': 2, 'E': 3}
+        assert graph.expand(['D'], depth=5, direction='cited_by') == {'D': 0, 'B': 1, 'C': 1, 'A': 2, 'F': 3}
+
+    def test_multi_source_uses_nearest_seed(self, graph):
+        hops = graph.expand(['A', 'E'], depth=1, direction='cites')
+        assert hops == {'A': 0, 'E': 0, 'B': 1, 'C': 1}
+
+        hops = graph.expand(['A', 'E'], depth=2)
+        assert hops['D'] == 1
+
+    def test_exclusions_are_not_traversed(self, graph):
+        hops = graph.expand(['A'], depth=3, direction='cites', exclude=['B', 'C'])
+        assert hops == {'A': 0}
+
+    def test_max_nodes_truncates(self, graph):
+        hops = graph.expand(['A'], depth=5, max_nodes=3)
+        assert len(hops) == 3
+        assert hops['A'] == 0
+
+    def test_unknown_seeds_and_invalid_arguments(self, graph):
+        assert graph.expand(['missing'], depth=2) == {}
+        with pytest.raises(ValueError):
+            graph.expand(['A'], depth=1, direction='sideways')
+        with pytest.raises(ValueError):
+            graph.expand(['A'], depth=-1)
+
+    def test_save_and_memory_map(self, graph, tmp_path):
+        path = str(tmp_path / 'citations.graph')
+        graph.save(path)
+
+        loaded = CitationGraph.load(path)
+        assert loaded.paper_ids == graph.paper_ids
+        assert loaded.edge_count == graph.edge_count
+        assert loaded.expand(['B'], depth=2) == graph.expand(['B'], depth=2)
+        assert CitationGraph.load(path, mmap=False).references('A') == ['B', 'C']
+
+    def test_load_rejects_other_files(self, tmp_path):
+        path = tmp_path / 'not.graph'
+        path.write_bytes(b'{"papers": []}')
+        with pytest.raises(ValueError):
+            CitationGraph.load(str(path))
+
+    def test_edges_within_network(self, graph):
+        edges = list(graph.edges_within(['A', 'B', 'D', 'F', 'missing'], block_size=2))
+        assert sorted(edges) == [('A', 'B'), ('B', 'D'), ('F', 'A')]
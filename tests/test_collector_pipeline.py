@@ -0,0 +1,208 @@
+"""
+Collector Pipeline Unit Tests
+
+Tests parsing, deduplication and ranking of raw source payloads.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services import cpu_stage
+from app.services.collector import fetch_topic_works, rank_payloads, count_records, topic_payload
+from app.services.seeds import canonical_seed, split_seeds
+
+
+def _openalex_work(n, citations=0):
+    return {
+        'id': f'https://openalex.org/W{n}',
+        'doi': f'https://doi.org/10.5555/{n}',
+        'title': f'Paper {n}',
+        'authorships': [{'author': {'display_name': f'Author {n}'}}],
+        'primary_location': {'source': {'display_name': 'Journal'}},
+        'publication_year': 2025,
+        'cited_by_count': citations,
+        'open_access': {'is_oa': False},
+        'abstract_inverted_index': {'hello': [0], 'world': [1]}
+    }
+
+
+def _topic_work(n, topic_ids):
+    work = _openalex_work(n)
+    work['topics'] = [{'id': f'https://openalex.org/{t}'} for t in topic_ids]
+    return work
+
+
+def _s2_paper(n, citations=0):
+    return {
+        'paperId': f's2-{n}',
+        'title': f'Paper {n}',
+        'authors': [{'name': f'Author {n}'}],
+        'year': 2025,
+        'citationCount': citations,
+        'isOpenAccess': True,
+        'openAccessPdf': {'url': f'https://example.org/{n}.pdf'},
+        'externalIds': {'DOI': f'10.5555/{n}'}
+    }
+
+
+def _arxiv_feed(ids):
+    entries = ''.join(
+        f'<entry><id>http://arxiv.org/abs/2511.{n:05d}v1</id><title>Preprint {n}</title>'
+        f'<author><name>Author {n}</name></author><summary>Abstract {n}</summary>'
+        f'<published>2025-11-01T00:00:00Z</published></entry>'
+        for n in ids
+    )
+    return (
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        + entries + '</feed>'
+    ).encode('utf-8')
+
+
+@pytest.fixture
+def payloads():
+    return [
+        ('openalex', [_openalex_work(n, citations=n) for n in range(0, 30)]),
+        ('s2', [_s2_paper(n, citations=2 * n) for n in range(20, 50)]),
+        ('arxiv', _arxiv_feed(range(0, 10))),
+    ]
+
+
+@pytest.mark.unit
+class TestRankPayloads:
+    """Test in-process and process-pool ranking"""
+
+    def test_count_records(self, payloads):
+        assert [count_records(s, p) for s, p in payloads] == [30, 30, 10]
+
+    def test_merges_duplicates_across_sources(self, payloads):
+        papers = rank_payloads(payloads, workers=0)
+        by_id = {p['paperId']: p for p in papers}
+
+        assert len(papers) == 60
+        merged = by_id['doi:10.5555/25']
+        assert merged['provenance']['openalex'] and merged['provenance']['s2']
+        assert merged['citations'] == 50
+        assert merged['oa'] is True
+
+    def test_sorted_by_score(self, payloads):
+        scores = [p['score'] for p in rank_payloads(payloads, workers=0)]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_small_batches_stay_in_process(self):
+        assert not cpu_stage.should_use_pool(100, workers=4, min_records=1000)
+        assert not cpu_stage.should_use_pool(5000, workers=0, min_records=1000)
+        assert cpu_stage.should_use_pool(5000, workers=4, min_records=1000)
+
+    @pytest.mark.slow
+    def test_process_pool_matches_in_process(self, payloads):
+        def strip(papers):
+            return sorted(
+                ({k: v for k, v in p.items() if k != 'updatedAt'} for p in papers),
+                key=lambda p: p['paperId']
+            )
+
+        in_process = rank_payloads(payloads, workers=0)
+        try:
+            pooled = rank_payloads(payloads, workers=2, min_records=0)
+        finally:
+            cpu_stage.shutdown()
+
+        assert strip(pooled) == strip(in_process)
+
+
+@pytest.mark.unit
+class TestClientRegistry:
+    """Test the process-wide shared source clients"""
+
+    def test_clients_are_shared(self):
+        from app.services.clients import get_client, get_clients
+
+        assert get_client('openalex') is get_client('openalex')
+        assert get_clients()['s2'] is get_client('s2')
+
+    def test_sessions_use_pooled_adapter(self):
+        from app.services.clients import get_client, HTTP_POOL_SIZE
+
+        adapter = get_client('arxiv').session.get_adapter('http://export.arxiv.org')
+        assert adapter._pool_maxsize == HTTP_POOL_SIZE
+
+
+@pytest.mark.unit
+class TestTopicSeeds:
+    """Test typed seeds and batched topic collection"""
+
+    def test_canonical_seed(self):
+        assert canonical_seed('  working memory ') == 'working memory'
+        assert canonical_seed({'type': 'query', 'query': 'sleep'}) == 'sleep'
+        assert canonical_seed({'type': 'topic', 'id': 'https://openalex.org/t10312'}) == {
+            'type': 'topic', 'id': 'T10312'
+        }
+        for bad in ('', {'type': 'topic', 'id': 'W123'}, {'type': 'author'}, 42):
+            with pytest.raises(ValueError):
+                canonical_seed(bad)
+
+    def test_split_seeds(self):
+        queries, topic_ids = split_seeds([
+            'sleep', {'type': 'topic', 'id': 'T2'}, 'sleep', {'type': 'topic', 'id': 'T2'}, {'bogus': 1}
+        ])
+
+        assert queries == ['sleep']
+        assert topic_ids == ['T2']
+
+    def test_topics_batched_into_or_filters(self):
+        client = MagicMock()
+        client.fetch_topic_works.return_value = {
+            'results': [_topic_work(1, ['T1', 'T2']), _topic_work(2, ['T2'])],
+            'next_cursor': None,
+            'count': 2
+        }
+        topic_ids = [f'T{n}' for n in range(1, 61)]
+
+        works = fetch_topic_works(topic_ids, client, max_per_topic=5)
+
+        assert client.fetch_topic_works.call_count == 2
+        assert client.fetch_topic_works.call_args_list[0][0][0] == topic_ids[:50]
+        assert client.fetch_topic_works.call_args_list[1][0][0] == topic_ids[50:]
+        assert [w['id'] for w in works['T2']] == ['https://openalex.org/W1', 'https://openalex.org/W2']
+        assert works['T60'] == []
+
+    def test_pages_until_topics_filled(self):
+        client = MagicMock()
+        client.fetch_topic_works.side_effect = [
+            {'results': [_topic_work(1, ['T1']), _topic_work(2, ['T1'])], 'next_cursor': 'c1', 'count': 4},
+            {'results': [_topic_work(3, ['T1', 'T2']), _topic_work(4, ['T2'])], 'next_cursor': 'c2', 'count': 9},
+        ]
+
+        works = fetch_topic_works(['T1', 'T2'], client, max_per_topic=2)
+
+        assert client.fetch_topic_works.call_count == 2
+        assert client.fetch_topic_works.call_args_list[1][1]['cursor'] == 'c1'
+        assert len(works['T1']) == 2
+        assert len(works['T2']) == 2
+
+    def test_topic_payload_dedupes_shared_works(self):
+        shared = _topic_work(1, ['T1', 'T2'])
+        source, works = topic_payload(['T1', 'T2'], {'T1': [shared], 'T2': [shared, _topic_work(2, ['T2'])]})
+
+        assert source == 'openalex'
+        assert len(works) == 2
+        assert len(rank_payloads([(source, works)])) == 2
+
+    def test_runner_shares_topics_across_users(self):
+        from app.services.collection_runner import CollectionRunner, RunProgress
+
+        runner = CollectionRunner(MagicMock(), MagicMock(), 'topic', MagicMock())
+        clients = {'openalex': MagicMock()}
+        clients['openalex'].fetch_topic_works.return_value = {
+            'results': [_topic_work(1, ['T1'])], 'next_cursor': None, 'count': 1
+        }
+        topic_works = {}
+        first = [{'topicIds': ['T1']}, {'topicIds': ['T1', 'T2']}]
+        second = [{'topicIds': ['T2']}]
+
+        runner._fetch_topic_seeds(first, topic_works, clients, {}, RunProgress('run-1'))
+        runner._fetch_topic_seeds(second, topic_works, clients, {}, RunProgress('run-1'))
+
+        assert clients['openalex'].fetch_topic_works.call_count == 1
+        assert set(topic_works) == {'T1', 'T2'}
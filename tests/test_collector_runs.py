@@ -0,0 +1,256 @@
+"""
+Collector Run Unit Tests
+
+Tests checkpointed run state used to resume interrupted collection runs.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.run_state import RunStateStore
+from app.services.scheduler import FairScheduler, summarize_completion
+from app.services.rate_limit import TokenBucket
+
+
+def _doc(doc_id, data):
+    doc = MagicMock()
+    doc.id = doc_id
+    doc.exists = data is not None
+    doc.to_dict.return_value = dict(data) if data is not None else None
+    return doc
+
+
+def _store_with_run(run_data, user_states, max_attempts=3):
+    db = MagicMock()
+    run_ref = db.collection.return_value.document.return_value
+    run_ref.get.return_value = _doc('run-1', run_data)
+    run_ref.collection.return_value.stream.return_value = [
+        _doc(uid, state) for uid, state in user_states.items()
+    ]
+    return RunStateStore(db, max_attempts=max_attempts)
+
+
+@pytest.mark.unit
+class TestRunStateStore:
+    """Test resume decisions and progress summaries"""
+
+    def test_new_user_is_processed(self):
+        store = RunStateStore(MagicMock())
+        assert store.should_process(None)
+
+    def test_done_user_is_skipped(self):
+        store = RunStateStore(MagicMock())
+        assert not store.should_process({'status': 'done', 'attempts': 1})
+
+    def test_failed_user_retried_until_cap(self):
+        store = RunStateStore(MagicMock(), max_attempts=2)
+        assert store.should_process({'status': 'failed', 'attempts': 1})
+        assert not store.should_process({'status': 'failed', 'attempts': 2})
+
+    def test_interrupted_user_is_retried(self):
+        store = RunStateStore(MagicMock())
+        assert store.should_process({'status': 'running', 'attempts': 1})
+
+    def test_start_run_reports_resume(self):
+        store = _store_with_run({'runId': 'run-1', 'createdAt': '2025-01-01T00:00:00Z'}, {})
+        run_data = store.start_run('run-1', '2025-01-02T00:00:00Z')
+
+        assert run_data['resumed'] is True
+        assert run_data['createdAt'] == '2025-01-01T00:00:00Z'
+
+    def test_progress_counts_users(self):
+        store = _store_with_run(
+            {'runId': 'run-1', 'status': 'running', 'cursor': 'u3'},
+            {
+                'u1': {'status': 'done', 'attempts': 1, 'paperCount': 12},
+                'u2': {'status': 'failed', 'attempts': 3},
+                'u3': {'status': 'done', 'attempts': 2, 'paperCount': 8},
+            }
+        )
+        progress = store.get_progress('run-1')
+
+        assert progress['users'] == {'done': 2, 'failed': 1, 'running': 0, 'exhausted': 1}
+        assert progress['papersCollected'] == 20
+        assert progress['cursor'] == 'u3'
+
+    def test_progress_missing_run(self):
+        store = _store_with_run(None, {})
+        assert store.get_progress('run-1') is None
+
+
+class _MemoryRunState(RunStateStore):
+    """RunStateStore keeping per-user state in memory."""
+
+    def __init__(self, max_attempts=3):
+        self.max_attempts = max_attempts
+        self.states = {}
+
+    def mark_user_started(self, run_id, uid, seed_count):
+        state = self.states.setdefault(uid, {'attempts': 0})
+        state.update(status='running', attempts=state['attempts'] + 1)
+
+    def mark_user_done(self, run_id, uid, paper_count, wal_message_id=None):
+        self.states[uid].update(status='done', error=None)
+
+    def mark_user_failed(self, run_id, uid, error):
+        self.states[uid].update(status='failed', error=error)
+
+
+def _job(uid, seeds):
+    return {
+        'uid': uid, 'tier': 'free', 'seeds': seeds, 'topicIds': [],
+        'previousState': None, 'payloads': [None] * len(seeds), 'fetchErrors': []
+    }
+
+
+@pytest.mark.unit
+class TestCollectionRunnerResume:
+    """Test that users with failed fetches are retried on resume"""
+
+    def test_failed_seed_fetch_is_retried_on_resume(self, mocker):
+        from app.services.collection_runner import CollectionRunner, RunProgress
+
+        failing = {'bad'}
+
+        def fetch(seed, clients, **kwargs):
+            if seed in failing:
+                raise RuntimeError('upstream 503')
+            return []
+
+        mocker.patch('app.services.collection_runner.fetch_seed_payloads', side_effect=fetch)
+        runner = CollectionRunner(MagicMock(), MagicMock(), 'topic', MagicMock())
+        runner.run_state = run_state = _MemoryRunState()
+        timestamp = '2025-01-01T00:00:00Z'
+
+        progress = RunProgress('run-1')
+        runner._run_batch('run-1', timestamp, [_job('u1', ['good', 'bad']), _job('u2', ['good'])], {}, {}, {}, progress)
+
+        assert run_state.states['u1']['status'] == 'failed'
+        assert 'upstream 503' in run_state.states['u1']['error']
+        assert run_state.states['u2']['status'] == 'done'
+        stats = progress.final_stats()
+        assert (stats['usersProcessed'], stats['usersFailed']) == (1, 1)
+
+        # Resuming retries only the user whose fetch failed
+        failing.clear()
+        retry = [uid for uid in ('u1', 'u2') if run_state.should_process(run_state.states.get(uid))]
+        assert retry == ['u1']
+
+        runner._run_batch('run-1', timestamp, [_job('u1', ['good', 'bad'])], {}, {}, {}, RunProgress('run-1'))
+
+        assert run_state.states['u1'] == {'status': 'done', 'attempts': 2, 'error': None}
+
+
+@pytest.mark.unit
+class TestRunProgress:
+    """Test live progress reporting for background runs"""
+
+    def test_snapshot_counts_and_eta(self, mocker):
+        from app.services.collection_runner import RunProgress
+
+        clock = mocker.patch('app.services.collection_runner.time.monotonic')
+        clock.return_value = 100.0
+        progress = RunProgress('run-1')
+        progress.start(users_total=4)
+
+        progress.user_processed(10)
+        progress.user_failed('Error processing user u2: boom')
+        progress.merge_timings({'openalex': {'calls': 2, 'seconds': 0.5}})
+        clock.return_value = 110.0
+
+        snapshot = progress.snapshot()
+
+        assert snapshot['status'] == 'running'
+        assert snapshot['users']['done'] == 2
+        assert snapshot['papersCollected'] == 10
+        assert snapshot['errorCount'] == 1
+        assert snapshot['etaSeconds'] == 10.0
+        assert snapshot['sources']['openalex'] == {
+            'calls': 2, 'totalMs': 500, 'avgMs': 250, 'rateLimitWaitMs': 0
+        }
+
+    def test_submit_run_does_not_double_execute(self, mocker):
+        from app.services import collection_runner
+
+        submitted = mocker.patch.object(collection_runner._executor, 'submit')
+        runner = MagicMock()
+
+        first = collection_runner.submit_run(runner, 'run-dup')
+        second = collection_runner.submit_run(runner, 'run-dup')
+
+        assert first is second
+        assert submitted.call_count == 1
+        assert collection_runner.get_live_progress('run-dup') is first
+
+
+def _drain(scheduler):
+    order = []
+    while True:
+        item = scheduler.next_task()
+        if item is None:
+            return order
+        order.append(item[0])
+        scheduler.task_done(item[0])
+
+
+@pytest.mark.unit
+class TestFairScheduler:
+    """Test deficit round-robin scheduling of (user, seed) tasks"""
+
+    def test_round_robin_between_equal_users(self):
+        scheduler = FairScheduler()
+        scheduler.add_user('heavy', 'free', ['s1', 's2', 's3', 's4'])
+        scheduler.add_user('light', 'free', ['s1'])
+
+        assert _drain(scheduler) == ['heavy', 'light', 'heavy', 'heavy', 'heavy']
+
+    def test_tier_weights(self):
+        scheduler = FairScheduler()
+        scheduler.add_user('free-user', 'free', ['s'] * 3)
+        scheduler.add_user('pro-user', 'pro', ['s'] * 8)
+
+        order = _drain(scheduler)
+        assert order[:5] == ['free-user', 'pro-user', 'pro-user', 'pro-user', 'pro-user']
+        assert order.count('pro-user') == 8
+
+    def test_task_done_reports_last_task(self):
+        scheduler = FairScheduler()
+        scheduler.add_user('u1', 'free', ['a', 'b'])
+
+        scheduler.next_task()
+        scheduler.next_task()
+        assert scheduler.next_task() is None
+        assert scheduler.task_done('u1') is False
+        assert scheduler.task_done('u1') is True
+        assert 'u1' in scheduler.completion_times()
+
+    def test_summarize_completion(self):
+        summary = summarize_completion([('free', 1.0), ('free', 3.0), ('pro', 2.0)])
+
+        assert summary['count'] == 3
+        assert summary['p50Seconds'] == 2.0
+        assert summary['maxSeconds'] == 3.0
+        assert summary['byTier']['free']['count'] == 2
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test shared upstream rate limiting"""
+
+    def test_burst_is_immediate(self):
+        bucket = TokenBucket(rate=1, burst=2)
+        assert bucket.acquire() == 0.0
+        assert bucket.acquire() == 0.0
+
+    def test_waits_when_empty(self, mocker):
+        sleep = mocker.patch('app.services.rate_limit.time.sleep')
+        bucket = TokenBucket(rate=100, burst=1)
+        bucket.acquire()
+        waited = bucket.acquire()
+
+        assert sleep.called
+        assert waited > 0
+
+    def test_zero_rate_is_unlimited(self):
+        assert TokenBucket(rate=0).acquire() == 0.0
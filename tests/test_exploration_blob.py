@@ -0,0 +1,147 @@
+"""
+Exploration Blob Unit Tests
+
+Tests the streaming exploration blob writer, its rows and columnar
+layouts, and local blob storage.
+"""
+
+import io
+import json
+
+import pytest
+
+from app.services import exploration_blob
+from app.services.citation_graph import CitationGraph
+from app.services.exploration_blob import (
+    ExplorationBlobWriter,
+    LocalBlobStorage,
+    compressed_stream,
+    decompress,
+    read_exploration_blob,
+    write_exploration_blob
+)
+
+
+PAPERS = [
+    {'id': f'W{n}', 'title': f'Paper {n}', 'year': 2020 + n % 5, 'citations': n * 3}
+    for n in range(10)
+]
+EDGES = [('W1', 'W0'), ('W2', 'W0'), ('W2', 'W1'), ('W9', 'W8'), ('W3', 'W99')]
+
+
+def _write(layout, block_rows=4):
+    raw = io.BytesIO()
+    with compressed_stream(raw, 'gzip') as stream:
+        writer = ExplorationBlobWriter(stream, layout, block_rows=block_rows)
+        writer.write_metadata({'network_id': 'net1'})
+        writer.write_papers(iter(PAPERS + [PAPERS[0]]))
+        writer.write_citations(iter(EDGES))
+        writer.write_section('authors', [{'id': 'A1', 'name': 'Author 1'}])
+        counts = writer.close()
+    return raw.getvalue(), counts
+
+
+@pytest.mark.unit
+class TestExplorationBlobWriter:
+    """Test streaming blob sections in both layouts"""
+
+    def test_rows_layout(self):
+        data, counts = _write('rows')
+        blob = json.loads(decompress(data))
+
+        assert blob['format'] == {'version': 1, 'layout': 'rows'}
+        assert blob['metadata'] == {'network_id': 'net1'}
+        assert blob['papers'] == PAPERS
+        assert blob['citations'][0] == {'source': 'W1', 'target': 'W0', 'type': 'cites'}
+        assert counts == {'papers': 10, 'citations': 4, 'droppedCitations': 1, 'authors': 1}
+        assert blob['stats'] == counts
+
+    def test_columnar_layout_uses_parallel_arrays_and_packed_edges(self):
+        data, _ = _write('columnar')
+        raw = json.loads(decompress(data))
+
+        assert len(raw['papers']['blocks']) == 3
+        assert raw['papers']['blocks'][0]['id'] == ['W0', 'W1', 'W2', 'W3']
+        assert raw['papers']['blocks'][0]['citations'] == [0, 3, 6, 9]
+        assert raw['citations']['encoding'] == 'int32le-base64'
+        assert all(isinstance(block['source'], str) for block in raw['citations']['blocks'])
+
+    def test_layouts_decode_to_the_same_document(self):
+        rows = read_exploration_blob(_write('rows')[0])
+        columnar = read_exploration_blob(_write('columnar')[0])
+
+        for section in ('metadata', 'papers', 'citations', 'authors', 'stats'):
+            assert columnar[section] == rows[section]
+
+    def test_columnar_keeps_explicit_nulls_apart_from_missing_fields(self):
+        papers = [{'id': 'W1', 'abstract': None}, {'id': 'W2', 'title': 'Paper 2'}]
+        decoded = {}
+        for layout in ('rows', 'columnar'):
+            raw = io.BytesIO()
+            with compressed_stream(raw, 'gzip') as stream:
+                writer = ExplorationBlobWriter(stream, layout)
+                writer.write_papers(papers)
+                writer.close()
+            decoded[layout] = read_exploration_blob(raw.getvalue())['papers']
+
+        assert decoded['rows'] == papers
+        assert decoded['columnar'] == papers
+
+    def test_citations_require_papers_and_sections_are_written_once(self):
+        writer = ExplorationBlobWriter(io.BytesIO())
+        with pytest.raises(ValueError):
+            writer.write_citations([])
+
+        writer.write_papers(PAPERS)
+        with pytest.raises(ValueError):
+            writer.write_papers(PAPERS)
+        with pytest.raises(ValueError):
+            ExplorationBlobWriter(io.BytesIO(), layout='graph')
+
+
+@pytest.mark.unit
+class TestWriteExplorationBlob:
+    """Test writing blobs to local storage"""
+
+    def test_write_and_read_back(self, tmp_path):
+        storage = LocalBlobStorage(str(tmp_path))
+        graph = CitationGraph.from_edges(EDGES + [('W1', 'W50')])
+        paper_ids = [paper['id'] for paper in PAPERS]
+
+        result = write_exploration_blob(
+            storage, 'net1', 'v2', iter(PAPERS), graph.edges_within(paper_ids), layout='columnar'
+        )
+
+        assert result['name'] == 'net1/v2.json.gz'
+        assert result['url'] == f'file://{tmp_path}/net1/v2.json.gz'
+        assert result['bytes'] == (tmp_path / 'net1' / 'v2.json.gz').stat().st_size
+        assert result['counts']['citations'] == 4
+        assert not (tmp_path / 'net1' / 'v2.json.gz.tmp').exists()
+
+        blob = read_exploration_blob(storage.read(result['name']))
+        assert blob['metadata'] == {'network_id': 'net1', 'version_id': 'v2'}
+        assert {(c['source'], c['target']) for c in blob['citations']} == set(EDGES[:4])
+        assert blob['clusters'] == []
+
+    def test_failed_write_leaves_no_blob(self, tmp_path):
+        storage = LocalBlobStorage(str(tmp_path))
+
+        def failing_papers():
+            yield PAPERS[0]
+            raise RuntimeError('query failed')
+
+        with pytest.raises(RuntimeError):
+            write_exploration_blob(storage, 'net1', 'v3', failing_papers(), [])
+        assert not storage.exists('net1/v3.json.gz')
+        assert list((tmp_path / 'net1').iterdir()) == []
+
+    def test_zstd_falls_back_to_gzip_when_not_installed(self, tmp_path, mocker):
+        mocker.patch.dict('sys.modules', {'zstandard': None})
+
+        assert exploration_blob.resolve_compression('zstd') == 'gzip'
+        with pytest.raises(ValueError):
+            exploration_blob.resolve_compression('brotli')
+
+    def test_storage_rejects_names_outside_root(self, tmp_path):
+        with pytest.raises(ValueError):
+            LocalBlobStorage(str(tmp_path)).exists('../outside.json.gz')
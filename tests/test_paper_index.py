@@ -0,0 +1,172 @@
+"""
+Paper Index Unit Tests
+
+Tests the local SQLite FTS5 paper index, its Firestore sync and
+/api/search source selection.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.paper_index import PaperIndex, match_expression
+
+
+def _paper(paper_id, title, score=1.0, days_ago=1, **fields):
+    date = (datetime.utcnow() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+    return {
+        'paperId': paper_id,
+        'title': title,
+        'abstract': fields.get('abstract', ''),
+        'authors': fields.get('authors', []),
+        'venue': fields.get('venue', ''),
+        'date': date,
+        'score': score,
+        'updatedAt': fields.get('updatedAt', '2025-01-01T00:00:00Z')
+    }
+
+
+def _doc(paper):
+    doc = MagicMock()
+    doc.id = paper['paperId']
+    doc.to_dict.return_value = paper
+    return doc
+
+
+@pytest.fixture
+def index(tmp_path):
+    return PaperIndex(str(tmp_path / 'papers.sqlite'))
+
+
+@pytest.mark.unit
+class TestPaperIndex:
+    """Test indexing and querying stored papers"""
+
+    def test_match_expression(self):
+        assert match_expression('Sleep memory') == '"sleep" AND "memory"*'
+        assert match_expression('effects of sleep') == '"effects" AND "sleep"*'
+        assert match_expression('of the') == '"of" AND "the"*'
+        assert match_expression('  --  ') is None
+
+    def test_searches_all_fields(self, index):
+        index.upsert([
+            _paper('W1', 'Sleep and memory consolidation'),
+            _paper('W2', 'Attention networks', authors=['Ada Lovelace']),
+            _paper('W3', 'Working memory', venue='Cognition', abstract='Capacity limits')
+        ])
+
+        assert [p['paperId'] for p in index.search('consolidation')] == ['W1']
+        assert [p['paperId'] for p in index.search('lovelace')] == ['W2']
+        assert [p['paperId'] for p in index.search('cognition capacity')] == ['W3']
+        assert [p['paperId'] for p in index.search('consol')] == ['W1']
+        assert index.search('unrelated') == []
+
+    def test_matches_ranked_by_score(self, index):
+        index.upsert([
+            _paper('W1', 'Memory in sleep', score=0.2),
+            _paper('W2', 'Sleep deprivation', score=0.9)
+        ])
+
+        assert [p['paperId'] for p in index.search('sleep')] == ['W2', 'W1']
+
+    def test_upsert_replaces_paper(self, index):
+        index.upsert([_paper('W1', 'Old title')])
+        index.upsert([_paper('W1', 'New title')])
+
+        assert len(index) == 1
+        assert index.search('old') == []
+        assert index.search('new')[0]['title'] == 'New title'
+
+    def test_days_back_filter(self, index):
+        index.upsert([
+            _paper('W1', 'Recent sleep study', days_ago=2),
+            _paper('W2', 'Older sleep study', days_ago=60)
+        ])
+
+        assert [p['paperId'] for p in index.search('sleep', days_back=7)] == ['W1']
+        assert len(index.search('sleep')) == 2
+
+    def test_sync_from_firestore_is_incremental(self, index):
+        db = MagicMock()
+        papers = db.collection.return_value
+        papers.stream.return_value = [
+            _doc(_paper('W1', 'Sleep', updatedAt='2025-01-01T00:00:00Z')),
+            _doc(_paper('W2', 'Memory', updatedAt='2025-01-02T00:00:00Z'))
+        ]
+        # W4 shares W2's updatedAt but was written after the first sync read it
+        papers.where.return_value.stream.return_value = [
+            _doc(_paper('W2', 'Memory', updatedAt='2025-01-02T00:00:00Z')),
+            _doc(_paper('W4', 'Memory span', updatedAt='2025-01-02T00:00:00Z')),
+            _doc(_paper('W3', 'Attention', updatedAt='2025-01-03T00:00:00Z'))
+        ]
+
+        assert index.sync_from_firestore(db) == 2
+        assert index.sync_from_firestore(db) == 3
+
+        papers.where.assert_called_once_with('updatedAt', '>=', '2025-01-02T00:00:00Z')
+        assert index.get_meta('synced_updated_at') == '2025-01-03T00:00:00Z'
+        assert len(index) == 4
+
+    def test_web_process_only_syncs_a_built_index(self, index, mocker):
+        from app.services import paper_index
+
+        thread = mocker.patch.object(paper_index.threading, 'Thread')
+        mocker.patch.object(paper_index, '_syncer', None)
+        mocker.patch.object(paper_index, '_shared_index', index)
+
+        paper_index.get_paper_index(MagicMock())
+        thread.assert_not_called()
+
+        index.set_meta('synced_updated_at', '2025-01-01T00:00:00Z')
+        paper_index.get_paper_index(MagicMock())
+        thread.assert_called_once()
+
+
+@pytest.mark.unit
+class TestSearchSources:
+    """Test /api/search source=local|upstream|hybrid"""
+
+    @pytest.fixture
+    def client(self, mocker, index):
+        from app import create_app
+        from app.services import gcp, paper_index, search_cache
+        from app.services.search_cache import SearchResultCache
+
+        gcp.reset_clients(firestore_client=MagicMock())
+        mocker.patch.object(paper_index, '_shared_index', index)
+        mocker.patch.object(paper_index, '_syncer', MagicMock())
+        mocker.patch.object(search_cache, '_shared_cache', SearchResultCache())
+        mocker.patch('app.utils.auth.verify_token', return_value={'uid': 'u1'})
+        yield create_app().test_client()
+        gcp.reset_clients()
+
+    def test_local_source_skips_upstream(self, client, index, mocker):
+        index.upsert([_paper('W1', 'Sleep and memory')])
+        collect = mocker.patch('app.api.search.collect_and_rank')
+
+        body = client.get('/api/search?q=sleep&source=local', headers={'Authorization': 'Bearer t'}).get_json()
+
+        assert [p['paperId'] for p in body['papers']] == ['W1']
+        assert body['source'] == 'local'
+        assert body['cache'] is None
+        collect.assert_not_called()
+
+    def test_hybrid_tops_up_from_upstream(self, client, index, mocker):
+        index.upsert([_paper('https:__openalex.org_W1', 'Sleep', score=0.5)])
+        mocker.patch('app.api.search.collect_and_rank', return_value=[
+            _paper('https://openalex.org/W1', 'Sleep', score=0.5),
+            _paper('W2', 'Sleep onset', score=0.8)
+        ])
+
+        body = client.get(
+            '/api/search?q=sleep&source=hybrid&max_results=5', headers={'Authorization': 'Bearer t'}
+        ).get_json()
+
+        assert [p['paperId'] for p in body['papers']] == ['W2', 'https:__openalex.org_W1']
+        assert body['localCount'] == 1
+        assert body['cache']['status'] == 'miss'
+
+    def test_invalid_source(self, client):
+        response = client.get('/api/search?q=sleep&source=cache', headers={'Authorization': 'Bearer t'})
+        assert response.status_code == 400
@@ -0,0 +1,239 @@
+"""
+Paper Vectors Unit Tests
+
+Tests the paper embedding pipeline, the memory-mapped vector store, the
+IVF nearest-neighbor index and GET /api/papers/<id>/related.
+"""
+
+import random
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from app.services import paper_vectors
+from app.services.paper_vectors import IVFIndex, PaperVectorizer, PaperVectors, VectorStore
+
+
+FIELDS = {
+    'sleep': 'sleep memory consolidation rem slow wave hippocampus nap circadian',
+    'vision': 'visual cortex perception retina contrast motion color attention',
+    'language': 'syntax semantics reading bilingual vocabulary grammar speech'
+}
+
+
+def _corpus(per_field=40, seed=0):
+    rng = random.Random(seed)
+    papers = []
+    for field, words in FIELDS.items():
+        words = words.split()
+        for i in range(per_field):
+            papers.append({
+                'paperId': f'{field}-{i}',
+                'title': ' '.join(rng.choice(words) for _ in range(6)),
+                'abstract': ' '.join(rng.choice(words) for _ in range(30)),
+                'updatedAt': f'2025-01-{i % 28 + 1:02d}T00:00:00Z'
+            })
+    return papers
+
+
+@pytest.mark.unit
+class TestPaperVectorizer:
+    """Test the hashed TF-IDF + SVD embedding"""
+
+    def test_similar_texts_are_closer(self):
+        papers = _corpus()
+        vectorizer = PaperVectorizer.fit([paper_vectors.paper_text(p) for p in papers], dim=8)
+
+        sleep, sleep_2, vision = vectorizer.transform([
+            'memory consolidation during sleep',
+            'rem sleep and the hippocampus',
+            'motion perception in visual cortex'
+        ])
+
+        assert vectorizer.dim == 8
+        assert np.isclose(np.linalg.norm(sleep), 1.0)
+        assert sleep @ sleep_2 > sleep @ vision
+
+    def test_text_without_terms_is_zero(self):
+        vectorizer = PaperVectorizer.fit(['sleep memory', 'visual cortex', 'reading speech'], dim=2)
+        assert not vectorizer.transform(['the of and']).any()
+
+    def test_fit_needs_two_texts(self):
+        with pytest.raises(ValueError):
+            PaperVectorizer.fit(['sleep'])
+
+
+@pytest.mark.unit
+class TestVectorStore:
+    """Test the append-only memory-mapped store"""
+
+    def test_append_overwrite_and_reopen(self, tmp_path):
+        store = VectorStore(str(tmp_path), dim=2)
+
+        assert store.put(['a', 'b'], np.array([[1, 0], [0, 1]], dtype=np.float32)) == 2
+        assert store.put(['b', 'c'], np.array([[1, 1], [2, 2]], dtype=np.float32)) == 1
+
+        reopened = VectorStore(str(tmp_path), dim=2)
+        assert reopened.ids == ['a', 'b', 'c']
+        assert reopened.vectors.tolist() == [[1, 0], [1, 1], [2, 2]]
+
+    def test_grows_past_capacity(self, tmp_path):
+        store = VectorStore(str(tmp_path), dim=4)
+        vectors = np.ones((1500, 4), dtype=np.float32)
+
+        store.put([f'p{i}' for i in range(1500)], vectors)
+
+        assert len(store) == 1500
+        assert store.vectors.shape == (1500, 4)
+
+
+@pytest.mark.unit
+class TestIVFIndex:
+    """Test the inverted-file nearest-neighbor index"""
+
+    def _vectors(self, n=2000, dim=16, seed=0):
+        rng = np.random.default_rng(seed)
+        vectors = rng.normal(size=(n, dim)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def test_full_probe_is_exact(self):
+        vectors = self._vectors()
+        index = IVFIndex.train(vectors, n_lists=20)
+
+        rows, scores = index.search(vectors, vectors[0], limit=5, nprobe=20, exclude=0)
+
+        exact = np.argsort(-(vectors @ vectors[0]))[1:6]
+        assert rows.tolist() == exact.tolist()
+        assert np.all(np.diff(scores) <= 0)
+
+    def test_appended_rows_are_scanned_until_assigned(self):
+        vectors = self._vectors()
+        index = IVFIndex.train(vectors[:1000], n_lists=10)
+
+        rows, _ = index.search(vectors, vectors[1500], limit=1, nprobe=1)
+        assert rows.tolist() == [1500]
+
+        index.extend(vectors)
+        assert index.indexed == 2000
+        assert index.offsets[-1] == 2000
+
+
+@pytest.mark.unit
+class TestPaperVectors:
+    """Test build, related lookups and incremental appends"""
+
+    def test_related_papers_share_a_field(self, tmp_path):
+        vectors = PaperVectors(str(tmp_path))
+        assert vectors.add(_corpus()) == 0
+
+        assert vectors.build(_corpus()) == 120
+        related = vectors.related('sleep-0', limit=5)
+
+        assert len(related) == 5
+        assert all(paper_id.startswith('sleep-') for paper_id, _ in related)
+        assert 'sleep-0' not in [paper_id for paper_id, _ in related]
+        assert vectors.related('unknown') is None
+
+    def test_appended_papers_are_searchable_and_persisted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(paper_vectors, 'REINDEX_ROWS', 2)
+        vectors = PaperVectors(str(tmp_path))
+        vectors.build(_corpus())
+
+        vectors.add([{
+            'paperId': 'new',
+            'title': 'syntax and semantics of reading',
+            'abstract': 'bilingual grammar',
+            'updatedAt': '2025-02-01T00:00:00Z'
+        }])
+
+        assert vectors.related('new', limit=3)[0][0].startswith('language-')
+        assert vectors.related('language-0', limit=200)
+
+        reopened = PaperVectors(str(tmp_path))
+        assert len(reopened) == 121
+        assert reopened.meta['syncedUpdatedAt'] == '2025-02-01T00:00:00Z'
+
+    def test_sync_includes_papers_at_the_last_synced_time(self, tmp_path):
+        vectors = PaperVectors(str(tmp_path))
+        vectors.build(_corpus())
+        synced = vectors.meta['syncedUpdatedAt']
+
+        db = MagicMock()
+        query = db.collection.return_value.where.return_value
+        late = {'title': 'rem sleep', 'abstract': 'sleep hippocampus nap', 'updatedAt': synced}
+        query.select.return_value.stream.return_value = [MagicMock(id='late', to_dict=MagicMock(return_value=late))]
+
+        assert vectors.sync_from_firestore(db) == 1
+        db.collection.return_value.where.assert_called_once_with('updatedAt', '>=', synced)
+        assert vectors.related('late', limit=3)
+
+    def test_rebuild_replaces_previous_build(self, tmp_path):
+        vectors = PaperVectors(str(tmp_path))
+        vectors.build(_corpus())
+        vectors.build(_corpus(seed=1))
+
+        builds = [p for p in tmp_path.iterdir() if p.is_dir()]
+        assert len(builds) == 1
+        assert PaperVectors(str(tmp_path)).ready
+
+    def test_web_process_only_syncs_an_existing_build(self, tmp_path, mocker):
+        thread = mocker.patch.object(paper_vectors.threading, 'Thread')
+        mocker.patch.object(paper_vectors, '_syncer', None)
+        mocker.patch.object(paper_vectors, '_shared_vectors', PaperVectors(str(tmp_path)))
+
+        paper_vectors.get_paper_vectors(MagicMock())
+        thread.assert_not_called()
+
+        mocker.patch.object(paper_vectors, 'PAPER_VECTORS_BUILD_IN_PROCESS', True)
+        paper_vectors.get_paper_vectors(MagicMock())
+        thread.assert_called_once()
+
+        mocker.patch.object(paper_vectors, '_syncer', None)
+        mocker.patch.object(paper_vectors, 'PAPER_VECTORS_BUILD_IN_PROCESS', False)
+        paper_vectors._shared_vectors.build(_corpus())
+        paper_vectors.get_paper_vectors(MagicMock())
+        assert thread.call_count == 2
+
+
+@pytest.mark.unit
+class TestRelatedPapersEndpoint:
+    """Test GET /api/papers/<id>/related"""
+
+    @pytest.fixture
+    def client(self, mocker, tmp_path):
+        from app import create_app
+        from app.services import gcp, paper_index
+        from app.services.paper_index import PaperIndex
+
+        db = MagicMock()
+        db.get_all.return_value = []
+        gcp.reset_clients(firestore_client=db)
+        index = PaperIndex(str(tmp_path / 'papers.sqlite'))
+        index.upsert(_corpus())
+        mocker.patch.object(paper_index, '_shared_index', index)
+        mocker.patch.object(paper_index, '_syncer', MagicMock())
+        mocker.patch.object(paper_vectors, '_shared_vectors', PaperVectors(str(tmp_path / 'vectors')))
+        mocker.patch.object(paper_vectors, '_syncer', MagicMock())
+        mocker.patch('app.utils.auth.verify_token', return_value={'uid': 'u1'})
+        yield create_app().test_client()
+        gcp.reset_clients()
+
+    def test_not_built(self, client):
+        response = client.get('/api/papers/sleep-0/related', headers={'Authorization': 'Bearer t'})
+        assert response.status_code == 503
+
+    def test_related_with_details(self, client):
+        paper_vectors._shared_vectors.build(_corpus())
+
+        body = client.get('/api/papers/sleep-0/related?limit=3', headers={'Authorization': 'Bearer t'}).get_json()
+
+        assert body['count'] == 3
+        assert all(p['paperId'].startswith('sleep-') and p['title'] for p in body['papers'])
+        assert body['papers'][0]['similarity'] >= body['papers'][-1]['similarity']
+
+    def test_unknown_paper(self, client):
+        paper_vectors._shared_vectors.build(_corpus())
+
+        response = client.get('/api/papers/missing/related', headers={'Authorization': 'Bearer t'})
+        assert response.status_code == 404
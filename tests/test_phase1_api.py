@@ -132,6 +132,21 @@ class TestAPIStructure:
         assert 'collector' in blueprint_names
         assert 'feedback' in blueprint_names
 
+    def test_cloud_clients_created_lazily(self, mocker):
+        """create_app should not build Firestore or Pub/Sub clients"""
+        from app import create_app
+        from app.services import gcp
+
+        gcp.reset_clients()
+        client = mocker.patch('firebase_admin.firestore.client')
+        app = create_app()
+
+        assert gcp._firestore_client is None
+        assert gcp._publisher is None
+        assert app.db is app.db
+        assert client.call_count == 1
+        gcp.reset_clients()
+
     def test_auth_decorator_exists(self):
         """Auth decorators should be importable"""
         from app.utils.auth import login_required, scheduler_auth_required
@@ -0,0 +1,149 @@
+"""
+Search Cache Unit Tests
+
+Tests the two-tier search result cache and stale-while-revalidate.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.search_cache import SearchResultCache, normalize_query, search_key
+
+
+def _doc(data):
+    doc = MagicMock()
+    doc.exists = data is not None
+    doc.to_dict.return_value = data
+    return doc
+
+
+@pytest.mark.unit
+class TestSearchResultCache:
+    """Test cache statuses, tiers and background refresh"""
+
+    def test_key_normalizes_query(self):
+        assert normalize_query("  Working   MEMORY ") == "working memory"
+        assert search_key("Sleep  Apnea", 7, 20) == search_key("sleep apnea", 7, 20)
+        assert search_key("sleep", 7, 20) != search_key("sleep", 14, 20)
+
+    def test_miss_then_hit(self):
+        cache = SearchResultCache(ttl_seconds=60, stale_seconds=120)
+        compute = MagicMock(return_value=[{"id": "W1"}])
+
+        first = cache.get(("sleep", 7, 20), compute)
+        second = cache.get(("sleep", 7, 20), compute)
+
+        assert first[1] == "miss" and second[1] == "hit"
+        assert second[0] == [{"id": "W1"}]
+        assert compute.call_count == 1
+        assert cache.stats()["hitRate"] == 0.5
+
+    def test_stale_served_while_refreshing(self):
+        cache = SearchResultCache(ttl_seconds=60, stale_seconds=600)
+        cache.put(("sleep", 7, 20), [{"id": "old"}])
+        refreshed = threading.Event()
+
+        def compute():
+            refreshed.set()
+            return [{"id": "new"}]
+
+        with patch("app.services.search_cache.time.time", return_value=time.time() + 120):
+            papers, status, age = cache.get(("sleep", 7, 20), compute)
+
+        assert status == "stale" and papers == [{"id": "old"}]
+        assert age >= 119
+        assert refreshed.wait(2)
+        for _ in range(100):
+            if not cache._refreshing:
+                break
+            time.sleep(0.01)
+        assert cache.get(("sleep", 7, 20), compute)[0] == [{"id": "new"}]
+
+    def test_too_old_recomputed(self):
+        cache = SearchResultCache(ttl_seconds=60, stale_seconds=120)
+        cache.put(("sleep", 7, 20), [{"id": "old"}])
+
+        with patch("app.services.search_cache.time.time", return_value=time.time() + 500):
+            papers, status, _ = cache.get(("sleep", 7, 20), lambda: [{"id": "new"}])
+
+        assert status == "miss" and papers == [{"id": "new"}]
+
+    def test_shared_tier_fills_memory(self):
+        db = MagicMock()
+        doc_ref = db.collection.return_value.document.return_value
+        doc_ref.get.return_value = _doc({"papers": [{"id": "W9"}], "computedAt": time.time() - 5})
+        cache = SearchResultCache(db=db, ttl_seconds=60, stale_seconds=120)
+        compute = MagicMock()
+
+        papers, status, age = cache.get(("sleep", 7, 20), compute)
+        cache.get(("sleep", 7, 20), compute)
+
+        assert status == "hit" and papers == [{"id": "W9"}]
+        assert 4 <= age < 60
+        assert doc_ref.get.call_count == 1
+        compute.assert_not_called()
+
+    def test_search_endpoint_reports_cache_status(self, mocker):
+        from app import create_app
+        from app.services import gcp, search_cache
+
+        db = MagicMock()
+        gcp.reset_clients(firestore_client=db)
+        mocker.patch.object(search_cache, "_shared_cache", SearchResultCache())
+        mocker.patch("app.utils.auth.verify_token", return_value={"uid": "u1"})
+        collect = mocker.patch("app.api.search.collect_and_rank", return_value=[{"id": "W1"}])
+
+        client = create_app().test_client()
+        headers = {"Authorization": "Bearer token"}
+        first = client.get("/api/search?q=Sleep", headers=headers).get_json()
+        second = client.get("/api/search?q=sleep%20", headers=headers).get_json()
+
+        assert first["cache"]["status"] == "miss"
+        assert second["cache"]["status"] == "hit"
+        assert collect.call_count == 1
+        event = db.collection.return_value.document.return_value.collection.return_value.document.return_value
+        assert event.set.call_args[0][0]["cacheStatus"] == "hit"
+        gcp.reset_clients()
+
+    def test_coalesced_searches_write_cache_once(self, mocker):
+        from app import create_app
+        from app.api import search
+        from app.services import gcp, search_cache
+
+        gcp.reset_clients(firestore_client=MagicMock())
+        cache = SearchResultCache()
+        put = mocker.spy(cache, "put")
+        mocker.patch.object(search_cache, "_shared_cache", cache)
+        mocker.patch.object(search, "search_flight", search.SingleFlight())
+        mocker.patch("app.utils.auth.verify_token", return_value={"uid": "u1"})
+        release = threading.Event()
+
+        def slow_collect(**kwargs):
+            release.wait(2)
+            return [{"id": "W1"}]
+
+        collect = mocker.patch("app.api.search.collect_and_rank", side_effect=slow_collect)
+        app = create_app()
+        responses = []
+
+        def request():
+            client = app.test_client()
+            responses.append(client.get("/api/search?q=sleep", headers={"Authorization": "Bearer token"}).get_json())
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while search.search_flight.stats()["coalesced"] < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert collect.call_count == 1
+        assert put.call_count == 1
+        assert sorted(r["cache"]["coalesced"] for r in responses) == [False, True, True, True]
+        assert all(r["cache"]["status"] == "miss" for r in responses)
+        gcp.reset_clients()
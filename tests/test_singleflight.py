@@ -0,0 +1,81 @@
+"""
+Single-Flight Unit Tests
+
+Tests coalescing of concurrent identical calls.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, callers):
+    """Start callers that all call flight.do(key, fn); return their outcomes."""
+    results = [None] * callers
+    threads = []
+
+    def _call(i):
+        try:
+            results[i] = flight.do(key, fn)
+        except Exception as e:
+            results[i] = e
+
+    for i in range(callers):
+        threads.append(threading.Thread(target=_call, args=(i,)))
+        threads[-1].start()
+    return threads, results
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Test shared execution, errors and counters"""
+
+    def test_concurrent_callers_share_one_execution(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            release.wait(2)
+            return ["paper"]
+
+        threads, results = _run_concurrently(flight, "q", work, 5)
+        while flight.stats()["coalesced"] < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result[0] == ["paper"] for result in results)
+        assert sorted(result[1] for result in results) == [False, True, True, True, True]
+        assert flight.stats() == {"executions": 1, "coalesced": 4, "inFlight": 0}
+
+    def test_errors_reach_every_waiter(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def work():
+            release.wait(2)
+            raise RuntimeError("upstream down")
+
+        threads, results = _run_concurrently(flight, "q", work, 3)
+        while flight.stats()["coalesced"] < 2:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flight.in_flight() == 0
+
+    def test_sequential_calls_not_cached(self):
+        flight = SingleFlight()
+
+        assert flight.do("q", lambda: 1) == (1, False)
+        assert flight.do("q", lambda: 2) == (2, False)
+        assert flight.do("other", lambda: 3) == (3, False)
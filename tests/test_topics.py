@@ -0,0 +1,677 @@
+"""
+Topics Unit Tests
+
+Tests the in-process topics catalog and derived topic views.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from app.services.openalex_topics import OpenAlexTopicsService, topic_content_hash
+from app.services.topic_papers import TopicPaperFeed
+
+from app.services.topic_aggregates import (
+    TOP_TOPICS,
+    TopicAggregatesCache,
+    apply_changes,
+    compute_aggregates,
+    decode_aggregates,
+    encode_aggregates,
+    filter_hierarchy,
+    hierarchy_outline,
+    hierarchy_subtree
+)
+from app.services.topic_search import TopicSearchIndex, tokenize
+from app.services.topic_similarity import RelatedTopicsIndex
+from app.services.topics_catalog import TopicsCatalog, TopicsCatalogCache, decode_cursor, encode_cursor
+from app.services.topics_mmap import MmapTopicsCatalog, write_catalog_file
+
+
+def _topic(topic_id, name, works, field="Psychology", subfield="Clinical Psychology", **extra):
+    topic = {
+        "id": topic_id,
+        "display_name": name,
+        "description": extra.pop("description", f"Research on {name.lower()}"),
+        "keywords": extra.pop("keywords", []),
+        "works_count": works,
+        "domain": {"id": "2", "display_name": "Social Sciences"},
+        "field": {"id": "32" if field == "Psychology" else "33", "display_name": field},
+        "subfield": {"id": "3203" if field == "Psychology" else "3312", "display_name": subfield},
+    }
+    topic.update(extra)
+    return topic
+
+
+SAMPLE_TOPICS = [
+    _topic("T1", "Working Memory Capacity", 5000, keywords=["working memory", "attention"]),
+    _topic("T2", "Anxiety Disorders Treatment", 9000, keywords=["anxiety", "CBT"]),
+    _topic("T3", "Urban Sociology", 3000, field="Social Sciences", subfield="Sociology",
+           keywords=["cities", "neighborhoods"]),
+]
+
+
+def _doc(doc_id, data):
+    doc = MagicMock()
+    doc.id = doc_id
+    doc.exists = data is not None
+    doc.to_dict.side_effect = lambda: dict(data) if data is not None else None
+    return doc
+
+
+def _fake_db(topics, version=1):
+    db = MagicMock()
+    state = {"version": version, "streams": 0}
+
+    def stream():
+        state["streams"] += 1
+        return [_doc(t["id"], t) for t in topics]
+
+    def collection(name):
+        ref = MagicMock()
+        if name == "topics":
+            ref.stream.side_effect = stream
+        else:
+            ref.document.return_value.get.side_effect = lambda: _doc("catalog", {"version": state["version"]})
+        return ref
+
+    db.collection.side_effect = collection
+    return db, state
+
+
+@pytest.mark.unit
+class TestTopicsCatalog:
+    """Test catalog views and cache invalidation"""
+
+    def test_sorted_and_filtered_views(self):
+        catalog = TopicsCatalog(SAMPLE_TOPICS, version=1)
+
+        assert [t["id"] for t in catalog.get_topics()] == ["T2", "T1", "T3"]
+        assert [t["id"] for t in catalog.get_topics("Psychology")] == ["T2", "T1"]
+        assert catalog.get_topics("Unknown") == []
+        assert catalog.get_topic("T3")["display_name"] == "Urban Sociology"
+
+    def test_cache_reads_collection_once(self):
+        db, state = _fake_db(SAMPLE_TOPICS)
+        cache = TopicsCatalogCache(db, ttl_seconds=3600, version_check_seconds=3600)
+
+        cache.get_catalog()
+        cache.get_catalog()
+
+        assert state["streams"] == 1
+
+    def test_version_change_triggers_reload(self):
+        db, state = _fake_db(SAMPLE_TOPICS)
+        cache = TopicsCatalogCache(db, ttl_seconds=3600, version_check_seconds=0)
+
+        cache.get_catalog()
+        cache.get_catalog()
+        assert state["streams"] == 1
+
+        state["version"] = 2
+        assert cache.get_catalog().version == 2
+        assert state["streams"] == 2
+
+    def test_expired_catalog_reloads(self):
+        db, state = _fake_db(SAMPLE_TOPICS)
+        cache = TopicsCatalogCache(db, ttl_seconds=0, version_check_seconds=3600)
+
+        cache.get_catalog()
+        cache.get_catalog()
+
+        assert state["streams"] == 2
+
+
+@pytest.mark.unit
+class TestTopicSearchIndex:
+    """Test ranked topic search"""
+
+    def test_tokenize(self):
+        assert tokenize("Working-Memory, CBT_2") == ["working", "memory", "cbt", "2"]
+
+    def test_name_match_outranks_description_match(self):
+        topics = [
+            _topic("T10", "Sleep Research", 100, description="Effects of anxiety on sleep"),
+            _topic("T11", "Anxiety Disorders", 100),
+        ]
+        results = TopicSearchIndex(topics).search("anxiety")
+
+        assert [t["id"] for t, _ in results] == ["T11", "T10"]
+
+    def test_all_terms_required(self):
+        results = TopicSearchIndex(SAMPLE_TOPICS).search("working anxiety")
+        assert results == []
+
+    def test_last_term_matches_prefix(self):
+        index = TopicSearchIndex(SAMPLE_TOPICS)
+
+        assert [t["id"] for t, _ in index.search("working mem")] == ["T1"]
+        assert [t["id"] for t, _ in index.search("neighbor")] == ["T3"]
+        assert index.search("mem working") == []
+
+    def test_prefix_expansion_keeps_shortest_terms(self):
+        # Over 100 completions of "neuro": short ones, then a deep chain of long ones
+        names = ["Neuroax"] + [f"Neuro{c}{d}" for c in "abcde" for d in "xyzwvutsqp"]
+        names += [f"Neuro{'o' * n}x" for n in range(1, 70)]
+        index = TopicSearchIndex([_topic(f"T{i}", name, 10) for i, name in enumerate(names)])
+
+        terms = index.expand_prefix("neuro")
+
+        assert len(terms) == 50
+        assert "neuroax" in terms
+        assert "neuroooooox" not in terms
+        assert [len(t) for t in terms] == sorted(len(t) for t in terms)
+
+    def test_exact_match_outranks_prefix(self):
+        topics = [
+            _topic("T20", "Memoryless Processes", 100),
+            _topic("T21", "Memory Consolidation", 100),
+        ]
+        results = TopicSearchIndex(topics).search("memory")
+
+        assert results[0][0]["id"] == "T21"
+        assert results[0][1] > results[1][1]
+
+    def test_field_filter_and_limit(self):
+        index = TopicSearchIndex(SAMPLE_TOPICS)
+
+        assert index.search("research", field_name="Social Sciences")[0][0]["id"] == "T3"
+        assert len(index.search("research", limit=2)) == 2
+
+    def test_catalog_builds_index_once(self):
+        catalog = TopicsCatalog(SAMPLE_TOPICS, version=1)
+        assert catalog.search_index is catalog.search_index
+
+
+RELATED_TOPICS = [
+    _topic("T30", "Working Memory Training", 100, keywords=["working memory", "training"]),
+    _topic("T31", "Working Memory Capacity", 100, keywords=["working memory", "attention"]),
+    _topic("T32", "Visual Attention", 100, keywords=["attention", "eye movements"]),
+    _topic("T33", "Urban Sociology", 100, keywords=["cities"], description="Neighborhood change"),
+]
+
+
+@pytest.mark.unit
+class TestRelatedTopics:
+    """Test precomputed related-topic neighbors"""
+
+    def test_neighbors_ranked_by_similarity(self):
+        index = RelatedTopicsIndex(RELATED_TOPICS)
+        related = index.related("T31")
+
+        assert [t["id"] for t, _ in related] == ["T30", "T32"]
+        assert related[0][1] > related[1][1] > 0
+
+    def test_unrelated_topics_excluded(self):
+        index = RelatedTopicsIndex(RELATED_TOPICS)
+
+        assert index.related("T33") == []
+        assert index.related("T404") == []
+        assert len(index.related("T31", limit=1)) == 1
+
+    def test_service_reports_missing_topic(self):
+        service, _ = _topics_service()
+        service.catalog.get_catalog.return_value = TopicsCatalog(RELATED_TOPICS, version=1)
+
+        assert service.get_related_topics("T404") is None
+        assert service.get_related_topics("T31")[0]["id"] == "T30"
+        assert "similarity" in service.get_related_topics("T31")[0]
+
+
+@pytest.mark.unit
+class TestTopicAggregates:
+    """Test precomputed hierarchy, fields and stats"""
+
+    def test_compute_aggregates(self):
+        aggregates = compute_aggregates(SAMPLE_TOPICS)
+        stats = aggregates["stats"]
+
+        assert stats["total_topics"] == 3
+        assert stats["total_works"] == 17000
+        assert stats["fields"]["Psychology"] == {"topic_count": 2, "works_count": 14000}
+        assert [t["id"] for t in stats["top_topics"]] == ["T2", "T1", "T3"]
+        assert aggregates["fields"][0] == {"id": "32", "display_name": "Psychology", "topic_count": 2}
+
+        subfield = aggregates["hierarchy"]["domains"]["2"]["fields"]["32"]["subfields"]["3203"]
+        assert [t["id"] for t in subfield["topics"]] == ["T2", "T1"]
+
+    def test_filter_hierarchy(self):
+        hierarchy = compute_aggregates(SAMPLE_TOPICS)["hierarchy"]
+        filtered = filter_hierarchy(hierarchy, "Social Sciences")
+
+        assert list(filtered["domains"]["2"]["fields"]) == ["33"]
+        assert filter_hierarchy(hierarchy, "Physics") == {"domains": {}}
+
+    def test_blob_round_trip(self):
+        aggregates = compute_aggregates(SAMPLE_TOPICS)
+        assert decode_aggregates(encode_aggregates(aggregates)) == aggregates
+
+    def test_apply_changes_matches_full_rebuild(self):
+        before = compute_aggregates(SAMPLE_TOPICS)
+        grown = _topic("T1", "Working Memory Capacity", 12000, keywords=["working memory"])
+        added = _topic("T4", "Social Networks", 100, field="Social Sciences", subfield="Networks")
+
+        patched = apply_changes(
+            before,
+            upserts=[(SAMPLE_TOPICS[0], grown), (None, added)],
+            removed=[SAMPLE_TOPICS[2]]
+        )
+
+        assert patched == compute_aggregates([grown, SAMPLE_TOPICS[1], added])
+        assert before == compute_aggregates(SAMPLE_TOPICS)
+
+    def test_apply_changes_requires_rebuild_when_top_topic_shrinks(self):
+        topics = [_topic(f"T{i}", f"Topic {i}", 1000 + i) for i in range(TOP_TOPICS + 2)]
+        aggregates = compute_aggregates(topics)
+        top = topics[-1]
+
+        shrunk = dict(top, works_count=1)
+        assert apply_changes(aggregates, upserts=[(top, shrunk)]) is None
+        assert apply_changes(aggregates, upserts=[], removed=[top]) is None
+
+        grown = dict(topics[0], works_count=99999)
+        patched = apply_changes(aggregates, upserts=[(topics[0], grown)])
+        assert patched["stats"]["top_topics"][0]["id"] == "T0"
+
+    def test_cache_falls_back_to_computing(self):
+        db, state = _fake_db(SAMPLE_TOPICS)
+        catalog = TopicsCatalogCache(db, ttl_seconds=3600, version_check_seconds=3600)
+        cache = TopicAggregatesCache(db, catalog, ttl_seconds=3600, version_check_seconds=3600)
+        cache.read_stored = MagicMock(return_value=(None, None))
+
+        assert cache.get()["stats"]["total_topics"] == 3
+        cache.get()
+        assert cache.read_stored.call_count == 1
+
+    def test_cache_serves_stored_blob(self):
+        db, state = _fake_db(SAMPLE_TOPICS, version=4)
+        catalog = TopicsCatalogCache(db, ttl_seconds=3600, version_check_seconds=3600)
+        cache = TopicAggregatesCache(db, catalog, ttl_seconds=3600, version_check_seconds=3600)
+        stored = compute_aggregates(SAMPLE_TOPICS[:1])
+        cache.read_stored = MagicMock(return_value=(stored, 4))
+
+        assert cache.get()["stats"]["total_topics"] == 1
+        assert state["streams"] == 0
+
+
+def _topics_service(stored_hashes=None):
+    """Service over a mock db with the given stored content hashes."""
+    db = MagicMock()
+    db.get_all.return_value = []
+    service = OpenAlexTopicsService(db)
+    service.catalog = MagicMock()
+    service.catalog.bump_version.return_value = 2
+    service.refresh_aggregates = MagicMock()
+    service.load_content_hashes = MagicMock(return_value=stored_hashes or {})
+    return service, db
+
+
+def _response(status, payload=None):
+    response = MagicMock()
+    response.status_code = status
+    response.json.return_value = payload or {}
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    return response
+
+
+@pytest.mark.unit
+class TestTopicIngestion:
+    """Test diff-based topic ingestion"""
+
+    def test_content_hash_ignores_write_metadata(self):
+        topic = SAMPLE_TOPICS[0]
+        assert topic_content_hash(topic) == topic_content_hash({**topic, "created_at": "now"})
+        assert topic_content_hash(topic) != topic_content_hash({**topic, "works_count": 1})
+
+    def test_only_changed_topics_written(self):
+        unchanged, changed = SAMPLE_TOPICS[0], SAMPLE_TOPICS[1]
+        service, db = _topics_service({
+            unchanged["id"]: topic_content_hash(unchanged),
+            changed["id"]: "stale"
+        })
+
+        written = service.cache_topics_in_firestore([unchanged, changed])
+
+        assert written == 1
+        batch = db.batch.return_value
+        assert batch.set.call_count == 1
+        assert batch.set.call_args[0][1]["content_hash"] == topic_content_hash(changed)
+        version, = service.refresh_aggregates.call_args[0]
+        assert version == 2
+        assert [new["id"] for _, new in service.refresh_aggregates.call_args[1]["upserts"]] == ["T2"]
+
+    def test_nothing_written_when_unchanged(self):
+        service, db = _topics_service({t["id"]: topic_content_hash(t) for t in SAMPLE_TOPICS})
+
+        assert service.cache_topics_in_firestore(SAMPLE_TOPICS) == 0
+        db.batch.assert_not_called()
+        service.catalog.bump_version.assert_not_called()
+
+    def test_force_rewrites_everything(self):
+        service, db = _topics_service({t["id"]: topic_content_hash(t) for t in SAMPLE_TOPICS})
+
+        assert service.cache_topics_in_firestore(SAMPLE_TOPICS, force=True) == 3
+        service.refresh_aggregates.assert_called_once_with(2)
+
+    def test_since_falls_back_to_local_filter(self):
+        service, _ = _topics_service()
+        page = {"results": [
+            {"id": "https://openalex.org/T1", "display_name": "New", "updated_date": "2025-03-01T00:00:00"},
+            {"id": "https://openalex.org/T2", "display_name": "Old", "updated_date": "2024-01-01T00:00:00"},
+        ], "meta": {"next_cursor": None}}
+        service.session.get = MagicMock(side_effect=[_response(403), _response(200, page)])
+
+        with patch("app.services.openalex_topics.get_limiter"):
+            topics = service.fetch_topics(domain_ids=["2"], since="2025-01-01")
+
+        assert [t["id"] for t in topics] == ["T1"]
+        assert "from_updated_date:2025-01-01" in service.session.get.call_args_list[0][1]["params"]["filter"]
+
+
+@pytest.mark.unit
+class TestMmapTopicsCatalog:
+    """Test the compact memory-mapped catalog file"""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "topics.bin")
+        write_catalog_file(SAMPLE_TOPICS, path, version=7)
+        catalog = MmapTopicsCatalog(path)
+
+        assert catalog.version == 7
+        assert len(catalog) == 3
+        topic = catalog.get_topic("T1")
+        assert topic["display_name"] == "Working Memory Capacity"
+        assert topic["keywords"] == ["working memory", "attention"]
+        assert topic["field"] == {"id": "32", "display_name": "Psychology"}
+        assert catalog.get_topic("T999") is None
+        assert catalog.get_topic("bogus") is None
+
+    def test_matches_dict_catalog_views(self, tmp_path):
+        path = str(tmp_path / "topics.bin")
+        write_catalog_file(SAMPLE_TOPICS, path, version=1)
+        mapped = MmapTopicsCatalog(path)
+        catalog = TopicsCatalog(SAMPLE_TOPICS, version=1)
+
+        assert [t["id"] for t in mapped.get_topics()] == [t["id"] for t in catalog.get_topics()]
+        assert [t["id"] for t in mapped.get_topics("Psychology")] == ["T2", "T1"]
+        assert [t["id"] for t in mapped.get_subfield_topics("3312")] == ["T3"]
+        assert mapped.search_index.search("anxiety")[0][0]["id"] == "T2"
+        assert mapped.related_index.related("T1") == catalog.related_index.related("T1")
+
+    def test_indexes_do_not_keep_decoded_topics(self, tmp_path):
+        path = str(tmp_path / "topics.bin")
+        write_catalog_file(SAMPLE_TOPICS, path, version=1)
+        mapped = MmapTopicsCatalog(path)
+
+        mapped.search_index.search("anxiety")
+        mapped.related_index.related("T1")
+
+        assert not isinstance(mapped.search_index.topics, list)
+        assert not isinstance(mapped.related_index.topics, list)
+        assert mapped.topics[-1]["id"] == mapped.get_topics()[-1]["id"]
+        assert [t["id"] for t in mapped.topics[1:]] == [t["id"] for t in mapped.get_topics()[1:]]
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "junk.bin"
+        path.write_bytes(b"not a catalog file at all, just bytes")
+
+        with pytest.raises(ValueError):
+            MmapTopicsCatalog(str(path))
+
+    def test_cache_shares_file_between_instances(self, tmp_path):
+        path = str(tmp_path / "topics.bin")
+        db, state = _fake_db(SAMPLE_TOPICS, version=3)
+
+        first = TopicsCatalogCache(db, catalog_file=path).get_catalog()
+        second = TopicsCatalogCache(db, catalog_file=path).get_catalog()
+
+        assert isinstance(first, MmapTopicsCatalog)
+        assert second.get_topic("T3")["display_name"] == "Urban Sociology"
+        assert state["streams"] == 1
+
+        state["version"] = 4
+        TopicsCatalogCache(db, catalog_file=path).get_catalog()
+        assert state["streams"] == 2
+
+
+@pytest.mark.unit
+class TestTopicBatchLookup:
+    """Test resolving many topic IDs at once"""
+
+    def test_warm_catalog_serves_batch(self):
+        service, db = _topics_service()
+        service.catalog.peek.return_value = service.catalog.get_catalog.return_value = TopicsCatalog(
+            SAMPLE_TOPICS, version=1
+        )
+
+        topics, missing = service.get_topics_by_ids(["T3", "T1", "T3"])
+
+        assert [t["id"] for t in topics] == ["T3", "T1"]
+        assert missing == []
+        db.get_all.assert_not_called()
+
+    def test_catalog_misses_are_read_from_firestore(self):
+        service, db = _topics_service()
+        service.catalog.peek.return_value = service.catalog.get_catalog.return_value = TopicsCatalog(
+            SAMPLE_TOPICS, version=1
+        )
+        db.get_all.return_value = [_doc("T4", _topic("T4", "New Topic", 10)), _doc("T404", None)]
+
+        topics, missing = service.get_topics_by_ids(["T1", "T4", "T404"])
+
+        assert [t["id"] for t in topics] == ["T1", "T4"]
+        assert missing == ["T404"]
+        assert len(db.get_all.call_args[0][0]) == 2
+
+    def test_lookup_revalidates_a_warm_catalog(self):
+        topics = list(SAMPLE_TOPICS)
+        db, state = _fake_db(topics, version=1)
+        service = OpenAlexTopicsService(db)
+        service.catalog = TopicsCatalogCache(db, ttl_seconds=3600, version_check_seconds=0)
+        service.catalog.get_catalog()
+
+        topics.append(_topic("T4", "New Topic", 10))
+        state["version"] = 2
+
+        assert service.get_topic_by_id("T4")["display_name"] == "New Topic"
+        assert service.get_topics_by_ids(["T4"]) == ([topics[-1]], [])
+        assert state["streams"] == 2
+
+    def test_cold_catalog_uses_one_multi_get(self):
+        service, db = _topics_service()
+        service.catalog.peek.return_value = None
+        db.get_all.return_value = [_doc("T2", SAMPLE_TOPICS[1]), _doc("T9", None)]
+
+        topics, missing = service.get_topics_by_ids(["T9", "T2"])
+
+        assert [t["id"] for t in topics] == ["T2"]
+        assert missing == ["T9"]
+        assert db.get_all.call_count == 1
+        assert len(db.get_all.call_args[0][0]) == 2
+
+
+@pytest.mark.unit
+class TestSharedTopicsService:
+    """Test the app-scoped topics service"""
+
+    def test_routes_use_one_service(self, mocker):
+        from app import create_app
+        from app.services import gcp, openalex_topics
+
+        gcp.reset_clients(firestore_client=MagicMock())
+        mocker.patch.object(openalex_topics, "_shared_service", None)
+        mocker.patch("app.utils.auth.verify_token", return_value={"uid": "u1"})
+        mocker.patch.object(openalex_topics.OpenAlexTopicsService, "get_topic_by_id", return_value=SAMPLE_TOPICS[0])
+        construct = mocker.spy(openalex_topics, "OpenAlexTopicsService")
+
+        app = create_app()
+        client = app.test_client()
+        for _ in range(3):
+            response = client.get("/api/topics/T1", headers={"Authorization": "Bearer token"})
+            assert response.status_code == 200
+
+        assert construct.call_count == 1
+        assert app.topics_service is openalex_topics.get_topics_service(None)
+        gcp.reset_clients()
+
+
+@pytest.mark.unit
+class TestTopicRouteValidation:
+    """Test that malformed numeric parameters are rejected with 400"""
+
+    @pytest.fixture
+    def client(self, mocker):
+        from app import create_app
+        from app.services import gcp, openalex_topics
+
+        gcp.reset_clients(firestore_client=MagicMock())
+        mocker.patch.object(openalex_topics, "_shared_service", MagicMock())
+        mocker.patch("app.utils.auth.verify_token", return_value={"uid": "u1"})
+        yield create_app().test_client()
+        gcp.reset_clients()
+
+    @pytest.mark.parametrize("path", [
+        "/api/topics?format=flat&limit=abc",
+        "/api/topics/T1/related?limit=abc",
+        "/api/topics/T1/papers?per_page=abc"
+    ])
+    def test_non_numeric_limit(self, client, path):
+        response = client.get(path, headers={"Authorization": "Bearer token"})
+
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Invalid numeric parameter"}
+
+
+PAGED_TOPICS = [_topic(f"T{100 + i}", f"Topic {i}", 1000 - (i // 2)) for i in range(7)]
+
+
+@pytest.mark.unit
+class TestTopicPagination:
+    """Test keyset pagination, projection and lazy hierarchy expansion"""
+
+    def _walk(self, service, limit, field_name=None):
+        ids, cursor = [], None
+        while True:
+            page, cursor, total = service.get_topics_page(field_name=field_name, cursor=cursor, limit=limit)
+            ids.extend(t["id"] for t in page)
+            if cursor is None:
+                return ids, total
+
+    def test_pages_cover_catalog_once(self):
+        service, _ = _topics_service()
+        service.catalog.get_catalog.return_value = TopicsCatalog(PAGED_TOPICS, version=1)
+
+        ids, total = self._walk(service, limit=3)
+
+        assert total == 7
+        assert ids == [t["id"] for t in TopicsCatalog(PAGED_TOPICS, version=1).get_topics()]
+
+    def test_mmap_catalog_pages_identically(self, tmp_path):
+        path = str(tmp_path / "topics.bin")
+        write_catalog_file(PAGED_TOPICS, path, version=1)
+        service, _ = _topics_service()
+        service.catalog.get_catalog.return_value = TopicsCatalog(PAGED_TOPICS, version=1)
+        expected = self._walk(service, limit=2)
+
+        service.catalog.get_catalog.return_value = MmapTopicsCatalog(path)
+        assert self._walk(service, limit=2) == expected
+        assert self._walk(service, limit=2, field_name="Nope") == ([], 0)
+
+    def test_cursor_round_trip(self):
+        assert decode_cursor(encode_cursor({"id": "T5", "works_count": 42})) == (42, "T5")
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_fields_projection(self):
+        from app.api.topics import SUMMARY_FIELDS, _parse_fields
+
+        assert _parse_fields(None) == SUMMARY_FIELDS
+        assert _parse_fields("all") is None
+        assert _parse_fields("works_count,display_name") == ("id", "works_count", "display_name")
+        with pytest.raises(ValueError):
+            _parse_fields("display_name,secret")
+
+    def test_hierarchy_outline_and_subtree(self):
+        hierarchy = compute_aggregates(SAMPLE_TOPICS)["hierarchy"]
+
+        outline = hierarchy_outline(hierarchy, "field")
+        assert outline["domains"]["2"]["topic_count"] == 3
+        assert outline["domains"]["2"]["fields"]["32"] == {
+            "id": "32", "display_name": "Psychology", "topic_count": 2
+        }
+
+        field = hierarchy_subtree(hierarchy, "field", "33")
+        assert field["subfields"]["3312"]["topics"][0]["id"] == "T3"
+        assert hierarchy_subtree(hierarchy, "subfield", "3203")["topic_count"] == 2
+        assert hierarchy_subtree(hierarchy, "domain", "9") is None
+
+
+def _works_page(ids, next_cursor=None):
+    return {
+        "results": [{"id": f"https://openalex.org/W{i}", "title": f"Paper {i}",
+                     "publication_year": 2025, "cited_by_count": i} for i in ids],
+        "next_cursor": next_cursor,
+        "count": 100
+    }
+
+
+@pytest.mark.unit
+@patch("app.services.topic_papers.get_limiter", MagicMock())
+class TestTopicPaperFeed:
+    """Test cached topic paper feeds"""
+
+    def _feed(self, pages):
+        client = MagicMock()
+        client.fetch_topic_works.side_effect = pages
+        client.parse_raw.side_effect = lambda works, max_results: [
+            {
+                "id": w["id"].split("/")[-1], "title": w["title"], "year": 2025,
+                "citations": w["cited_by_count"], "doi": f"10.5555/{w['id'].split('/')[-1]}",
+                "provenance": {"openalex": True}
+            }
+            for w in works
+        ]
+        return TopicPaperFeed(client=client, refresh_seconds=0), client
+
+    def test_pages_are_cached(self):
+        feed, client = self._feed([_works_page([1, 2], "c2"), _works_page([3], None)])
+
+        first = feed.get_page("T1")
+        again = feed.get_page("T1")
+        second = feed.get_page("T1", cursor=first["next_cursor"])
+
+        assert [p["id"] for p in first["papers"]] == ["W1", "W2"]
+        assert "score" in first["papers"][0]
+        assert first["papers"][0]["paperId"] == "doi:10.5555/w1"
+        assert first["cache"]["hit"] is False
+        assert again["cache"]["hit"] is True
+        assert [p["id"] for p in second["papers"]] == ["W3"]
+        assert client.fetch_topic_works.call_count == 2
+        assert client.fetch_topic_works.call_args_list[0][0][0] == ["T1"]
+
+    def test_sort_is_part_of_the_key(self):
+        feed, client = self._feed([_works_page([1]), _works_page([2])])
+
+        feed.get_page("T1", sort="date")
+        feed.get_page("T1", sort="citations")
+
+        assert client.fetch_topic_works.call_args_list[1][1]["sort"] == "cited_by_count:desc"
+
+    def test_upstream_error_not_cached(self):
+        feed, client = self._feed([None, _works_page([1])])
+
+        assert feed.get_page("T1") is None
+        assert feed.get_page("T1")["papers"][0]["id"] == "W1"
+
+    def test_refresh_popular_warms_landing_pages(self):
+        feed, client = self._feed([_works_page([1]), _works_page([1]), _works_page([9])])
+        feed.popular = 1
+        for _ in range(3):
+            feed.get_page("T1")
+        feed.get_page("T2")
+
+        assert feed.refresh_popular() == 1
+        assert client.fetch_topic_works.call_args_list[-1][0][0] == ["T1"]
+        assert feed.get_page("T1")["papers"][0]["id"] == "W9"